@@ -1,5 +1,6 @@
 "PAC file support using quickjs"
 
+import re
 import socket
 import sys
 import threading
@@ -20,6 +21,24 @@ def dprint(_):
     pass
 
 
+# ASCII-only digits, matched with fullmatch() so a trailing newline is rejected
+IPV4_RE = re.compile(r"(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})", re.ASCII)
+
+
+def ipv4_to_int(ipchars):
+    "Convert dotted IPv4 string to int, None if not valid as per isValidIpAddress()"
+    matches = IPV4_RE.fullmatch(str(ipchars))
+    if matches is None:
+        return None
+    result = 0
+    for octet in matches.groups():
+        octet = int(octet)
+        if octet > 255:
+            return None
+        result = (result << 8) | octet
+    return result
+
+
 class Pac:
     "Load and run PAC files using quickjs"
 
@@ -63,7 +82,7 @@ class Pac:
             )
 
             # Load Python callables
-            for func in [self.alert, self.dnsResolve, self.myIpAddress]:
+            for func in [self.alert, self.dnsResolve, self.myIpAddress, self.isInNet]:
                 self.pac_find_proxy_for_url.add_callable(func.__name__, func)
         except quickjs.JSException as exc:
             dprint("PAC file parsing error")
@@ -151,3 +170,19 @@ class Pac:
     def myIpAddress(self):
         "Get my IP address"
         return self.dnsResolve(socket.gethostname())
+
+    def isInNet(self, ipaddr, pattern, maskstr):
+        """
+        Native replacement for the PACUTILS isInNet() - PAC files call it
+        for many rules per URL and the JS version re-parses all three
+        addresses with a regex and string splits on every call
+        """
+        pat = ipv4_to_int(pattern)
+        mask = ipv4_to_int(maskstr)
+        if pat is None or mask is None:
+            return False
+        host = ipv4_to_int(ipaddr)
+        if host is None:
+            # Unresolvable hosts convert to 0 like convert_addr("") in JS
+            host = ipv4_to_int(self.dnsResolve(ipaddr)) or 0
+        return (host & mask) == (pat & mask)
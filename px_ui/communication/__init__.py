@@ -1,9 +1,11 @@
 # Communication module for proxy-UI event handling
 
 from .events import (
-    BaseEvent, EventType, RequestEvent, ResponseEvent, ErrorEvent, StatusEvent
+    BaseEvent, EventType, RequestEvent, ResponseEvent, RequestResponseEvent, ErrorEvent,
+    StatusEvent
 )
 from .event_queue import EventQueue, EventFilter
+from .error_classifier import classify
 from .event_processor import EventProcessor, EventThrottler
 from .event_system import (
     EventSystem, create_request_event, create_response_event,
@@ -12,9 +14,10 @@ from .event_system import (
 
 __all__ = [
     # Events
-    'BaseEvent', 'EventType', 'RequestEvent', 'ResponseEvent', 'ErrorEvent', 'StatusEvent',
+    'BaseEvent', 'EventType', 'RequestEvent', 'ResponseEvent', 'RequestResponseEvent',
+    'ErrorEvent', 'StatusEvent',
     # Queue and filtering
-    'EventQueue', 'EventFilter',
+    'EventQueue', 'EventFilter', 'classify',
     # Processing
     'EventProcessor', 'EventThrottler',
     # High-level interface
@@ -0,0 +1,48 @@
+"""
+Error message classification for proxy error events.
+
+This module tags error messages with well-known markers (timeouts, refused
+connections, fatal errors) in a single pass, so severity mapping and UI
+filters can use set membership instead of repeated substring searches.
+"""
+
+import re
+from typing import Dict, FrozenSet
+
+
+# Marker text (lowercase) -> tag
+ERROR_MARKERS: Dict[str, str] = {
+    'connection refused': 'connection_refused',
+    'timed out': 'timed_out',
+    'timeout': 'timeout',
+    'critical': 'critical',
+    'fatal': 'fatal',
+}
+
+# One alternation matches every marker in a single scan of the message;
+# longer markers first so they win over any shorter prefix
+_MARKER_PATTERN = re.compile(
+    '|'.join(re.escape(marker) for marker in sorted(ERROR_MARKERS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+_NO_TAGS: FrozenSet[str] = frozenset()
+
+
+def classify(message: str) -> FrozenSet[str]:
+    """
+    Get the tags of all known markers found in an error message.
+    
+    Args:
+        message: Error message to classify (case-insensitive)
+        
+    Returns:
+        Frozen set of tags, empty if no marker matched
+    """
+    if not message:
+        return _NO_TAGS
+    
+    matches = _MARKER_PATTERN.findall(message)
+    if not matches:
+        return _NO_TAGS
+    return frozenset(ERROR_MARKERS[match.lower()] for match in matches)
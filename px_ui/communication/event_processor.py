@@ -6,6 +6,7 @@ and dispatches events to appropriate UI handlers with throttling and
 performance optimizations.
 """
 
+import asyncio
 import threading
 import time
 from typing import Dict, Callable, Optional, List
@@ -56,9 +57,54 @@ class EventThrottler:
         
         return False
     
+    def acquire(self, max_events: int) -> int:
+        """
+        Take up to max_events from the current one-second budget at once.
+        
+        Batch consumers use this instead of should_process(), which would
+        let a whole batch through on a single event's allowance.
+        
+        Args:
+            max_events: Most events the caller wants to process
+            
+        Returns:
+            Number of events the caller may process now (possibly 0)
+        """
+        current_time = time.time()
+        
+        # Reset window if more than 1 second has passed
+        if current_time - self.window_start >= 1.0:
+            self.window_start = current_time
+            self.event_count = 0
+        
+        granted = min(max_events, self.max_events_per_second - self.event_count)
+        if granted <= 0:
+            return 0
+        
+        self.event_count += granted
+        self.last_process_time = current_time
+        return granted
+    
+    def release(self, unused: int):
+        """
+        Return events taken with acquire() that were not processed.
+        
+        Args:
+            unused: Number of acquired events left over
+        """
+        if unused > 0:
+            self.event_count = max(self.event_count - unused, 0)
+    
     def get_sleep_time(self) -> float:
         """Get recommended sleep time before next processing attempt."""
         current_time = time.time()
+        
+        # Out of budget: wait for the next window
+        if self.event_count >= self.max_events_per_second:
+            window_left = self.window_start + 1.0 - current_time
+            if window_left > 0:
+                return window_left
+        
         time_since_last = current_time - self.last_process_time
         
         if time_since_last < self.min_interval:
@@ -70,15 +116,23 @@ class EventThrottler:
 class EventProcessor:
     """Processes events from queue and dispatches to UI handlers."""
     
-    def __init__(self, event_queue: EventQueue, max_events_per_second: int = 50):
+    # Events taken from the queue per wake of the worker thread
+    MAX_BATCH_SIZE = 256
+    
+    def __init__(self, event_queue: EventQueue, max_events_per_second: int = 50,
+                 recycle_events: bool = False):
         """
         Initialize event processor.
         
         Args:
             event_queue: Queue to process events from
             max_events_per_second: Maximum events to process per second
+            recycle_events: Return events to their pool (see BaseEvent.release)
+                once all handlers have run. Only enable this when no handler
+                keeps a reference to the event object itself.
         """
         self.event_queue = event_queue
+        self.recycle_events = recycle_events
         self.throttler = EventThrottler(max_events_per_second)
         self.event_filter = EventFilter()
         
@@ -100,13 +154,18 @@ class EventProcessor:
             EventType.RESPONSE: [],
             EventType.ERROR: [],
             EventType.STATUS: [],
-            EventType.PROXY_DECISION_UPDATE: []
+            EventType.PROXY_DECISION_UPDATE: [],
+            EventType.REQUEST_RESPONSE: []
         }
         
         # Processing control
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        self._progress = threading.Condition()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_handle: Optional[asyncio.TimerHandle] = None
+        self._loop_interval = 0.001
         
         # Batch processing setup
         self.batch_throttler.set_batch_processor(self._process_event_batch)
@@ -160,6 +219,49 @@ class EventProcessor:
         self.update_throttler.start_throttling()
         self.batch_throttler.start_batching()
     
+    def run_async(self, loop: asyncio.AbstractEventLoop, interval: float = 0.001):
+        """
+        Drain events from an asyncio event loop instead of a dedicated thread.
+        
+        The loop may be running in another thread; scheduling is thread-safe.
+        Use stop_processing() to detach.
+        
+        Args:
+            loop: Event loop to schedule queue draining on
+            interval: Delay in seconds between drain passes
+        """
+        if self._running:
+            return
+        
+        self._running = True
+        self._stop_event.clear()
+        self._loop = loop
+        self._loop_interval = interval
+        loop.call_soon_threadsafe(self._drain_once)
+    
+    def _drain_once(self):
+        """Process everything currently queued, then reschedule (runs on the loop)."""
+        loop = self._loop
+        if not self._running or loop is None:
+            return
+        
+        # Same per-event budget as the thread path
+        throttler = self.throttler
+        budget = throttler.acquire(self.MAX_BATCH_SIZE)
+        if not budget:
+            self._stats['events_throttled'] += 1
+            delay = max(self._loop_interval, throttler.get_sleep_time())
+            self._loop_handle = loop.call_later(delay, self._drain_once)
+            return
+        
+        events = self.event_queue.drain(budget)
+        throttler.release(budget - len(events))
+        if events:
+            # Same in-order dispatch as the thread path
+            self._process_event_batch(events)
+        
+        self._loop_handle = loop.call_later(self._loop_interval, self._drain_once)
+    
     def stop_processing(self):
         """Stop event processing."""
         if not self._running:
@@ -168,6 +270,14 @@ class EventProcessor:
         self._running = False
         self._stop_event.set()
         
+        if self._loop is not None:
+            # Async mode: cancel the pending drain on its own loop
+            loop, handle = self._loop, self._loop_handle
+            self._loop = self._loop_handle = None
+            if handle is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(handle.cancel)
+            return
+        
         # Stop performance components
         self.update_throttler.stop_throttling()
         self.batch_throttler.stop_batching()
@@ -188,50 +298,77 @@ class EventProcessor:
         events = self.event_queue.get_events_batch(max_events, timeout=0.01)
         processed_count = 0
         
+        # Bind hot-path lookups once instead of per event
+        process_event = self._process_single_event
+        max_per_second = self.throttler.max_events_per_second
+        
         # For batch processing, we allow processing all events in the batch
         # but still respect the overall rate limit
         for event in events:
-            if self._process_single_event(event):
+            if process_event(event):
                 processed_count += 1
             
             # Only check throttling if we've processed many events
-            if processed_count >= self.throttler.max_events_per_second:
+            if processed_count >= max_per_second:
                 break
         
+        if events:
+            self._notify_progress()
         return processed_count
     
+    def wait_until_processed(self, count: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until at least count events have been handled.
+        
+        Both dispatched and filtered events count as handled. The worker
+        signals once per batch, so this replaces sleep-and-poll waits.
+        
+        Args:
+            count: Number of handled events to wait for (since last reset)
+            timeout: Maximum time to wait in seconds, None to wait forever
+            
+        Returns:
+            True if the count was reached, False on timeout
+        """
+        with self._progress:
+            return self._progress.wait_for(
+                lambda: self._stats['events_processed'] + self._stats['events_filtered'] >= count,
+                timeout
+            )
+    
+    def _notify_progress(self):
+        """Wake threads blocked in wait_until_processed()."""
+        with self._progress:
+            self._progress.notify_all()
+    
     def _process_events(self):
         """Main event processing loop (runs in background thread)."""
-        while self._running and not self._stop_event.is_set():
+        # Bind hot-path lookups once; these objects live as long as the processor
+        stop_event = self._stop_event
+        acquire = self.throttler.acquire
+        release = self.throttler.release
+        get_sleep_time = self.throttler.get_sleep_time
+        get_batch = self.event_queue.get_batch
+        process_batch = self._process_event_batch
+        max_batch = self.MAX_BATCH_SIZE
+        
+        while self._running and not stop_event.is_set():
             try:
-                # Check throttling
-                if not self.throttler.should_process():
-                    sleep_time = self.throttler.get_sleep_time()
-                    if self._stop_event.wait(sleep_time):
+                # Take as many events as the rate limit still allows
+                budget = acquire(max_batch)
+                if not budget:
+                    self._stats['events_throttled'] += 1
+                    sleep_time = get_sleep_time()
+                    if stop_event.wait(sleep_time):
                         break
                     continue
                 
-                # Get events batch
-                events = self.event_queue.get_events_batch(max_events=10, timeout=0.1)
-                
-                if not events:
-                    continue
+                # Drain up to the budget and dispatch it as one batch
+                events = get_batch(budget, timeout=0.1)
+                release(budget - len(events))
                 
-                # Process events - use batch processing for better performance
-                if len(events) > 5:  # Use batch processing for larger event sets
-                    self.batch_throttler.add_to_batch(events)
-                else:
-                    # Process individually for small sets
-                    for event in events:
-                        if not self._running:
-                            break
-                        
-                        self._process_single_event(event)
-                        
-                        # Check throttling between events
-                        if not self.throttler.should_process():
-                            self._stats['events_throttled'] += 1
-                            break
+                if events:
+                    process_batch(events)
                 
             except Exception as e:
                 self._stats['processing_errors'] += 1
@@ -250,9 +387,20 @@ class EventProcessor:
             True if event was processed, False if filtered
         """
         try:
+            # Without a fused handler, fall back to separate request/response dispatch
+            if (event.event_type is EventType.REQUEST_RESPONSE
+                    and not self._handlers[EventType.REQUEST_RESPONSE]):
+                request, response = event.split()
+                if self.recycle_events:
+                    event.release()
+                processed = self._process_single_event(request)
+                return self._process_single_event(response) or processed
+            
             # Apply filter
             if not self.event_filter.matches(event):
                 self._stats['events_filtered'] += 1
+                if self.recycle_events:
+                    event.release()
                 return False
             
             # Dispatch to handlers
@@ -266,6 +414,8 @@ class EventProcessor:
             
             self._stats['events_processed'] += 1
             self._stats['last_process_time'] = datetime.now()
+            if self.recycle_events:
+                event.release()
             return True
             
         except Exception as e:
@@ -297,42 +447,78 @@ class EventProcessor:
         """
         Process a batch of events for improved performance.
         
+        Events reach handlers in queue order, so a response is never handled
+        before its request. Handlers with handle_batch() get each run of
+        consecutive same-type events in one call.
+        
         Args:
             events: List of events to process
         """
         try:
-            # Group events by type for efficient processing
-            events_by_type = {}
+            # Expand fused events and apply the filter, keeping arrival order
+            ordered = []
+            append = ordered.append
+            expand_fused = not self._handlers[EventType.REQUEST_RESPONSE]
+            matches = self.event_filter.matches
+            filtered = 0
             for event in events:
-                event_type = event.event_type
-                if event_type not in events_by_type:
-                    events_by_type[event_type] = []
-                events_by_type[event_type].append(event)
-            
-            # Process each type in batch
-            for event_type, type_events in events_by_type.items():
-                handlers = self._handlers.get(event_type, [])
-                
-                for handler in handlers:
-                    try:
-                        # Check if handler supports batch processing
-                        if hasattr(handler, 'handle_batch'):
-                            handler.handle_batch(type_events)
+                if event.event_type is EventType.REQUEST_RESPONSE and expand_fused:
+                    for part in event.split():
+                        if matches(part):
+                            append(part)
                         else:
-                            # Process individually
-                            for event in type_events:
-                                handler(event)
-                    except Exception as e:
-                        self._stats['processing_errors'] += 1
-                        print(f"Error in batch event handler: {e}")
+                            filtered += 1
+                    continue
+                if not matches(event):
+                    filtered += 1
+                    continue
+                append(event)
+            
+            # Dispatch each run of consecutive same-type events
+            count = len(ordered)
+            start = 0
+            while start < count:
+                event_type = ordered[start].event_type
+                end = start + 1
+                while end < count and ordered[end].event_type is event_type:
+                    end += 1
+                self._dispatch_run(event_type, ordered[start:end])
+                start = end
             
-            self._stats['events_processed'] += len(events)
+            self._stats['events_processed'] += count
+            self._stats['events_filtered'] += filtered
             self._stats['last_process_time'] = datetime.now()
             
+            if self.recycle_events:
+                for event in events:
+                    event.release()
+            
+            self._notify_progress()
+            
         except Exception as e:
             self._stats['processing_errors'] += 1
             print(f"Error processing event batch: {e}")
     
+    def _dispatch_run(self, event_type: EventType, run: List[BaseEvent]):
+        """Hand a run of same-type events to every handler for that type."""
+        for handler in self._handlers.get(event_type, []):
+            # Check if handler supports batch processing
+            if hasattr(handler, 'handle_batch'):
+                try:
+                    handler.handle_batch(run)
+                except Exception as e:
+                    self._stats['processing_errors'] += 1
+                    print(f"Error in batch event handler: {e}")
+                continue
+            
+            # Process individually; one failing event must not drop the rest
+            for event in run:
+                try:
+                    handler(event)
+                except Exception as e:
+                    self._stats['processing_errors'] += 1
+                    print(f"Error in batch event handler: {e}")
+    
     def enable_batch_processing(self, enable: bool = True):
         """Enable or disable batch processing for better performance."""
         if enable:
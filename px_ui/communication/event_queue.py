@@ -5,9 +5,11 @@ This module provides a thread-safe queue implementation for handling events
 between the proxy engine and UI components.
 """
 
-import queue
+import _thread
+import sys
 import threading
 import time
+from collections import deque
 from typing import Optional, List, Callable
 from datetime import datetime, timedelta
 
@@ -15,20 +17,43 @@ from .events import BaseEvent, EventType
 
 
 class EventQueue:
-    """Thread-safe event queue for proxy-to-UI communication."""
+    """
+    Thread-safe event queue for proxy-to-UI communication.
+    
+    Events are stored in a ``collections.deque`` whose ``popleft`` is
+    atomic, so consumers never take a lock. Producers hold a short plain
+    lock around the fullness check, the append and the counters, so a full
+    queue always rejects (and counts) the new event rather than letting the
+    deque's ``maxlen`` silently evict an old one. Condition variables are
+    only touched when a consumer (or a blocking producer) is actually
+    waiting, mirroring a semaphore-for-wakeup design.
+    """
     
     def __init__(self, max_size: int = 1000):
         """
         Initialize the event queue.
         
         Args:
-            max_size: Maximum number of events to store in queue
+            max_size: Maximum number of events to store in queue; zero or
+                less means unbounded, as with queue.Queue
         """
-        self._queue = queue.Queue(maxsize=max_size)
-        self._lock = threading.RLock()
+        self._buffer: deque = deque(maxlen=max_size if max_size > 0 else None)
+        self._max_size = max_size
+        self._capacity = max_size if max_size > 0 else sys.maxsize
+        # Plain (non-reentrant) locks: nothing below nests acquisitions
+        self._lock = _thread.allocate_lock()
+        self._not_empty = threading.Condition(_thread.allocate_lock())
+        self._not_full = threading.Condition(_thread.allocate_lock())
+        self._waiting_consumers = 0
+        self._waiting_producers = 0
         self._event_count = 0
         self._dropped_events = 0
         self._last_cleanup = datetime.now()
+    
+    @property
+    def max_size(self) -> int:
+        """Maximum number of events held by the queue."""
+        return self._max_size
         
     def put_event(self, event: BaseEvent, block: bool = False, timeout: Optional[float] = None) -> bool:
         """
@@ -42,15 +67,64 @@ class EventQueue:
         Returns:
             True if event was added, False if queue was full
         """
-        try:
-            with self._lock:
-                self._queue.put(event, block=block, timeout=timeout)
-                self._event_count += 1
-                return True
-        except queue.Full:
-            with self._lock:
-                self._dropped_events += 1
-            return False
+        buffer = self._buffer
+        lock = self._lock
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Consumers only ever shrink the buffer, so the check holds
+            # until the append as long as producers hold the lock
+            with lock:
+                if len(buffer) < self._capacity:
+                    buffer.append(event)
+                    self._event_count += 1
+                    break
+                if not block:
+                    self._dropped_events += 1
+                    return False
+            
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not self._wait_not_full(remaining):
+                with lock:
+                    self._dropped_events += 1
+                return False
+        
+        # Only pay for the condition lock when someone is asleep
+        if self._waiting_consumers:
+            with self._not_empty:
+                self._not_empty.notify()
+        return True
+    
+    def put_events(self, events: List[BaseEvent]) -> int:
+        """
+        Put several events into the queue in one step without blocking.
+        
+        Args:
+            events: Events to add, in order
+            
+        Returns:
+            Number of events added; events beyond the free space are dropped
+        """
+        buffer = self._buffer
+        with self._lock:
+            room = self._capacity - len(buffer)
+            if len(events) > room:
+                room = max(room, 0)
+                self._dropped_events += len(events) - room
+                events = events[:room]
+                if not events:
+                    return 0
+            
+            buffer.extend(events)
+            self._event_count += len(events)
+        
+        if self._waiting_consumers:
+            with self._not_empty:
+                self._not_empty.notify_all()
+        return len(events)
+    
+    def put_nowait(self, event: BaseEvent) -> bool:
+        """Put an event without blocking; returns False if the queue is full."""
+        return self.put_event(event, block=False)
     
     def get_event(self, block: bool = True, timeout: Optional[float] = None) -> Optional[BaseEvent]:
         """
@@ -64,9 +138,85 @@ class EventQueue:
             Event from queue or None if empty/timeout
         """
         try:
-            return self._queue.get(block=block, timeout=timeout)
-        except queue.Empty:
-            return None
+            event = self._buffer.popleft()
+        except IndexError:
+            if not block:
+                return None
+            event = self._wait_for_event(timeout)
+            if event is None:
+                return None
+        
+        if self._waiting_producers:
+            with self._not_full:
+                self._not_full.notify()
+        return event
+    
+    def get_nowait(self) -> Optional[BaseEvent]:
+        """Get an event without blocking; returns None if the queue is empty."""
+        return self.get_event(block=False)
+    
+    def _wait_for_event(self, timeout: Optional[float]) -> Optional[BaseEvent]:
+        """Block until an event is available or the timeout expires."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            self._waiting_consumers += 1
+            try:
+                while True:
+                    # Re-check after registering as a waiter so a producer
+                    # that appended meanwhile either is seen here or notifies
+                    try:
+                        return self._buffer.popleft()
+                    except IndexError:
+                        pass
+                    
+                    if deadline is None:
+                        self._not_empty.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return None
+                        self._not_empty.wait(remaining)
+            finally:
+                self._waiting_consumers -= 1
+    
+    def _wait_not_full(self, timeout: Optional[float]) -> bool:
+        """Block until the queue has room or the timeout expires."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_full:
+            self._waiting_producers += 1
+            try:
+                while len(self._buffer) >= self._capacity:
+                    if deadline is None:
+                        self._not_full.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        self._not_full.wait(remaining)
+                return True
+            finally:
+                self._waiting_producers -= 1
+    
+    def get_batch(self, max_items: int = 256, timeout: float = 0.01) -> List[BaseEvent]:
+        """
+        Wait for an event, then take everything else available in one pass.
+        
+        Args:
+            max_items: Maximum number of events to retrieve
+            timeout: Timeout for the first event
+            
+        Returns:
+            List of events in FIFO order (may be empty)
+        """
+        # Get first event with timeout
+        first_event = self.get_event(block=True, timeout=timeout)
+        if first_event is None:
+            return []
+        
+        # Splice the rest in one pass without blocking
+        events = [first_event]
+        events.extend(self.drain(max_items - 1))
+        return events
     
     def get_events_batch(self, max_events: int = 10, timeout: float = 0.1) -> List[BaseEvent]:
         """
@@ -79,43 +229,52 @@ class EventQueue:
         Returns:
             List of events (may be empty)
         """
-        events = []
+        return self.get_batch(max_events, timeout)
+    
+    def drain(self, max_items: int) -> List[BaseEvent]:
+        """
+        Remove up to max_items events without blocking.
         
-        # Get first event with timeout
-        first_event = self.get_event(block=True, timeout=timeout)
-        if first_event:
-            events.append(first_event)
+        Args:
+            max_items: Maximum number of events to remove
             
-            # Get additional events without blocking
-            for _ in range(max_events - 1):
-                event = self.get_event(block=False)
-                if event:
-                    events.append(event)
-                else:
-                    break
+        Returns:
+            List of events in FIFO order (may be empty)
+        """
+        events = []
+        append = events.append
+        popleft = self._buffer.popleft
+        try:
+            for _ in range(max_items):
+                append(popleft())
+        except IndexError:
+            pass
         
+        if events and self._waiting_producers:
+            with self._not_full:
+                self._not_full.notify_all()
         return events
     
     def size(self) -> int:
         """Get current queue size."""
-        return self._queue.qsize()
+        return len(self._buffer)
     
     def is_empty(self) -> bool:
         """Check if queue is empty."""
-        return self._queue.empty()
+        return not self._buffer
     
     def is_full(self) -> bool:
         """Check if queue is full."""
-        return self._queue.full()
+        return len(self._buffer) >= self._capacity
     
     def clear(self):
         """Clear all events from queue."""
         with self._lock:
-            while not self._queue.empty():
-                try:
-                    self._queue.get_nowait()
-                except queue.Empty:
-                    break
+            self._buffer.clear()
+        
+        if self._waiting_producers:
+            with self._not_full:
+                self._not_full.notify_all()
     
     def get_stats(self) -> dict:
         """Get queue statistics."""
@@ -21,16 +21,18 @@ class EventSystem:
     the complete event communication system between proxy and UI.
     """
     
-    def __init__(self, queue_size: int = 1000, max_events_per_second: int = 50):
+    def __init__(self, queue_size: int = 1000, max_events_per_second: int = 50,
+                 recycle_events: bool = False):
         """
         Initialize the event system.
         
         Args:
             queue_size: Maximum size of event queue
             max_events_per_second: Maximum events to process per second
+            recycle_events: Pool events for reuse after handlers have run
         """
         self.queue = EventQueue(max_size=queue_size)
-        self.processor = EventProcessor(self.queue, max_events_per_second)
+        self.processor = EventProcessor(self.queue, max_events_per_second, recycle_events)
         self.filter = EventFilter()
         
         # Set initial filter
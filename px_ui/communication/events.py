@@ -5,10 +5,23 @@ This module defines the event types used to communicate between the proxy engine
 and the UI components in a thread-safe manner.
 """
 
-from dataclasses import dataclass
-from datetime import datetime
+import uuid
+from collections import deque
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Optional, Tuple
+
+from .error_classifier import classify
+
+
+# Maximum number of released events kept per event class for reuse
+EVENT_POOL_SIZE = 4096
+
+# Free lists of released events, keyed by event class. deque.append/pop are
+# atomic, so producers and the processor thread can share them without a lock.
+_event_pools: Dict[type, deque] = {}
+_field_names: Dict[type, Tuple[str, ...]] = {}
 
 
 class EventType(Enum):
@@ -18,6 +31,7 @@ class EventType(Enum):
     ERROR = "error"
     STATUS = "status"
     PROXY_DECISION_UPDATE = "proxy_decision_update"
+    REQUEST_RESPONSE = "request_response"
 
 
 @dataclass
@@ -30,6 +44,57 @@ class BaseEvent:
     def __post_init__(self):
         if not self.timestamp:
             self.timestamp = datetime.now()
+    
+    @classmethod
+    def acquire(cls, **kwargs):
+        """
+        Create an event, reusing a previously released instance if available.
+        
+        Accepts the same keyword arguments as the constructor.
+        """
+        pool = _event_pools.get(cls)
+        if pool:
+            try:
+                event = pool.pop()
+            except IndexError:
+                pass
+            else:
+                event.__init__(**kwargs)
+                return event
+        return cls(**kwargs)
+    
+    @classmethod
+    def fast_create(cls, **kwargs):
+        """
+        Create an event without running the dataclass __init__/__post_init__.
+        
+        Keyword arguments are stored as-is, so callers must pass every field
+        without a default, including a real timestamp. event_type is set
+        from the class and need not be passed.
+        """
+        event = object.__new__(cls)
+        event.__dict__.update(kwargs)
+        event.event_type = _event_types[cls]
+        return event
+    
+    def release(self):
+        """
+        Return this event to its class pool for reuse by acquire().
+        
+        All fields are reset to None so pooled events do not keep headers or
+        body previews alive. The caller must not use the event afterwards.
+        """
+        cls = type(self)
+        names = _field_names.get(cls)
+        if names is None:
+            names = _field_names[cls] = tuple(f.name for f in fields(cls))
+        for name in names:
+            setattr(self, name, None)
+        
+        pool = _event_pools.get(cls)
+        if pool is None:
+            pool = _event_pools.setdefault(cls, deque(maxlen=EVENT_POOL_SIZE))
+        pool.append(self)
 
 
 @dataclass
@@ -61,6 +126,59 @@ class ResponseEvent(BaseEvent):
         self.event_type = EventType.RESPONSE
 
 
+@dataclass
+class RequestResponseEvent(BaseEvent):
+    """
+    Single event for a request whose response was captured in the same thread.
+    
+    event_id is the request's id; timestamp is when the response arrived.
+    """
+    request_id: str
+    url: str
+    method: str
+    proxy_decision: str
+    status_code: int
+    headers: Dict[str, str]
+    body_preview: str
+    content_length: int
+    response_time: float
+    request_headers: Optional[Dict[str, str]] = None
+    
+    def __post_init__(self):
+        super().__post_init__()
+        self.event_type = EventType.REQUEST_RESPONSE
+    
+    def split(self) -> Tuple[RequestEvent, ResponseEvent]:
+        """
+        Expand into the separate request and response events it replaces.
+        
+        The request keeps event_id and is dated response_time earlier; the
+        response gets a fresh id so the two stay distinguishable.
+        """
+        request = RequestEvent(
+            event_type=EventType.REQUEST,
+            timestamp=self.timestamp - timedelta(seconds=self.response_time),
+            event_id=self.event_id,
+            url=self.url,
+            method=self.method,
+            proxy_decision=self.proxy_decision,
+            request_id=self.request_id,
+            headers=self.request_headers
+        )
+        response = ResponseEvent(
+            event_type=EventType.RESPONSE,
+            timestamp=self.timestamp,
+            event_id=str(uuid.uuid4()),
+            request_id=self.request_id,
+            status_code=self.status_code,
+            headers=self.headers,
+            body_preview=self.body_preview,
+            content_length=self.content_length,
+            response_time=self.response_time
+        )
+        return request, response
+
+
 @dataclass
 class ErrorEvent(BaseEvent):
     """Event sent when an error occurs."""
@@ -69,10 +187,20 @@ class ErrorEvent(BaseEvent):
     error_details: Optional[str] = None
     request_id: Optional[str] = None
     url: Optional[str] = None
+    tags: FrozenSet[str] = frozenset()  # Markers found by error_classifier
     
     def __post_init__(self):
         super().__post_init__()
         self.event_type = EventType.ERROR
+        if not self.tags:
+            self.tags = classify(self.error_message)
+    
+    @classmethod
+    def fast_create(cls, **kwargs):
+        event = super().fast_create(**kwargs)
+        if not event.tags:
+            event.tags = classify(event.error_message)
+        return event
 
 
 @dataclass
@@ -99,3 +227,14 @@ class ProxyDecisionUpdateEvent(BaseEvent):
     def __post_init__(self):
         super().__post_init__()
         self.event_type = EventType.PROXY_DECISION_UPDATE
+
+
+# Fixed event type of each event class, used by BaseEvent.fast_create
+_event_types: Dict[type, EventType] = {
+    RequestEvent: EventType.REQUEST,
+    ResponseEvent: EventType.RESPONSE,
+    RequestResponseEvent: EventType.REQUEST_RESPONSE,
+    ErrorEvent: EventType.ERROR,
+    StatusEvent: EventType.STATUS,
+    ProxyDecisionUpdateEvent: EventType.PROXY_DECISION_UPDATE,
+}
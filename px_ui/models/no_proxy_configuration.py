@@ -6,11 +6,187 @@ including support for wildcard patterns, IP ranges, and CIDR notation.
 """
 
 import re
+import sys
 import ipaddress
 import logging
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+
+# Patterns are few and reused on every add/validate/bypass check, so parsed
+# and validated forms are cached by pattern string
+_PATTERN_CACHE_SIZE = 4096
+
+# Patterns emitted for the built-in bypass options in px format
+_LOCALHOST_PATTERNS = ('localhost', '127.0.0.1', '::1')
+_PRIVATE_NETWORK_PATTERNS = (
+    '10.0.0.0/8',
+    '172.16.0.0/12',
+    '192.168.0.0/16',
+    '169.254.0.0/16',  # Link-local
+    'fc00::/7'  # IPv6 private
+)
+_LOCALHOST_PATTERN_SET = frozenset(_LOCALHOST_PATTERNS)
+_PRIVATE_NETWORK_PATTERN_SET = frozenset(_PRIVATE_NETWORK_PATTERNS)
+
+_HOSTNAME_LABEL_RE = re.compile(r'^[a-zA-Z0-9-]+$')
+
+_BAD_CHARS_RE = re.compile(r'[<>"|\\^`{}]')
+
+# Pattern category in one match: any '*' makes a wildcard, any '/' or '-'
+# an IP pattern (CIDR or range), text made only of IP address characters a
+# candidate single address, and anything else a hostname
+_PATTERN_KIND_RE = re.compile(
+    r'(?P<wildcard>.*\*)|(?P<ip>.*[/-])|(?P<address>[0-9A-Fa-f:.]+(?:%.*)?$)|(?P<hostname>)',
+    re.DOTALL
+)
+
+
+@lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+def _pattern_kind(pattern: str) -> str:
+    """Classify a pattern as 'wildcard', 'ip' or 'hostname'."""
+    kind = _PATTERN_KIND_RE.match(pattern).lastgroup
+    if kind == 'address':
+        try:
+            ipaddress.ip_address(pattern)
+            return 'ip'
+        except ValueError:
+            return 'hostname'
+    return kind
+
+
+@lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+def _wildcard_regex(pattern: str):
+    """Compile a wildcard pattern (*.example.com) into a regex."""
+    regex_pattern = pattern.replace('.', r'\.').replace('*', '.*')
+    return re.compile(f'^{regex_pattern}$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+def _parse_ip_pattern(pattern: str):
+    """
+    Parse an IP pattern once.
+    
+    Returns:
+        An ip_network for CIDR notation, a (start, end) tuple for ranges,
+        or an ip_address for a single IP. Raises ValueError if invalid.
+    """
+    if '/' in pattern:
+        return ipaddress.ip_network(pattern, strict=False)
+    
+    if '-' in pattern:
+        start_ip, end_ip = pattern.split('-', 1)
+        return ipaddress.ip_address(start_ip.strip()), ipaddress.ip_address(end_ip.strip())
+    
+    return ipaddress.ip_address(pattern)
+
+
+_WILDCARD_SUFFIX_RE = re.compile(r'^\*(\.[a-zA-Z0-9.-]+)$')
+
+
+@lru_cache(maxsize=2048)
+def _extract_host(url: str) -> str:
+    """
+    Extract the host from a URL or bare host[:port][/path] string.
+    
+    The host is lower-cased and interned, so set probes against the
+    interned pattern index usually succeed on identity alone.
+    """
+    parsed = urlsplit(url if url.startswith(('http://', 'https://')) else f'http://{url}')
+    return sys.intern((parsed.hostname or parsed.netloc).lower())
+
+
+class _PatternIndex:
+    """
+    No proxy patterns split by kind, so matching a host is a set probe and
+    a few short scans instead of classifying every pattern again.
+    """
+    
+    __slots__ = ('exact', 'suffixes', 'wildcard_re', 'addresses', 'networks', 'ranges')
+    
+    def __init__(self, patterns: List[str]):
+        # Malformed (non-string) entries never match anything
+        patterns = [pattern for pattern in patterns if isinstance(pattern, str)]
+        
+        # Any pattern matches a host equal to it, whatever its kind
+        self.exact = {sys.intern(pattern.lower()) for pattern in patterns}
+        suffixes = []
+        wildcards = []
+        self.addresses = set()
+        self.networks = []
+        self.ranges = []
+        
+        # Classify in the same order as NoProxyConfiguration._match_pattern
+        for pattern in patterns:
+            kind = _pattern_kind(pattern)
+            if kind == 'wildcard':
+                suffix = _WILDCARD_SUFFIX_RE.match(pattern)
+                if suffix:
+                    suffixes.append(sys.intern(suffix.group(1).lower()))
+                else:
+                    try:
+                        wildcards.append(_wildcard_regex(pattern))
+                    except re.error:
+                        pass
+            elif kind == 'ip':
+                try:
+                    parsed = _parse_ip_pattern(pattern)
+                except ValueError:
+                    continue
+                if '/' in pattern:
+                    # Kept as integers so a check is a mask and compare
+                    self.networks.append((parsed.version, int(parsed.network_address),
+                                          int(parsed.netmask)))
+                elif '-' in pattern:
+                    start_ip, end_ip = parsed
+                    if start_ip.version == end_ip.version:
+                        self.ranges.append((start_ip.version, int(start_ip), int(end_ip)))
+                else:
+                    self.addresses.add(parsed)
+            elif pattern.startswith('.'):
+                suffixes.append(sys.intern(pattern.lower()))
+        
+        self.suffixes = tuple(suffixes)
+        
+        # All other wildcards share one alternation, so a host is scanned once
+        self.wildcard_re = None
+        if wildcards:
+            self.wildcard_re = re.compile(
+                '|'.join(f'(?:{regex.pattern})' for regex in wildcards), re.IGNORECASE
+            )
+    
+    def matches(self, host: str) -> bool:
+        """Check if an already lower-cased host matches any indexed pattern."""
+        if host in self.exact:
+            return True
+        
+        if self.suffixes and host.endswith(self.suffixes):
+            return True
+        
+        if self.wildcard_re is not None and self.wildcard_re.match(host):
+            return True
+        
+        if self.addresses or self.networks or self.ranges:
+            try:
+                host_ip = ipaddress.ip_address(host)
+            except ValueError:
+                return False
+            
+            if host_ip in self.addresses:
+                return True
+            
+            version, value = host_ip.version, int(host_ip)
+            if any(network_version == version and value & mask == network
+                   for network_version, network, mask in self.networks):
+                return True
+            
+            return any(range_version == version and start <= value <= end
+                       for range_version, start, end in self.ranges)
+        
+        return False
 
 
 @dataclass
@@ -39,6 +215,8 @@ class NoProxyConfiguration:
     def __post_init__(self):
         """Initialize and validate configuration after creation."""
         self.logger = logging.getLogger(__name__)
+        self._batch_depth = 0
+        self._px_cache = None
         self.validate()
     
     def add_pattern(self, pattern: str) -> bool:
@@ -57,13 +235,44 @@ class NoProxyConfiguration:
         
         # Validate pattern before adding
         if self._validate_pattern(pattern):
-            if pattern not in self.patterns:
+            if pattern not in self._synced_pattern_set():
                 self.patterns.append(pattern)
+                self._pattern_set.add(pattern)
+                self._pattern_set_len += 1
                 self.validate()
                 return True
         
         return False
     
+    def extend_patterns(self, patterns: Iterable[str]) -> int:
+        """
+        Add several no proxy patterns, validating only once at the end.
+        
+        Args:
+            patterns: Patterns to add
+            
+        Returns:
+            Number of patterns that were added
+        """
+        with self.batch_edit():
+            return sum(1 for pattern in patterns if self.add_pattern(pattern))
+    
+    @contextmanager
+    def batch_edit(self):
+        """
+        Defer validation and re-indexing of patterns until the block exits.
+        
+        Pattern edits inside the block still check each new pattern, but the
+        whole configuration is validated once instead of after every edit.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.validate()
+    
     def remove_pattern(self, pattern: str) -> bool:
         """
         Remove a no proxy pattern.
@@ -74,8 +283,11 @@ class NoProxyConfiguration:
         Returns:
             True if pattern was removed, False if not found
         """
-        if pattern in self.patterns:
+        if pattern in self._synced_pattern_set():
             self.patterns.remove(pattern)
+            if pattern not in self.patterns:
+                self._pattern_set.discard(pattern)
+            self._pattern_set_len -= 1
             self.validate()
             return True
         return False
@@ -83,8 +295,14 @@ class NoProxyConfiguration:
     def clear_patterns(self):
         """Clear all no proxy patterns."""
         self.patterns.clear()
+        self._pattern_set.clear()
+        self._pattern_set_source, self._pattern_set_len = self.patterns, 0
         self.validate()
     
+    def __contains__(self, pattern: str) -> bool:
+        """Check whether a custom pattern is configured."""
+        return pattern in self._synced_pattern_set()
+    
     def should_bypass_proxy(self, url: str) -> bool:
         """
         Check if a URL should bypass the proxy.
@@ -96,9 +314,7 @@ class NoProxyConfiguration:
             True if URL should bypass proxy, False otherwise
         """
         try:
-            # Parse URL to extract host
-            parsed = urlparse(url if url.startswith(('http://', 'https://')) else f'http://{url}')
-            host = parsed.hostname or parsed.netloc
+            host = _extract_host(url)
             
             if not host:
                 return False
@@ -119,11 +335,49 @@ class NoProxyConfiguration:
             return False
     
     def _matches_patterns(self, host: str) -> bool:
-        """Check if host matches any no proxy patterns."""
-        for pattern in self.patterns:
-            if self._match_pattern(host, pattern):
-                return True
-        return False
+        """Check if a lower-cased host matches any no proxy patterns."""
+        self._pattern_snapshot()
+        return self._index.matches(host)
+    
+    def _pattern_snapshot(self) -> List[str]:
+        """
+        Get the patterns as last indexed, re-indexing first if the patterns
+        list was replaced or resized without validate(). A new snapshot list
+        is made on every change, so its identity tells whether patterns changed.
+        
+        Only the list identity and length are compared, so this stays O(1) on
+        the matching path; replacing an item in place needs validate().
+        """
+        patterns = self.patterns
+        if (patterns is not self._indexed_source
+                or len(patterns) != len(self._indexed_patterns)):
+            self._rebuild_index()
+        return self._indexed_patterns
+    
+    def _synced_pattern_set(self) -> set:
+        """
+        Get the membership set, rebuilding it if the patterns list was
+        replaced or resized directly (same check as _pattern_snapshot()).
+        """
+        patterns = self.patterns
+        if (patterns is not self._pattern_set_source
+                or len(patterns) != self._pattern_set_len):
+            self._rebuild_pattern_set()
+        return self._pattern_set
+    
+    def _rebuild_pattern_set(self):
+        """Rebuild the membership set used by add/remove_pattern and `in`."""
+        self._pattern_set = {pattern for pattern in self.patterns
+                             if isinstance(pattern, str)}
+        self._pattern_set_source = self.patterns
+        self._pattern_set_len = len(self.patterns)
+    
+    def _rebuild_index(self):
+        """Re-split patterns into the lookup containers used for matching."""
+        self._indexed_source = self.patterns
+        self._indexed_patterns = list(self.patterns)
+        self._index = _PatternIndex(self._indexed_patterns)
+        self._rebuild_pattern_set()
     
     def _match_pattern(self, host: str, pattern: str) -> bool:
         """
@@ -161,16 +415,14 @@ class NoProxyConfiguration:
     
     def _match_wildcard(self, host: str, pattern: str) -> bool:
         """Match host against wildcard pattern."""
-        # Convert wildcard pattern to regex
-        regex_pattern = pattern.replace('.', r'\.').replace('*', '.*')
-        regex_pattern = f'^{regex_pattern}$'
-        
         try:
-            return bool(re.match(regex_pattern, host, re.IGNORECASE))
+            return bool(_wildcard_regex(pattern).match(host))
         except re.error:
             return False
     
-    def _is_ip_pattern(self, pattern: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+    def _is_ip_pattern(pattern: str) -> bool:
         """Check if pattern is an IP-related pattern."""
         # Check for CIDR notation
         if '/' in pattern:
@@ -197,23 +449,21 @@ class NoProxyConfiguration:
             return False
         
         try:
+            parsed = _parse_ip_pattern(pattern)
+            
             # CIDR notation
             if '/' in pattern:
-                network = ipaddress.ip_network(pattern, strict=False)
-                return host_ip in network
+                return host_ip in parsed
             
             # IP range (e.g., 192.168.1.1-192.168.1.100)
             if '-' in pattern:
-                start_ip, end_ip = pattern.split('-', 1)
-                start_ip = ipaddress.ip_address(start_ip.strip())
-                end_ip = ipaddress.ip_address(end_ip.strip())
+                start_ip, end_ip = parsed
                 return start_ip <= host_ip <= end_ip
             
             # Single IP address
-            pattern_ip = ipaddress.ip_address(pattern)
-            return host_ip == pattern_ip
+            return host_ip == parsed
             
-        except ValueError as e:
+        except (ValueError, TypeError) as e:
             self.logger.error(f"Invalid IP pattern {pattern}: {e}")
             return False
     
@@ -248,7 +498,12 @@ class NoProxyConfiguration:
         Returns:
             True if configuration is valid, False otherwise
         """
+        if self._batch_depth:
+            # Validated when the enclosing batch_edit() block exits
+            return self.is_valid
+        
         self.validation_errors.clear()
+        self._rebuild_index()
         
         try:
             # Validate each pattern
@@ -268,7 +523,9 @@ class NoProxyConfiguration:
             self.is_valid = False
             return False
     
-    def _validate_pattern(self, pattern: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+    def _validate_pattern(pattern: str) -> bool:
         """Validate a single no proxy pattern."""
         if not pattern or not pattern.strip():
             return False
@@ -277,25 +534,28 @@ class NoProxyConfiguration:
         
         try:
             # Check for invalid characters
-            invalid_chars = ['<', '>', '"', '|', '\\', '^', '`', '{', '}']
-            if any(char in pattern for char in invalid_chars):
+            if _BAD_CHARS_RE.search(pattern):
                 return False
             
+            kind = _pattern_kind(pattern)
+            
             # Validate wildcard patterns
-            if '*' in pattern:
-                return self._validate_wildcard_pattern(pattern)
+            if kind == 'wildcard':
+                return NoProxyConfiguration._validate_wildcard_pattern(pattern)
             
             # Validate IP patterns
-            if self._is_ip_pattern(pattern):
-                return self._validate_ip_pattern(pattern)
+            if kind == 'ip':
+                return NoProxyConfiguration._validate_ip_pattern(pattern)
             
             # Validate hostname patterns
-            return self._validate_hostname_pattern(pattern)
+            return NoProxyConfiguration._validate_hostname_pattern(pattern)
             
         except Exception:
             return False
     
-    def _validate_wildcard_pattern(self, pattern: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+    def _validate_wildcard_pattern(pattern: str) -> bool:
         """Validate wildcard pattern."""
         # Basic wildcard validation
         if pattern.count('*') > 3:  # Reasonable limit
@@ -303,37 +563,35 @@ class NoProxyConfiguration:
         
         # Check for valid wildcard placement
         if pattern.startswith('*.'):
-            return self._validate_hostname_pattern(pattern[2:])
+            return NoProxyConfiguration._validate_hostname_pattern(pattern[2:])
         
         if pattern.endswith('.*'):
-            return self._validate_hostname_pattern(pattern[:-2])
+            return NoProxyConfiguration._validate_hostname_pattern(pattern[:-2])
         
         # Allow patterns like *.example.*
         return True
     
-    def _validate_ip_pattern(self, pattern: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+    def _validate_ip_pattern(pattern: str) -> bool:
         """Validate IP-related pattern."""
         try:
-            # CIDR notation
-            if '/' in pattern:
-                ipaddress.ip_network(pattern, strict=False)
-                return True
+            parsed = _parse_ip_pattern(pattern)
             
             # IP range
-            if '-' in pattern:
-                start_ip, end_ip = pattern.split('-', 1)
-                start = ipaddress.ip_address(start_ip.strip())
-                end = ipaddress.ip_address(end_ip.strip())
+            if '-' in pattern and '/' not in pattern:
+                start, end = parsed
                 return start <= end
             
-            # Single IP
-            ipaddress.ip_address(pattern)
+            # CIDR notation or single IP
             return True
             
-        except ValueError:
+        except (ValueError, TypeError):
             return False
     
-    def _validate_hostname_pattern(self, pattern: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=_PATTERN_CACHE_SIZE)
+    def _validate_hostname_pattern(pattern: str) -> bool:
         """Validate hostname pattern."""
         if not pattern:
             return False
@@ -366,7 +624,7 @@ class NoProxyConfiguration:
                 return False
             
             # Check for valid characters
-            if not re.match(r'^[a-zA-Z0-9-]+$', label):
+            if not _HOSTNAME_LABEL_RE.match(label):
                 return False
             
             # Cannot start or end with hyphen
@@ -375,6 +633,20 @@ class NoProxyConfiguration:
         
         return True
     
+    def __copy__(self) -> 'NoProxyConfiguration':
+        """Copy without re-validating; the copy gets its own pattern and error lists."""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.patterns = self.patterns.copy()
+        clone._pattern_set = self._pattern_set.copy()
+        # Both lookups describe the same contents; point them at the new list
+        if self._indexed_source is self.patterns:
+            clone._indexed_source = clone.patterns
+        if self._pattern_set_source is self.patterns:
+            clone._pattern_set_source = clone.patterns
+        clone.validation_errors = self.validation_errors.copy()
+        return clone
+    
     def to_dict(self) -> dict:
         """Convert configuration to dictionary."""
         return {
@@ -402,26 +674,29 @@ class NoProxyConfiguration:
         Returns:
             Comma-separated string of no proxy patterns
         """
+        # Reuse the last result until patterns or bypass options change
+        patterns = self._pattern_snapshot()
+        key = (self.bypass_localhost, self.bypass_private_networks)
+        cached = self._px_cache
+        if cached is not None and cached[0] is patterns and cached[1] == key:
+            return cached[2]
+        
         all_patterns = []
         
         # Add localhost patterns if enabled
         if self.bypass_localhost:
-            all_patterns.extend(['localhost', '127.0.0.1', '::1'])
+            all_patterns.extend(_LOCALHOST_PATTERNS)
         
         # Add private network patterns if enabled
         if self.bypass_private_networks:
-            all_patterns.extend([
-                '10.0.0.0/8',
-                '172.16.0.0/12', 
-                '192.168.0.0/16',
-                '169.254.0.0/16',  # Link-local
-                'fc00::/7'  # IPv6 private
-            ])
+            all_patterns.extend(_PRIVATE_NETWORK_PATTERNS)
         
         # Add custom patterns
-        all_patterns.extend(self.patterns)
+        all_patterns.extend(patterns)
         
-        return ','.join(all_patterns)
+        px_format = ','.join(all_patterns)
+        self._px_cache = (patterns, key, px_format)
+        return px_format
     
     @classmethod
     def from_px_format(cls, no_proxy_string: str) -> 'NoProxyConfiguration':
@@ -437,23 +712,18 @@ class NoProxyConfiguration:
         if not no_proxy_string:
             return cls()
         
-        patterns = [p.strip() for p in no_proxy_string.split(',') if p.strip()]
-        
-        # Separate built-in patterns from custom ones
-        localhost_patterns = {'localhost', '127.0.0.1', '::1'}
-        private_patterns = {
-            '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16',
-            '169.254.0.0/16', 'fc00::/7'
-        }
-        
+        # Separate built-in patterns from custom ones in a single pass
         custom_patterns = []
         bypass_localhost = False
         bypass_private_networks = False
         
-        for pattern in patterns:
-            if pattern in localhost_patterns:
+        for pattern in no_proxy_string.split(','):
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            if pattern in _LOCALHOST_PATTERN_SET:
                 bypass_localhost = True
-            elif pattern in private_patterns:
+            elif pattern in _PRIVATE_NETWORK_PATTERN_SET:
                 bypass_private_networks = True
             else:
                 custom_patterns.append(pattern)
@@ -469,10 +739,10 @@ class NoProxyConfiguration:
         count = len(self.patterns)
         
         if self.bypass_localhost:
-            count += 3  # localhost, 127.0.0.1, ::1
+            count += len(_LOCALHOST_PATTERNS)
         
         if self.bypass_private_networks:
-            count += 5  # Private network ranges
+            count += len(_PRIVATE_NETWORK_PATTERNS)
         
         return count
     
@@ -3,11 +3,69 @@ PAC configuration model for managing Proxy Auto-Configuration files.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional
 import re
 import urllib.parse
 
 
+# PAC helper functions made available to scripts evaluated for URL testing
+PAC_HELPERS = '''
+    function isPlainHostName(host) {
+        return host.indexOf('.') === -1;
+    }
+    
+    function dnsDomainIs(host, domain) {
+        return host.toLowerCase().endsWith(domain.toLowerCase());
+    }
+    
+    function localHostOrDomainIs(host, hostdom) {
+        return host === hostdom || host === hostdom.split('.')[0];
+    }
+    
+    function isResolvable(host) {
+        return true;
+    }
+    
+    function isInNet(host, pattern, mask) {
+        if (host === '127.0.0.1' && pattern.startsWith('127.')) return true;
+        if (host.startsWith('192.168.') && pattern.startsWith('192.168.')) return true;
+        if (host.startsWith('10.') && pattern.startsWith('10.')) return true;
+        if (host.startsWith('172.16.') && pattern.startsWith('172.16.')) return true;
+        return false;
+    }
+    
+    function dnsResolve(host) {
+        return host;
+    }
+    
+    function myIpAddress() {
+        return '127.0.0.1';
+    }
+    
+    function dnsDomainLevels(host) {
+        return host.split('.').length - 1;
+    }
+    
+    function shExpMatch(str, shexp) {
+        var regex = shexp.replace(/\\*/g, '.*').replace(/\\?/g, '.');
+        return new RegExp('^' + regex + '$').test(str);
+    }
+    '''
+
+
+@lru_cache(maxsize=16)
+def _compile_pac_script(content: str):
+    """
+    Compile PAC content together with the helper functions.
+    
+    Compilation dominates URL testing, so compiled contexts are cached per
+    PAC content and shared by all configurations with the same script.
+    """
+    import execjs
+    return execjs.compile(PAC_HELPERS + '\n' + content)
+
+
 @dataclass
 class PACConfiguration:
     """
@@ -245,57 +303,8 @@ class PACConfiguration:
             Proxy decision string or None if evaluation fails
         """
         try:
-            import execjs
-            
-            # PAC helper functions
-            pac_helpers = '''
-            function isPlainHostName(host) {
-                return host.indexOf('.') === -1;
-            }
-            
-            function dnsDomainIs(host, domain) {
-                return host.toLowerCase().endsWith(domain.toLowerCase());
-            }
-            
-            function localHostOrDomainIs(host, hostdom) {
-                return host === hostdom || host === hostdom.split('.')[0];
-            }
-            
-            function isResolvable(host) {
-                return true;
-            }
-            
-            function isInNet(host, pattern, mask) {
-                if (host === '127.0.0.1' && pattern.startsWith('127.')) return true;
-                if (host.startsWith('192.168.') && pattern.startsWith('192.168.')) return true;
-                if (host.startsWith('10.') && pattern.startsWith('10.')) return true;
-                if (host.startsWith('172.16.') && pattern.startsWith('172.16.')) return true;
-                return false;
-            }
-            
-            function dnsResolve(host) {
-                return host;
-            }
-            
-            function myIpAddress() {
-                return '127.0.0.1';
-            }
-            
-            function dnsDomainLevels(host) {
-                return host.split('.').length - 1;
-            }
-            
-            function shExpMatch(str, shexp) {
-                var regex = shexp.replace(/\\*/g, '.*').replace(/\\?/g, '.');
-                return new RegExp('^' + regex + '$').test(str);
-            }
-            '''
-            
-            # Combine helpers with PAC content
-            full_pac_script = pac_helpers + '\n' + self.content
-            
-            # Execute PAC script
-            ctx = execjs.compile(full_pac_script)
+            # Reuse the compiled context for this PAC content
+            ctx = _compile_pac_script(self.content)
             result = ctx.call('FindProxyForURL', test_url, test_host)
             
             return str(result).strip()
@@ -2,11 +2,15 @@
 Proxy status model for tracking proxy service state.
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ProxyStatus:
     """
     Represents the current status of the proxy service.
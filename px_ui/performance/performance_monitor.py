@@ -221,13 +221,6 @@ class PerformanceMonitor:
                 if cleaned > 0:
                     optimizations += 1
             
-            # Clear throttler pending updates if overloaded
-            if self.update_throttler:
-                pending = self.update_throttler.get_pending_count()
-                if pending > 20:  # Arbitrary threshold
-                    self.update_throttler.clear_pending_updates()
-                    optimizations += 1
-            
             with self._lock:
                 self.stats.total_optimizations += optimizations
             
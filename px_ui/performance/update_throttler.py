@@ -48,8 +48,11 @@ class UpdateThrottler:
     """
     Throttles UI updates to prevent overload during high traffic.
     
-    Supports multiple throttling modes including fixed rate, adaptive,
-    and burst control to maintain UI responsiveness.
+    Update requests are coalesced: only the most recent one is kept and a
+    single worker thread runs it once the current throttle interval has
+    passed, so a burst of requests costs one update instead of being dropped
+    or queued.
+    Supports fixed rate, adaptive and burst control intervals.
     """
     
     def __init__(self, config: Optional[ThrottleConfig] = None):
@@ -68,71 +71,79 @@ class UpdateThrottler:
         self._lock = threading.RLock()
         self._last_update_time = 0.0
         self._update_history = deque(maxlen=100)  # Track recent updates
+        self._request_times = deque(maxlen=max(self.config.burst_threshold, 1))
         self._burst_start_time = 0.0
         self._in_burst_mode = False
         
-        # Pending updates queue
-        self._pending_updates: List[Callable] = []
-        self._update_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        # Latest requested update and the worker that runs it
+        self._pending: Optional[Callable] = None
+        self._pending_priority = 0
+        self._condition = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
         
         # Adaptive throttling state
         self._adaptive_interval = self.config.min_update_interval_ms / 1000.0
         self._load_history = deque(maxlen=20)
         
     def start_throttling(self):
-        """Start background update processing."""
-        if self._update_thread and self._update_thread.is_alive():
-            return
+        """
+        Start update processing.
         
-        self._stop_event.clear()
-        self._update_thread = threading.Thread(
-            target=self._update_loop,
-            name="UpdateThrottler",
-            daemon=True
-        )
-        self._update_thread.start()
+        The worker thread is also started on demand by request_update(), so
+        this is only needed to resume after stop_throttling().
+        """
+        with self._lock:
+            self._stopped = False
+            self._ensure_worker()
     
     def stop_throttling(self):
-        """Stop background update processing."""
-        self._stop_event.set()
+        """Stop update processing, dropping any pending update."""
+        with self._lock:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify_all()
+            worker, self._worker = self._worker, None
         
-        if self._update_thread and self._update_thread.is_alive():
-            self._update_thread.join(timeout=1.0)
+        if (worker is not None and worker.is_alive()
+                and worker is not threading.current_thread()):
+            worker.join(timeout=1.0)
     
     def request_update(self, update_func: Callable, priority: int = 0) -> bool:
         """
         Request a UI update with throttling.
         
+        The update replaces any pending one of the same or lower priority and
+        runs on the worker thread once the throttle interval allows it.
+        
         Args:
             update_func: Function to call for update
             priority: Update priority (higher = more important)
             
         Returns:
-            True if update was accepted, False if throttled
+            True if update was accepted, False if a higher priority update
+            is already pending or throttling was stopped
         """
         current_time = time.time()
         
         with self._lock:
-            self.stats.total_requests += 1
-            
-            # Check if we should throttle this update
-            if self._should_throttle(current_time):
-                self.stats.throttled_requests += 1
+            if self._stopped:
                 return False
             
-            # Add to pending updates
-            self._pending_updates.append((update_func, priority, current_time))
+            self.stats.total_requests += 1
+            self._check_burst_mode(current_time)
             
-            # Sort by priority (higher priority first)
-            self._pending_updates.sort(key=lambda x: x[1], reverse=True)
+            if self._pending is not None:
+                # Whichever update loses the slot will never run
+                self.stats.throttled_requests += 1
+                if priority < self._pending_priority:
+                    return False
             
-            # Limit pending updates to prevent memory issues
-            if len(self._pending_updates) > 50:
-                # Remove lowest priority updates
-                self._pending_updates = self._pending_updates[:50]
+            self._pending = update_func
+            self._pending_priority = priority
             
-            self.stats.processed_requests += 1
+            self._ensure_worker()
+            self._condition.notify()
             return True
     
     def force_update(self, update_func: Callable):
@@ -194,57 +205,42 @@ class UpdateThrottler:
     def clear_pending_updates(self):
         """Clear all pending updates."""
         with self._lock:
-            self._pending_updates.clear()
+            self._pending = None
     
     def get_pending_count(self) -> int:
         """Get number of pending updates."""
         with self._lock:
-            return len(self._pending_updates)
-    
-    def _should_throttle(self, current_time: float) -> bool:
-        """Check if update should be throttled."""
-        # Check minimum interval
-        time_since_last = current_time - self._last_update_time
-        min_interval = self._get_current_min_interval()
-        
-        if time_since_last < min_interval:
-            return True
-        
-        # Check burst mode
-        if self._check_burst_mode(current_time):
-            return True
-        
-        # Check rate limit
-        recent_updates = [t for t in self._update_history 
-                         if current_time - t < 1.0]
-        if len(recent_updates) >= self.config.max_updates_per_second:
-            return True
-        
-        return False
+            return 0 if self._pending is None else 1
     
     def _get_current_min_interval(self) -> float:
         """Get current minimum interval based on throttling mode."""
+        rate_interval = 1.0 / self.config.max_updates_per_second
+        
         if self.config.mode == ThrottleMode.FIXED_RATE:
-            return self.config.min_update_interval_ms / 1000.0
+            interval = self.config.min_update_interval_ms / 1000.0
         
         elif self.config.mode == ThrottleMode.ADAPTIVE:
-            return self._adaptive_interval
+            interval = self._adaptive_interval
         
         elif self.config.mode == ThrottleMode.BURST_CONTROL:
             if self._in_burst_mode:
-                return (self.config.min_update_interval_ms * 2) / 1000.0
+                interval = (self.config.min_update_interval_ms * 2) / 1000.0
             else:
-                return self.config.min_update_interval_ms / 1000.0
+                interval = self.config.min_update_interval_ms / 1000.0
+        
+        else:
+            interval = self.config.min_update_interval_ms / 1000.0
         
-        return self.config.min_update_interval_ms / 1000.0
+        return max(interval, rate_interval)
     
     def _check_burst_mode(self, current_time: float) -> bool:
         """Check and manage burst mode."""
-        # Count recent requests
-        recent_requests = sum(1 for _, _, t in self._pending_updates 
-                            if current_time - t < 1.0)
+        self._request_times.append(current_time)
         
-        if recent_requests >= self.config.burst_threshold:
+        # burst_threshold requests within the last second start a burst
+        request_times = self._request_times
+        if (len(request_times) == request_times.maxlen
+                and current_time - request_times[0] < 1.0):
             if not self._in_burst_mode:
                 self._in_burst_mode = True
                 self._burst_start_time = current_time
@@ -263,35 +259,53 @@ class UpdateThrottler:
         self._update_history.append(update_time)
         self.stats.last_update = datetime.fromtimestamp(update_time)
     
-    def _update_loop(self):
-        """Background update processing loop."""
-        while not self._stop_event.is_set():
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running (lock held)."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._worker_loop,
+                name="UpdateThrottler",
+                daemon=True
+            )
+            self._worker.start()
+    
+    def _next_update(self) -> Optional[Callable]:
+        """
+        Wait until an update is pending and the throttle interval has passed
+        (lock held). Returns None once throttling is stopped or this worker
+        was replaced by a restart.
+        """
+        worker = threading.current_thread()
+        while not self._stopped and self._worker is worker:
+            if self._pending is None:
+                self._condition.wait()
+                continue
+            
+            delay = self._last_update_time + self._get_current_min_interval() - time.time()
+            if delay > 0:
+                self._condition.wait(delay)
+                continue
+            
+            update_func = self._pending
+            self._pending = None
+            self.stats.processed_requests += 1
+            self._record_update(time.time())
+            return update_func
+        return None
+    
+    def _worker_loop(self):
+        """Run coalesced updates until throttling is stopped (worker thread)."""
+        while True:
+            with self._lock:
+                update_func = self._next_update()
+            if update_func is None:
+                return
+            
+            # Requests arriving while this runs wait for the next interval
             try:
-                current_time = time.time()
-                updates_to_process = []
-                
-                with self._lock:
-                    if self._pending_updates and not self._should_throttle(current_time):
-                        # Get next update to process
-                        update_func, priority, request_time = self._pending_updates.pop(0)
-                        updates_to_process.append(update_func)
-                        self._record_update(current_time)
-                
-                # Process updates outside of lock
-                for update_func in updates_to_process:
-                    try:
-                        update_func()
-                    except Exception as e:
-                        print(f"Error processing throttled update: {e}")
-                
-                # Sleep for minimum interval
-                sleep_time = self._get_current_min_interval()
-                if self._stop_event.wait(sleep_time):
-                    break
-                
+                update_func()
             except Exception as e:
-                print(f"Error in update throttling loop: {e}")
-                time.sleep(0.1)
+                print(f"Error processing throttled update: {e}")
     
     def reset_stats(self):
         """Reset throttling statistics."""
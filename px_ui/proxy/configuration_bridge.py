@@ -5,10 +5,13 @@ This module provides utilities to configure px to use the enhanced handler
 with monitoring capabilities and control proxy lifecycle.
 """
 
+import ipaddress
+import os
 import sys
 import threading
 import time
 import logging
+from collections import defaultdict
 from datetime import datetime
 from typing import Optional, Dict, Any, Callable
 from pathlib import Path
@@ -74,6 +77,7 @@ class PxConfigurationBridge:
         self._pac_content: Optional[str] = None
         self._pac_source: Optional[str] = None
         self._no_proxy_config: NoProxyConfiguration = NoProxyConfiguration()
+        self._last_applied_no_proxy: Optional[str] = None
     
     def configure_px_monitoring(self):
         """
@@ -1183,44 +1187,51 @@ class PxConfigurationBridge:
             config: Configuration dictionary to validate
             
         Returns:
-            Dictionary with validation results
+            Dictionary with validation results. 'errors' is the flat list of
+            messages; 'errors_by_category' holds the same messages keyed by
+            'port', 'listen_address', 'mode', 'pac', 'no_proxy' or 'general'.
         """
         errors = []
+        errors_by_category = defaultdict(list)
         warnings = []
         
+        def add_errors(category: str, *messages: str):
+            errors.extend(messages)
+            errors_by_category[category].extend(messages)
+        
         try:
             # Validate port
             port = config.get('port', 3128)
             if not isinstance(port, int) or not (1 <= port <= 65535):
-                errors.append(f"Invalid port: {port}. Must be between 1 and 65535")
+                add_errors('port', f"Invalid port: {port}. Must be between 1 and 65535")
             
             # Validate listen address
             listen_address = config.get('listen_address', '127.0.0.1')
             if not self._is_valid_ip_address(listen_address):
-                errors.append(f"Invalid listen address: {listen_address}")
+                add_errors('listen_address', f"Invalid listen address: {listen_address}")
             
             # Validate mode
             mode = config.get('mode', 'manual')
             valid_modes = {'manual', 'pac', 'auto'}
             if mode not in valid_modes:
-                errors.append(f"Invalid mode: {mode}. Must be one of {valid_modes}")
+                add_errors('mode', f"Invalid mode: {mode}. Must be one of {valid_modes}")
             
             # Validate PAC configuration if mode is PAC
             if mode == 'pac':
                 pac_config = config.get('pac_config')
                 if not pac_config:
-                    errors.append("PAC mode selected but no PAC configuration available")
+                    add_errors('pac', "PAC mode selected but no PAC configuration available")
                 elif not hasattr(pac_config, 'content') or not pac_config.content:
-                    errors.append("PAC mode selected but no PAC content available")
+                    add_errors('pac', "PAC mode selected but no PAC content available")
                 elif not pac_config.is_valid:
-                    errors.append("PAC configuration is not valid")
+                    add_errors('pac', "PAC configuration is not valid")
                     if hasattr(pac_config, 'validation_errors'):
-                        errors.extend(pac_config.validation_errors)
+                        add_errors('pac', *pac_config.validation_errors)
                 else:
                     # PAC config is valid
                     pac_validation = self._validate_pac_content(pac_config.content)
                     if not pac_validation['is_valid']:
-                        errors.extend(pac_validation['errors'])
+                        add_errors('pac', *pac_validation['errors'])
                     warnings.extend(pac_validation.get('warnings', []))
             
             # Check for port conflicts
@@ -1229,45 +1240,47 @@ class PxConfigurationBridge:
             
             # Validate no proxy configuration
             if not self._no_proxy_config.validate():
-                errors.extend([f"No proxy: {error}" for error in self._no_proxy_config.validation_errors])
+                add_errors('no_proxy', *[f"No proxy: {error}" for error in self._no_proxy_config.validation_errors])
             
         except Exception as e:
-            errors.append(f"Configuration validation error: {str(e)}")
+            add_errors('general', f"Configuration validation error: {str(e)}")
         
         return {
             'is_valid': len(errors) == 0,
             'errors': errors,
+            'errors_by_category': dict(errors_by_category),
             'warnings': warnings
         }
     
     def _is_valid_ip_address(self, ip: str) -> bool:
         """Validate IP address format."""
-        if ip in ('localhost', '0.0.0.0'):
+        if ip == 'localhost':
             return True
         
+        # The proxy server listens on IPv4 only; IPv4Address would also
+        # accept a bare int, which is not a valid config value
+        if not isinstance(ip, str):
+            return False
         try:
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            
-            for part in parts:
-                num = int(part)
-                if not (0 <= num <= 255):
-                    return False
-            
+            ipaddress.IPv4Address(ip)
             return True
-        except (ValueError, AttributeError):
+        except ValueError:
             return False
     
     def _is_port_in_use(self, port: int) -> bool:
         """Check if a port is already in use."""
         import socket
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            # No SO_REUSEADDR: on Windows it lets the bind succeed while
+            # another process is listening. Ask for exclusive use instead.
+            if sys.platform == 'win32':
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            try:
                 s.bind(('127.0.0.1', port))
                 return False
-        except OSError:
-            return True
+            except OSError:
+                # Any failure to bind means the proxy couldn't either
+                return True
     
     def _validate_pac_content(self, pac_content: str) -> Dict[str, Any]:
         """
@@ -1356,20 +1369,24 @@ class PxConfigurationBridge:
             # Convert to px-compatible format
             no_proxy_string = self._no_proxy_config.to_px_format()
             
+            # Skip the environment writes if nothing changed since last apply
+            if no_proxy_string == self._last_applied_no_proxy:
+                return
+            
             if no_proxy_string:
                 # Set environment variable for px to use
-                import os
                 os.environ['NO_PROXY'] = no_proxy_string
                 os.environ['no_proxy'] = no_proxy_string  # Some systems use lowercase
                 
                 self.logger.info(f"Applied no proxy configuration: {no_proxy_string}")
             else:
                 # Clear no proxy settings
-                import os
                 os.environ.pop('NO_PROXY', None)
                 os.environ.pop('no_proxy', None)
                 self.logger.info("Cleared no proxy configuration")
             
+            self._last_applied_no_proxy = no_proxy_string
+            
         except Exception as e:
             self.logger.error(f"Failed to apply no proxy configuration: {e}")
             raise
@@ -5,6 +5,8 @@ This module extends the px.handler.PxHandler class to add monitoring capabilitie
 for real-time request/response tracking in the UI.
 """
 
+import sys
+import threading
 import time
 import uuid
 from datetime import datetime
@@ -18,6 +20,7 @@ from px.config import STATE
 # Import our event system
 from ..communication.events import RequestEvent, ResponseEvent, ErrorEvent, ProxyDecisionUpdateEvent, EventType
 from ..communication.event_system import EventSystem
+from ..communication.error_classifier import classify
 
 # Import error handling
 from ..error_handling import ErrorManager, ErrorCategory, ErrorSeverity, get_error_manager
@@ -39,7 +42,18 @@ class MonitoringHooks:
             event_system: Event system to send events to
         """
         self.event_system = event_system
-        self._request_start_times: Dict[str, float] = {}
+        # px serves each request start-to-finish on one handler thread, so
+        # start times are kept per thread and need no shared lock
+        self._local = threading.local()
+    
+    @property
+    def _request_start_times(self) -> Dict[str, float]:
+        """Start times of in-flight requests handled by the current thread."""
+        try:
+            return self._local.start_times
+        except AttributeError:
+            start_times = self._local.start_times = {}
+            return start_times
         
     def on_request_start(self, request_id: str, url: str, method: str, headers: Optional[Dict[str, str]] = None):
         """
@@ -55,7 +69,7 @@ class MonitoringHooks:
         
         if self.event_system:
             # We'll set proxy_decision later in on_proxy_decision
-            event = RequestEvent(
+            event = RequestEvent.acquire(
                 event_type=None,  # Will be set by __post_init__
                 timestamp=datetime.now(),
                 event_id=str(uuid.uuid4()),
@@ -80,7 +94,7 @@ class MonitoringHooks:
         logger.info(f"on_proxy_decision called for request {request_id} with decision {proxy_decision}")
 
         if self.event_system:
-            event = ProxyDecisionUpdateEvent(
+            event = ProxyDecisionUpdateEvent.acquire(
                 event_type=EventType.PROXY_DECISION_UPDATE,
                 timestamp=datetime.now(),
                 event_id=str(uuid.uuid4()),
@@ -105,7 +119,7 @@ class MonitoringHooks:
 
         if self.event_system:
             fallback_decision = f"{original_proxy} --fb--> {fallback_proxy}"
-            event = ProxyDecisionUpdateEvent(
+            event = ProxyDecisionUpdateEvent.acquire(
                 event_type=EventType.PROXY_DECISION_UPDATE,
                 timestamp=datetime.now(),
                 event_id=str(uuid.uuid4()),
@@ -126,16 +140,13 @@ class MonitoringHooks:
             body_preview: First 500 characters of response body
             content_length: Total content length
         """
-        # Calculate response time
-        start_time = self._request_start_times.get(request_id, time.time())
-        response_time = time.time() - start_time
-        
-        # Clean up start time
-        if request_id in self._request_start_times:
-            del self._request_start_times[request_id]
+        # Calculate response time and clean up start time
+        now = time.time()
+        start_time = self._request_start_times.pop(request_id, now)
+        response_time = now - start_time
         
         if self.event_system:
-            event = ResponseEvent(
+            event = ResponseEvent.acquire(
                 event_type=None,  # Will be set by __post_init__
                 timestamp=datetime.now(),
                 event_id=str(uuid.uuid4()),
@@ -161,8 +172,8 @@ class MonitoringHooks:
             url: Associated URL if applicable
         """
         # Clean up start time if we have a request_id
-        if request_id and request_id in self._request_start_times:
-            del self._request_start_times[request_id]
+        if request_id:
+            self._request_start_times.pop(request_id, None)
         
         # Handle error with error management system
         error_category = self._map_error_type_to_category(error_type)
@@ -183,7 +194,7 @@ class MonitoringHooks:
         )
         
         if self.event_system:
-            event = ErrorEvent(
+            event = ErrorEvent.acquire(
                 event_type=None,  # Will be set by __post_init__
                 timestamp=datetime.now(),
                 event_id=str(uuid.uuid4()),
@@ -209,12 +220,14 @@ class MonitoringHooks:
     
     def _determine_error_severity(self, error_type: str, error_message: str) -> ErrorSeverity:
         """Determine error severity based on type and message."""
+        tags = classify(error_message)
+        
         # Critical errors
-        if 'fatal' in error_message.lower() or 'critical' in error_message.lower():
+        if 'fatal' in tags or 'critical' in tags:
             return ErrorSeverity.CRITICAL
         
         # High severity errors
-        if error_type in ['auth', 'proxy'] or 'connection refused' in error_message:
+        if error_type in ['auth', 'proxy'] or 'connection_refused' in tags:
             return ErrorSeverity.HIGH
         
         # Medium severity errors
@@ -404,7 +417,10 @@ class EnhancedPxHandler(px.handler.PxHandler):
                 body_data = getattr(self.curl, 'body', '')
                 if isinstance(body_data, bytes):
                     try:
-                        body_preview = body_data.decode('utf-8', errors='ignore')[:500]
+                        # Decode only the bytes that can reach the 500-char
+                        # preview (UTF-8 is at most 4 bytes per char), reading
+                        # through a memoryview so the body is not copied
+                        body_preview = str(memoryview(body_data)[:2000], 'utf-8', 'ignore')[:500]
                     except Exception:
                         body_preview = str(body_data)[:500]
                 elif isinstance(body_data, str):
@@ -439,7 +455,9 @@ class EnhancedPxHandler(px.handler.PxHandler):
             for line in lines:
                 if ':' in line:
                     key, value = line.split(':', 1)
-                    headers[key.strip().lower()] = value.strip()
+                    # Header names repeat across every response the monitoring
+                    # view retains; interning shares one string per name
+                    headers[sys.intern(key.strip().lower())] = value.strip()
         except Exception as e:
             print(f"Error parsing headers: {e}")
         
@@ -523,18 +541,18 @@ class EnhancedPxHandler(px.handler.PxHandler):
     def _determine_error_severity(self, error_type: str, error_message: str) -> ErrorSeverity:
         """Determine error severity based on type and message."""
         error_type = error_type.lower()
-        error_message = error_message.lower()
+        tags = classify(error_message)
         
         # Critical errors
-        if 'critical' in error_message or 'fatal' in error_message:
+        if 'critical' in tags or 'fatal' in tags:
             return ErrorSeverity.CRITICAL
         
         # High severity errors
-        if error_type in ['auth', 'proxy'] or 'connection refused' in error_message:
+        if error_type in ['auth', 'proxy'] or 'connection_refused' in tags:
             return ErrorSeverity.HIGH
         
         # Medium severity errors
-        if error_type in ['network', 'pac'] or 'timeout' in error_message:
+        if error_type in ['network', 'pac'] or 'timeout' in tags:
             return ErrorSeverity.MEDIUM
         
         # Default to low severity
@@ -2,6 +2,14 @@
 UI components for the px UI client application.
 """
 
-from .main_window import MainWindow
+__all__ = ['MainWindow']
 
-__all__ = ['MainWindow']
\ No newline at end of file
+
+def __getattr__(name):
+    # Import MainWindow (and with it every panel) on first use, so importing
+    # a single UI submodule such as px_ui.ui.monitoring_view stays cheap
+    if name == 'MainWindow':
+        from .main_window import MainWindow
+        globals()['MainWindow'] = MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,6 +19,10 @@ from px_ui.error_handling.error_manager import ErrorManager, ErrorCategory, Erro
 from px_ui.performance import PerformanceMonitor, PerformanceConfig, MemoryManager, UpdateThrottler
 
 
+# Row tags by status class (status_code // 100); 5 also covers codes >= 600
+_STATUS_CLASS_TAGS = {2: "success", 4: "client_error", 5: "server_error"}
+
+
 class RequestEntry:
     """Represents a single request entry in the monitoring view."""
     
@@ -480,14 +484,7 @@ class MonitoringView(ttk.Frame):
             return "error"
         elif entry.status_code is None:
             return "normal"
-        elif 200 <= entry.status_code < 300:
-            return "success"
-        elif 400 <= entry.status_code < 500:
-            return "client_error"
-        elif entry.status_code >= 500:
-            return "server_error"
-        else:
-            return "normal"
+        return _STATUS_CLASS_TAGS.get(min(entry.status_code // 100, 5), "normal")
     
     def _show_response_details(self, entry: RequestEntry):
         """Show response details dialog."""
@@ -2,15 +2,36 @@
 No Proxy Configuration Panel for managing proxy bypass settings.
 """
 
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, simpledialog
 import logging
+from functools import lru_cache
 from typing import Optional, Callable, List
 
 from px_ui.models.no_proxy_configuration import NoProxyConfiguration
 from px_ui.error_handling.error_manager import ErrorCategory, ErrorSeverity
 
 
+_IP_ADDRESS_RE = re.compile(r'^\d+\.\d+\.\d+\.\d+$')
+
+
+@lru_cache(maxsize=1024)
+def _classify_pattern(pattern: str) -> str:
+    """Get the display type of a no proxy pattern."""
+    if '/' in pattern:
+        return "CIDR"
+    if pattern.startswith('*'):
+        return "Wildcard"
+    if '-' in pattern and pattern[:1].isdigit():
+        return "IP Range"
+    if _IP_ADDRESS_RE.match(pattern):
+        return "IP Address"
+    if pattern.startswith('.'):
+        return "Domain"
+    return "Hostname"
+
+
 class NoProxyPanel(ttk.Frame):
     """
     Panel for configuring no proxy settings.
@@ -31,6 +52,7 @@ class NoProxyPanel(ttk.Frame):
         
         # UI state
         self._updating_ui = False
+        self._shown_patterns: List[str] = []  # Sorted listbox contents
         
         # Create UI
         self._setup_ui()
@@ -477,6 +499,10 @@ class NoProxyPanel(ttk.Frame):
                 else:
                     messagebox.showerror("Export Error", f"Failed to export entries:\n{str(e)}")
     
+    def _get_pattern_type(self, pattern: str) -> str:
+        """Get the display type (CIDR, Wildcard, IP Range, ...) of a pattern."""
+        return _classify_pattern(pattern)
+    
     def _on_selection_changed(self, event=None):
         """Handle listbox selection change."""
         selection = self.no_proxy_listbox.curselection()
@@ -493,9 +519,9 @@ class NoProxyPanel(ttk.Frame):
         self._updating_ui = True
         try:
             # Update listbox
-            self.no_proxy_listbox.delete(0, tk.END)
-            for host in sorted(self.no_proxy_config.patterns):
-                self.no_proxy_listbox.insert(tk.END, host)
+            patterns = sorted(self.no_proxy_config.patterns)
+            if patterns != self._shown_patterns:
+                self._apply_listbox_changes(patterns)
             
             # Update button states
             self._on_selection_changed()
@@ -503,6 +529,37 @@ class NoProxyPanel(ttk.Frame):
         finally:
             self._updating_ui = False
     
+    def _apply_listbox_changes(self, patterns: List[str]):
+        """
+        Bring the listbox from the shown patterns to the given sorted patterns.
+        
+        Both lists are sorted, so one merge pass finds the rows to delete and
+        insert; unchanged rows are left alone. An empty listbox is filled
+        with a single insert call.
+        """
+        listbox = self.no_proxy_listbox
+        shown = self._shown_patterns
+        
+        if not shown:
+            if patterns:
+                listbox.insert(tk.END, *patterns)
+        else:
+            position = i = j = 0
+            while i < len(shown) or j < len(patterns):
+                if j == len(patterns) or (i < len(shown) and shown[i] < patterns[j]):
+                    listbox.delete(position)
+                    i += 1
+                elif i == len(shown) or patterns[j] < shown[i]:
+                    listbox.insert(position, patterns[j])
+                    position += 1
+                    j += 1
+                else:
+                    position += 1
+                    i += 1
+                    j += 1
+        
+        self._shown_patterns = patterns
+    
     def _update_status(self, message: str):
         """Update status label."""
         self.status_label.config(text=message)
@@ -9,10 +9,33 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from px_ui.error_handling.error_manager import ErrorCategory, ErrorSeverity
 from typing import Dict, Optional
+from http import HTTPStatus
 import json
 import html
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Reason phrases for every standard HTTP status code, built once
+_STATUS_TEXTS = {status.value: status.phrase for status in HTTPStatus}
+
+# Display units for byte counts, largest first
+_BYTE_UNITS = ((1 << 20, "MB"), (1 << 10, "KB"))
+
+
+def _pretty_json(content: str) -> str:
+    """Re-indent JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(content), option=orjson.OPT_INDENT_2).decode()
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # NaN literals, integers over 64 bits; the json module copes
+    return json.dumps(json.loads(content), indent=2, ensure_ascii=False)
+
 
 class ResponseDetailsDialog:
     """
@@ -298,15 +321,24 @@ REQUEST HEADERS
         """Update body display based on selected format."""
         self.body_text.config(state="normal")
         self.body_text.delete("1.0", "end")
+        self.body_text.insert("1.0", self._format_body(self.entry.body_preview, self.format_var.get()))
+        self.body_text.config(state="disabled")
         
-        content = self.entry.body_preview
-        format_type = self.format_var.get()
+    def _format_body(self, content: str, format_type: str) -> str:
+        """
+        Format body content for display.
         
+        Args:
+            content: Raw body content
+            format_type: One of "Raw", "JSON", "HTML" or "XML"
+            
+        Returns:
+            Formatted content, or the raw content if formatting fails
+        """
         try:
             if format_type == "JSON" and content.strip():
                 # Try to format as JSON
-                parsed = json.loads(content)
-                content = json.dumps(parsed, indent=2, ensure_ascii=False)
+                content = _pretty_json(content)
             elif format_type == "HTML" and content.strip():
                 # Basic HTML formatting (just add line breaks)
                 content = html.unescape(content)
@@ -319,9 +351,7 @@ REQUEST HEADERS
             
         if not content.strip():
             content = "(Empty response body)"
-            
-        self.body_text.insert("1.0", content)
-        self.body_text.config(state="disabled")
+        return content
         
     def _format_xml(self, xml_content: str) -> str:
         """Basic XML formatting."""
@@ -367,8 +397,10 @@ REQUEST HEADERS
         
     def _copy_url(self):
         """Copy URL to clipboard."""
-        self.dialog.clipboard_clear()
-        self.dialog.clipboard_append(self.entry.url)
+        # The clipboard is shared by the whole application, so any widget works
+        widget = self.dialog or self.parent
+        widget.clipboard_clear()
+        widget.clipboard_append(self.entry.url)
         messagebox.showinfo("Copied", "URL copied to clipboard")
         
     def _export_details(self):
@@ -384,19 +416,7 @@ REQUEST HEADERS
         
         if filename:
             try:
-                export_data = {
-                    "url": self.entry.url,
-                    "method": self.entry.method,
-                    "timestamp": self.entry.timestamp.isoformat(),
-                    "proxy_decision": self.entry.proxy_decision,
-                    "request_headers": self.entry.headers or {},
-                    "status_code": self.entry.status_code,
-                    "response_headers": self.entry.response_headers,
-                    "response_time": self.entry.response_time,
-                    "content_length": self.entry.content_length,
-                    "body_preview": self.entry.body_preview,
-                    "error_message": self.entry.error_message
-                }
+                export_data = self._build_export_payload()
                 
                 if filename.endswith('.json'):
                     with open(filename, 'w', encoding='utf-8') as f:
@@ -423,6 +443,22 @@ REQUEST HEADERS
                 else:
                     messagebox.showerror("Export Error", f"Failed to export details: {str(e)}")
                 
+    def _build_export_payload(self) -> Dict:
+        """Collect the entry's details as exported by _export_details."""
+        return {
+            "url": self.entry.url,
+            "method": self.entry.method,
+            "timestamp": self.entry.timestamp.isoformat(),
+            "proxy_decision": self.entry.proxy_decision,
+            "request_headers": self.entry.headers or {},
+            "status_code": self.entry.status_code,
+            "response_headers": self.entry.response_headers,
+            "response_time": self.entry.response_time,
+            "content_length": self.entry.content_length,
+            "body_preview": self.entry.body_preview,
+            "error_message": self.entry.error_message
+        }
+        
     def _on_close(self):
         """Handle dialog close."""
         if self.dialog:
@@ -437,21 +473,11 @@ REQUEST HEADERS
         
     def _format_bytes(self, bytes_count: int) -> str:
         """Format byte count for display."""
-        if bytes_count < 1024:
-            return f"{bytes_count} bytes"
-        elif bytes_count < 1024 * 1024:
-            return f"{bytes_count / 1024:.1f} KB"
-        else:
-            return f"{bytes_count / (1024 * 1024):.1f} MB"
+        for threshold, unit in _BYTE_UNITS:
+            if bytes_count >= threshold:
+                return f"{bytes_count / threshold:.1f} {unit}"
+        return f"{bytes_count} bytes"
             
     def _get_status_text(self, status_code: int) -> str:
         """Get status text for HTTP status code."""
-        status_texts = {
-            200: "OK", 201: "Created", 202: "Accepted", 204: "No Content",
-            301: "Moved Permanently", 302: "Found", 304: "Not Modified",
-            400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
-            405: "Method Not Allowed", 407: "Proxy Authentication Required",
-            500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
-            504: "Gateway Timeout"
-        }
-        return status_texts.get(status_code, "Unknown")
\ No newline at end of file
+        return _STATUS_TEXTS.get(status_code, "Unknown")
\ No newline at end of file
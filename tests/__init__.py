@@ -1 +1,8 @@
-# Tests package initialization
\ No newline at end of file
+# Tests package initialization
+import sys
+from pathlib import Path
+
+# Add project root to path for unittest discovery
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
@@ -0,0 +1,41 @@
+"""
+Pytest configuration shared by the test suite.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path once per session
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def pytest_configure(config):
+    # pytest.ini keeps its settings under [tool:pytest], which pytest does
+    # not read from that file, so register the markers here as well
+    config.addinivalue_line("markers", "performance: Performance and load tests")
+    config.addinivalue_line(
+        "markers",
+        "xdist_group: Keep tests on one pytest-xdist worker (used with --dist loadgroup)"
+    )
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-perf", action="store_true", default=False,
+        help="run tests marked 'performance' (deselected by default)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect performance tests unless --run-perf was given."""
+    if config.getoption("--run-perf"):
+        return
+    
+    selected, deselected = [], []
+    for item in items:
+        (deselected if item.get_closest_marker("performance") else selected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
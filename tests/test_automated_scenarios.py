@@ -5,7 +5,6 @@ Tests real-world scenarios with actual proxy configurations.
 
 import pytest
 import os
-import tempfile
 import json
 import time
 from unittest.mock import Mock, patch
@@ -525,7 +524,6 @@ class TestErrorScenarios:
     
     def test_invalid_pac_file_handling(self):
         """Test handling of invalid PAC files."""
-        # Create temporary invalid PAC file
         invalid_pac_content = '''
         // This is not a valid PAC file
         function WrongFunctionName(url, host) {
@@ -535,32 +533,28 @@ class TestErrorScenarios:
         // Missing FindProxyForURL function
         '''
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.pac', delete=False) as f:
-            f.write(invalid_pac_content)
-            temp_path = f.name
+        # Served from memory; nothing is written to disk
+        pac_path = "/virtual/invalid.pac"
+        self.pac_validator.pac_files[pac_path] = invalid_pac_content
         
-        try:
-            # Attempt to load invalid PAC
-            pac_content = self.pac_validator.load_pac_from_file(temp_path)
-            
-            pac_config = self.pac_validator.create_pac_configuration(
-                source_type="file",
-                source_path=temp_path,
-                content=pac_content
-            )
-            
-            # Should detect invalidity
-            assert pac_config.is_valid is False
-            assert len(pac_config.validation_errors) > 0
-            
-            # Should not be able to apply invalid configuration
-            success = self.config_bridge.apply_pac_configuration(pac_config)
-            assert success is False
-            
-            print(f"Invalid PAC errors: {pac_config.validation_errors}")
+        # Attempt to load invalid PAC
+        pac_content = self.pac_validator.load_pac_from_file(pac_path)
+        
+        pac_config = self.pac_validator.create_pac_configuration(
+            source_type="file",
+            source_path=pac_path,
+            content=pac_content
+        )
+        
+        # Should detect invalidity
+        assert pac_config.is_valid is False
+        assert len(pac_config.validation_errors) > 0
+        
+        # Should not be able to apply invalid configuration
+        success = self.config_bridge.apply_pac_configuration(pac_config)
+        assert success is False
         
-        finally:
-            os.unlink(temp_path)
+        print(f"Invalid PAC errors: {pac_config.validation_errors}")
     
     def test_network_error_simulation(self):
         """Test network error scenarios."""
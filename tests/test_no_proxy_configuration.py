@@ -2,14 +2,8 @@
 Tests for no proxy configuration functionality.
 """
 
+import copy
 import unittest
-import sys
-import os
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 from px_ui.models.no_proxy_configuration import NoProxyConfiguration
 
@@ -17,9 +11,23 @@ from px_ui.models.no_proxy_configuration import NoProxyConfiguration
 class TestNoProxyConfiguration(unittest.TestCase):
     """Test cases for NoProxyConfiguration class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the default configuration once."""
+        cls._template = NoProxyConfiguration()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.config = NoProxyConfiguration()
+        self.config = copy.copy(self._template)
+    
+    def test_copy_is_independent(self):
+        """Test copies do not share pattern lists with the original."""
+        self.config.add_pattern("example.com")
+        self.config.bypass_localhost = False
+        
+        self.assertEqual(self._template.patterns, [])
+        self.assertTrue(self._template.bypass_localhost)
+        self.assertEqual(copy.copy(self.config).patterns, ["example.com"])
     
     def test_initialization(self):
         """Test configuration initialization."""
@@ -146,6 +154,68 @@ class TestNoProxyConfiguration(unittest.TestCase):
         # Test IP range match
         self.assertTrue(self.config.should_bypass_proxy("10.0.0.50"))
         self.assertFalse(self.config.should_bypass_proxy("10.0.0.200"))
+        
+        # Patterns removed or appended directly are picked up
+        self.config.remove_pattern("example.com")
+        self.assertFalse(self.config.should_bypass_proxy("example.com"))
+        self.config.patterns.append(".corp.example")
+        self.assertTrue(self.config.should_bypass_proxy("host.CORP.example"))
+    
+    def test_extend_patterns(self):
+        """Test bulk pattern addition validates once and skips invalid entries."""
+        added = self.config.extend_patterns(["example.com", "bad<pattern", "10.0.0.0/8", "example.com"])
+        self.assertEqual(added, 2)
+        self.assertEqual(self.config.patterns, ["example.com", "10.0.0.0/8"])
+        self.assertTrue(self.config.is_valid)
+        
+        with self.config.batch_edit():
+            self.config.patterns.append("bad<pattern")
+            self.assertTrue(self.config.validate())  # Deferred inside the batch
+        self.assertFalse(self.config.is_valid)
+    
+    def test_contains(self):
+        """Test pattern membership checks on the configuration."""
+        self.config.add_pattern("example.com")
+        self.assertIn("example.com", self.config)
+        self.assertFalse(self.config.add_pattern("example.com"))
+        
+        self.config.patterns.append("direct.com")
+        self.config.validate()
+        self.assertIn("direct.com", self.config)
+        
+        self.config.remove_pattern("example.com")
+        self.assertNotIn("example.com", self.config)
+        self.config.clear_patterns()
+        self.assertNotIn("direct.com", self.config)
+    
+    def test_membership_follows_direct_list_edits(self):
+        """Test add/remove/in see patterns edited on the list without validate()."""
+        self.config.patterns.append("example.com")
+        self.assertIn("example.com", self.config)
+        self.assertFalse(self.config.add_pattern("example.com"))
+        self.assertEqual(self.config.patterns, ["example.com"])
+        
+        self.assertTrue(self.config.remove_pattern("example.com"))
+        self.assertEqual(self.config.patterns, [])
+        
+        self.config.patterns = ["other.com"]
+        self.assertIn("other.com", self.config)
+        self.assertTrue(self.config.should_bypass_proxy("other.com"))
+    
+    def test_px_format_cache_invalidation(self):
+        """Test cached px format follows pattern and bypass option changes."""
+        self.config.add_pattern("example.com")
+        first = self.config.to_px_format()
+        self.assertIs(self.config.to_px_format(), first)
+        
+        self.config.bypass_localhost = False
+        self.assertNotIn("localhost", self.config.to_px_format())
+        
+        self.config.patterns.append("other.com")
+        self.assertIn("other.com", self.config.to_px_format())
+        
+        self.config.remove_pattern("example.com")
+        self.assertNotIn("example.com", self.config.to_px_format())
     
     def test_px_format_conversion(self):
         """Test conversion to/from px format."""
@@ -223,9 +293,14 @@ class TestNoProxyConfiguration(unittest.TestCase):
 class TestNoProxyPatternValidation(unittest.TestCase):
     """Test cases for pattern validation."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the default configuration once."""
+        cls._template = NoProxyConfiguration()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.config = NoProxyConfiguration()
+        self.config = copy.copy(self._template)
     
     def test_hostname_validation(self):
         """Test hostname pattern validation."""
@@ -2,22 +2,39 @@
 Integration tests for no proxy functionality with proxy controller.
 """
 
+import copy
+import functools
 import unittest
-import sys
+import statistics
 import os
-from pathlib import Path
+import time
 from unittest.mock import Mock, patch
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 from px_ui.models.no_proxy_configuration import NoProxyConfiguration
 from px_ui.proxy.proxy_controller import ProxyController
 from px_ui.proxy.configuration_bridge import PxConfigurationBridge
 from px_ui.communication.event_system import EventSystem
 
 
+# Upper bound for one should_bypass_proxy() call against 200 patterns
+BUDGET_NS_PER_CHECK = 50_000
+
+
+@functools.lru_cache(maxsize=None)
+def _canonical_config(*patterns, bypass_localhost=True, bypass_private_networks=True):
+    """Build (once) a validated configuration with the given settings."""
+    config = NoProxyConfiguration(bypass_localhost=bypass_localhost,
+                                  bypass_private_networks=bypass_private_networks)
+    for pattern in patterns:
+        config.add_pattern(pattern)
+    return config
+
+
+def _make_config(*patterns, **options):
+    """Get a private copy of a cached configuration, safe to mutate or hand out."""
+    return copy.copy(_canonical_config(*patterns, **options))
+
+
 class TestNoProxyIntegration(unittest.TestCase):
     """Integration tests for no proxy functionality."""
     
@@ -35,11 +52,7 @@ class TestNoProxyIntegration(unittest.TestCase):
     def test_no_proxy_configuration_bridge(self):
         """Test no proxy configuration through bridge."""
         # Create test configuration
-        config = NoProxyConfiguration()
-        config.bypass_localhost = True
-        config.bypass_private_networks = False
-        config.add_pattern("example.com")
-        config.add_pattern("*.test.com")
+        config = _make_config("example.com", "*.test.com", bypass_private_networks=False)
         
         # Set configuration through bridge
         self.config_bridge.set_no_proxy_configuration(config)
@@ -54,9 +67,7 @@ class TestNoProxyIntegration(unittest.TestCase):
     def test_no_proxy_environment_variables(self):
         """Test that no proxy configuration sets environment variables."""
         # Create test configuration
-        config = NoProxyConfiguration()
-        config.bypass_localhost = True
-        config.add_pattern("example.com")
+        config = _make_config("example.com")
         
         # Apply configuration
         self.config_bridge.set_no_proxy_configuration(config)
@@ -66,9 +77,10 @@ class TestNoProxyIntegration(unittest.TestCase):
         self.assertIn('NO_PROXY', os.environ)
         self.assertIn('no_proxy', os.environ)
         
-        no_proxy_value = os.environ.get('NO_PROXY', '')
+        no_proxy_value = os.environ['NO_PROXY']
         self.assertIn('localhost', no_proxy_value)
         self.assertIn('example.com', no_proxy_value)
+        self.assertEqual(self.config_bridge._last_applied_no_proxy, no_proxy_value)
     
     def test_no_proxy_validation_integration(self):
         """Test no proxy validation in configuration validation."""
@@ -91,14 +103,12 @@ class TestNoProxyIntegration(unittest.TestCase):
         
         # Should fail due to invalid no proxy configuration
         self.assertFalse(validation_result['is_valid'])
-        self.assertTrue(any('No proxy:' in error for error in validation_result['errors']))
+        self.assertTrue(validation_result['errors_by_category'].get('no_proxy'))
     
     def test_proxy_controller_no_proxy_methods(self):
         """Test proxy controller no proxy methods."""
         # Create test configuration
-        config = NoProxyConfiguration()
-        config.add_pattern("example.com")
-        config.add_pattern("*.test.com")
+        config = _make_config("example.com", "*.test.com")
         
         # Set configuration through controller
         self.proxy_controller.set_no_proxy_configuration(config)
@@ -111,11 +121,7 @@ class TestNoProxyIntegration(unittest.TestCase):
     def test_no_proxy_px_format_integration(self):
         """Test px format integration."""
         # Create configuration
-        config = NoProxyConfiguration()
-        config.bypass_localhost = True
-        config.bypass_private_networks = True
-        config.add_pattern("example.com")
-        config.add_pattern("*.internal")
+        config = _make_config("example.com", "*.internal")
         
         # Convert to px format
         px_format = config.to_px_format()
@@ -140,12 +146,7 @@ class TestNoProxyIntegration(unittest.TestCase):
     def test_no_proxy_pattern_matching_integration(self):
         """Test pattern matching with various URL formats."""
         # Test 1: With built-in bypass options enabled
-        config = NoProxyConfiguration()
-        config.bypass_localhost = True
-        config.bypass_private_networks = True
-        config.add_pattern("example.com")
-        config.add_pattern("*.test.com")
-        config.add_pattern(".internal")
+        config = _make_config("example.com", "*.test.com", ".internal")
         
         # Test cases with built-in bypass enabled
         builtin_test_cases = [
@@ -177,14 +178,9 @@ class TestNoProxyIntegration(unittest.TestCase):
                            f"Built-in test - URL: {url}, Expected: {expected_bypass}, Got: {actual_bypass}")
         
         # Test 2: With built-in bypass options disabled (test only custom patterns)
-        config2 = NoProxyConfiguration()
-        config2.bypass_localhost = False
-        config2.bypass_private_networks = False
-        config2.add_pattern("example.com")
-        config2.add_pattern("*.test.com")
-        config2.add_pattern("192.168.100.0/24")
-        config2.add_pattern("10.0.1.1-10.0.1.100")
-        config2.add_pattern(".internal")
+        config2 = _make_config("example.com", "*.test.com", "192.168.100.0/24",
+                               "10.0.1.1-10.0.1.100", ".internal",
+                               bypass_localhost=False, bypass_private_networks=False)
         
         custom_test_cases = [
             # Should bypass (custom patterns only)
@@ -227,34 +223,40 @@ class TestNoProxyIntegration(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertGreater(len(config.validation_errors), 0)
     
+    @unittest.skipIf(os.environ.get("CI_SLOW"), "timing budget not meaningful on slow runners")
     def test_no_proxy_performance(self):
         """Test performance with large number of patterns."""
         # Create configuration with many patterns
         config = NoProxyConfiguration()
         
-        # Add many patterns
-        for i in range(100):
-            config.add_pattern(f"server{i}.example.com")
-            config.add_pattern(f"192.168.{i}.0/24")
+        # Add many patterns, validating once
+        added = config.extend_patterns(
+            pattern
+            for i in range(100)
+            for pattern in (f"server{i}.example.com", f"192.168.{i}.0/24")
+        )
+        self.assertEqual(added, 200)
+        self.assertTrue(config.is_valid)
         
         # Test pattern matching performance
-        import time
-        
         test_urls = [
             "server50.example.com",
             "192.168.50.1",
             "nonexistent.com"
         ]
         
-        start_time = time.time()
-        for _ in range(100):
-            for url in test_urls:
-                config.should_bypass_proxy(url)
-        end_time = time.time()
+        # Median of several timed rounds, so one slow round does not decide
+        timings = []
+        for _ in range(5):
+            start_ns = time.perf_counter_ns()
+            for _ in range(100):
+                for url in test_urls:
+                    config.should_bypass_proxy(url)
+            timings.append(time.perf_counter_ns() - start_ns)
         
-        # Should complete reasonably quickly (less than 1 second for 300 checks)
-        elapsed_time = end_time - start_time
-        self.assertLess(elapsed_time, 1.0, f"Pattern matching too slow: {elapsed_time:.3f}s")
+        ns_per_check = statistics.median(timings) / (100 * len(test_urls))
+        self.assertLess(ns_per_check, BUDGET_NS_PER_CHECK,
+                        f"Pattern matching too slow: {ns_per_check:.0f}ns per check")
     
     def test_no_proxy_configuration_persistence(self):
         """Test configuration persistence through dict conversion."""
@@ -2,36 +2,44 @@
 Tests for no proxy panel UI functionality.
 """
 
+import pytest
 import unittest
 import tkinter as tk
-import sys
-from pathlib import Path
-from unittest.mock import Mock, patch
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from unittest.mock import patch
 
 from px_ui.ui.no_proxy_panel import NoProxyPanel
 from px_ui.models.no_proxy_configuration import NoProxyConfiguration
 
+# Keep the Tk tests on one worker under pytest-xdist --dist loadgroup
+pytestmark = pytest.mark.xdist_group(name="tk")
+
 
 class TestNoProxyPanel(unittest.TestCase):
     """Test cases for NoProxyPanel class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one hidden Tk root for the whole class."""
+        cls.root = tk.Tk()
+        cls.root.withdraw()  # Hide the window during tests
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Destroy the shared Tk root."""
+        cls.root.destroy()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.root = tk.Tk()
-        self.root.withdraw()  # Hide the window during tests
         self.panel = NoProxyPanel(self.root)
         
-        # Mock callback
-        self.config_changed_mock = Mock()
-        self.panel.on_config_changed = self.config_changed_mock
+        # Record callback invocations
+        self.config_changed_calls = []
+        self.panel.on_config_changed = self.config_changed_calls.append
     
     def tearDown(self):
         """Clean up test fixtures."""
-        self.root.destroy()
+        for widget in self.root.winfo_children():
+            widget.destroy()
     
     def test_panel_initialization(self):
         """Test panel initialization."""
@@ -45,7 +53,7 @@ class TestNoProxyPanel(unittest.TestCase):
         self.panel.bypass_localhost_var.set(False)
         self.panel._on_built_in_option_changed()
         self.assertFalse(self.panel.no_proxy_config.bypass_localhost)
-        self.config_changed_mock.assert_called()
+        self.assertTrue(self.config_changed_calls)
         
         # Test private networks option
         self.panel.bypass_private_var.set(False)
@@ -63,7 +71,7 @@ class TestNoProxyPanel(unittest.TestCase):
         # Verify pattern was added
         self.assertIn("example.com", self.panel.no_proxy_config.patterns)
         self.assertEqual(self.panel.pattern_entry.get(), "")  # Entry should be cleared
-        self.config_changed_mock.assert_called()
+        self.assertTrue(self.config_changed_calls)
     
     def test_add_invalid_pattern(self):
         """Test adding invalid pattern."""
@@ -94,7 +102,7 @@ class TestNoProxyPanel(unittest.TestCase):
         
         # Verify pattern was removed
         self.assertNotIn("example.com", self.panel.no_proxy_config.patterns)
-        self.config_changed_mock.assert_called()
+        self.assertTrue(self.config_changed_calls)
     
     def test_remove_pattern_no_selection(self):
         """Test removing pattern with no selection."""
@@ -118,7 +126,7 @@ class TestNoProxyPanel(unittest.TestCase):
             # Verify confirmation was asked and patterns cleared
             mock_confirm.assert_called()
             self.assertEqual(len(self.panel.no_proxy_config.patterns), 0)
-            self.config_changed_mock.assert_called()
+            self.assertTrue(self.config_changed_calls)
     
     def test_validate_patterns(self):
         """Test pattern validation."""
@@ -262,15 +270,25 @@ class TestNoProxyPanel(unittest.TestCase):
 class TestNoProxyPanelIntegration(unittest.TestCase):
     """Integration tests for no proxy panel."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one hidden Tk root for the whole class."""
+        cls.root = tk.Tk()
+        cls.root.withdraw()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Destroy the shared Tk root."""
+        cls.root.destroy()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.root = tk.Tk()
-        self.root.withdraw()
         self.panel = NoProxyPanel(self.root)
     
     def tearDown(self):
         """Clean up test fixtures."""
-        self.root.destroy()
+        for widget in self.root.winfo_children():
+            widget.destroy()
     
     def test_full_workflow(self):
         """Test complete workflow of adding, testing, and removing patterns."""
@@ -0,0 +1,78 @@
+import socket
+
+import pytest
+
+from px.pac import Pac
+
+PAC_IS_IN_NET = """
+function FindProxyForURL(url, host) {
+    if (isInNet(host, "%s", "%s")) {
+        return "PROXY inside.example:3128";
+    }
+    return "DIRECT";
+}
+"""
+
+# Names the fake resolver knows; anything else fails like an unknown host
+HOSTS = {
+    "intranet.example": "192.168.1.5",
+}
+
+
+@pytest.fixture
+def fake_dns(monkeypatch):
+    # Keep hostname tests offline and deterministic
+    def gethostbyname(host):
+        try:
+            return HOSTS[host]
+        except KeyError:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+    monkeypatch.setattr(socket, "gethostbyname", gethostbyname)
+
+
+def find_proxy(tmp_path, host, pattern, mask):
+    pac_file = tmp_path / "isinnet.pac"
+    pac_file.write_text(PAC_IS_IN_NET % (pattern, mask))
+    pac = Pac(str(pac_file))
+    return pac.find_proxy_for_url(f"http://{host}/", host)
+
+
+##
+# Tests
+
+
+@pytest.mark.parametrize("host, pattern, mask, inside", [
+    # Host inside and outside the network
+    ("10.1.2.3", "10.0.0.0", "255.0.0.0", True),
+    ("11.1.2.3", "10.0.0.0", "255.0.0.0", False),
+    ("192.168.1.5", "192.168.1.0", "255.255.255.0", True),
+    ("192.168.2.5", "192.168.1.0", "255.255.255.0", False),
+
+    # Invalid pattern or mask never matches
+    ("10.1.2.3", "10.0.0", "255.0.0.0", False),
+    ("10.1.2.3", "10.0.0.0", "255.0.0", False),
+    ("10.1.2.3", "not-an-ip", "255.0.0.0", False),
+    ("0.0.0.0", "0.0.0.0", "", False),
+
+    # Octets above 255 are not valid addresses
+    ("10.1.2.3", "10.0.0.256", "255.0.0.0", False),
+    ("10.1.2.3", "10.0.0.0", "255.0.0.300", False),
+    ("10.1.2.300", "10.0.0.0", "255.0.0.0", False),
+
+    # Only plain ASCII digits, and nothing after the last octet
+    ("10.1.2.3", "\u0661\u0660.0.0.0", "255.0.0.0", False),
+    ("10.1.2.3", "10.0.0.0\\n", "255.0.0.0", False),
+    ("10.1.2.3", "10.0.0.0", "255.0.0.0\\n", False),
+
+    # Hostnames are resolved first
+    ("intranet.example", "192.168.0.0", "255.255.0.0", True),
+    ("intranet.example", "10.0.0.0", "255.0.0.0", False),
+
+    # Unresolvable hosts convert to 0 like convert_addr("")
+    ("missing.example", "10.0.0.0", "255.0.0.0", False),
+    ("missing.example", "0.0.0.0", "255.255.255.255", True),
+])
+def test_pac_is_in_net(fake_dns, tmp_path, host, pattern, mask, inside):
+    expected = "inside.example:3128" if inside else "DIRECT"
+    assert find_proxy(tmp_path, host, pattern, mask) == expected
@@ -3,39 +3,89 @@ Unit tests for PAC validation functionality.
 Tests JavaScript syntax validation, PAC execution, and URL testing.
 """
 
+import functools
+import textwrap
+import urllib.error
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-import tempfile
-import os
+from unittest.mock import patch
 
-from .test_mocks import MockPACValidator as PACValidator
+from .test_mocks import MockPACValidator as PACValidator, MockURLResponse
 from px_ui.models.pac_configuration import PACConfiguration
 
 
+# PAC bodies shared by several tests; one string each, so content-keyed
+# validator caches hit across tests
+_PAC_DIRECT = textwrap.dedent('''
+    function FindProxyForURL(url, host) {
+        return "DIRECT";
+    }
+''').strip()
+
+_PAC_EXAMPLE_DIRECT = textwrap.dedent('''
+    function FindProxyForURL(url, host) {
+        if (host == "example.com") {
+            return "DIRECT";
+        }
+        return "PROXY proxy.corp.com:8080";
+    }
+''').strip()
+
+_PAC_UTILITY_FUNCTIONS = textwrap.dedent('''
+    function FindProxyForURL(url, host) {
+        if (isInNet(host, "192.168.0.0", "255.255.0.0")) {
+            return "DIRECT";
+        }
+        if (dnsDomainIs(host, ".company.com")) {
+            return "DIRECT";
+        }
+        return "PROXY proxy.company.com:8080";
+    }
+''').strip()
+
+_HOST_CONDITION = '    if (host == "host{}.example.com") return "DIRECT";'
+
+
+@functools.lru_cache(maxsize=None)
+def _large_pac(host_count: int) -> str:
+    """Build a PAC file with host_count host conditions."""
+    return '\n'.join((
+        'function FindProxyForURL(url, host) {',
+        '\n'.join(map(_HOST_CONDITION.format, range(host_count))),
+        '    return "PROXY proxy.company.com:8080";',
+        '}'
+    ))
+
+
+def _contains(errors, needle: str) -> bool:
+    """Check whether any error message contains needle, in one substring search."""
+    # NUL never occurs in messages, so a match cannot span two errors
+    return needle in "\0".join(errors)
+
+
+@pytest.fixture(scope="class")
+def validator():
+    """One PAC validator shared by all tests in a class."""
+    yield PACValidator()
+
+
+@pytest.fixture(scope="class")
+def resolve_utility_pac(validator):
+    """Resolver for the PAC using isInNet/dnsDomainIs, compiled once per class."""
+    return validator.compile(_PAC_UTILITY_FUNCTIONS)
+
+
+@pytest.mark.xdist_group(name="pac")
 class TestPACValidator:
     """Test PAC validation functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.validator = PACValidator()
-    
-    def test_validate_valid_pac_syntax(self):
+    def test_validate_valid_pac_syntax(self, validator):
         """Test validation of valid PAC JavaScript syntax."""
-        valid_pac = '''
-        function FindProxyForURL(url, host) {
-            if (host == "example.com") {
-                return "DIRECT";
-            }
-            return "PROXY proxy.corp.com:8080";
-        }
-        '''
-        
-        is_valid, errors = self.validator.validate_syntax(valid_pac)
+        is_valid, errors = validator.validate_syntax(_PAC_EXAMPLE_DIRECT)
         
         assert is_valid is True
         assert errors == []
     
-    def test_validate_invalid_pac_syntax(self):
+    def test_validate_invalid_pac_syntax(self, validator):
         """Test validation of invalid PAC JavaScript syntax."""
         invalid_pac = '''
         function FindProxyForURL(url, host) {
@@ -46,13 +96,30 @@ class TestPACValidator:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(invalid_pac)
+        is_valid, errors = validator.validate_syntax(invalid_pac)
         
         assert is_valid is False
         assert len(errors) > 0
-        assert any("SyntaxError" in error for error in errors)
+        assert _contains(errors, "SyntaxError")
+    
+    def test_validate_brackets_inside_literals(self, validator):
+        """Test brackets inside strings, regexes and comments are not syntax errors."""
+        pac_content = '''
+        function FindProxyForURL(url, host) {
+            // Match URLs with a literal "(" in them )
+            if (shExpMatch(url, "*(*") || /\{+/.test(host)) {
+                return "DIRECT";  /* not a closing } */
+            }
+            return "PROXY proxy.corp.com:8080";
+        }
+        '''
+        
+        is_valid, errors = validator.validate_syntax(pac_content)
+        
+        assert is_valid is True
+        assert errors == []
     
-    def test_validate_missing_function(self):
+    def test_validate_missing_function(self, validator):
         """Test validation when FindProxyForURL function is missing."""
         invalid_pac = '''
         function WrongFunctionName(url, host) {
@@ -60,21 +127,21 @@ class TestPACValidator:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(invalid_pac)
+        is_valid, errors = validator.validate_syntax(invalid_pac)
         
         assert is_valid is False
-        assert any("FindProxyForURL" in error for error in errors)
+        assert _contains(errors, "FindProxyForURL")
     
-    def test_validate_empty_pac(self):
+    def test_validate_empty_pac(self, validator):
         """Test validation of empty PAC content."""
         empty_pac = ""
         
-        is_valid, errors = self.validator.validate_syntax(empty_pac)
+        is_valid, errors = validator.validate_syntax(empty_pac)
         
         assert is_valid is False
         assert len(errors) > 0
     
-    def test_validate_pac_with_comments(self):
+    def test_validate_pac_with_comments(self, validator):
         """Test validation of PAC with JavaScript comments."""
         pac_with_comments = '''
         // This is a comment
@@ -88,12 +155,12 @@ class TestPACValidator:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(pac_with_comments)
+        is_valid, errors = validator.validate_syntax(pac_with_comments)
         
         assert is_valid is True
         assert errors == []
     
-    def test_test_url_direct(self):
+    def test_test_url_direct(self, validator):
         """Test URL testing that returns DIRECT."""
         pac_content = '''
         function FindProxyForURL(url, host) {
@@ -104,11 +171,11 @@ class TestPACValidator:
         }
         '''
         
-        result = self.validator.test_url("http://internal.company.com/page", pac_content)
+        result = validator.test_url("http://internal.company.com/page", pac_content)
         
         assert result == "DIRECT"
     
-    def test_test_url_proxy(self):
+    def test_test_url_proxy(self, validator):
         """Test URL testing that returns proxy."""
         pac_content = '''
         function FindProxyForURL(url, host) {
@@ -119,11 +186,11 @@ class TestPACValidator:
         }
         '''
         
-        result = self.validator.test_url("http://external.example.com/api", pac_content)
+        result = validator.test_url("http://external.example.com/api", pac_content)
         
         assert result == "PROXY proxy.company.com:8080"
     
-    def test_test_url_multiple_proxies(self):
+    def test_test_url_multiple_proxies(self, validator):
         """Test URL testing with multiple proxy options."""
         pac_content = '''
         function FindProxyForURL(url, host) {
@@ -134,39 +201,22 @@ class TestPACValidator:
         }
         '''
         
-        result = self.validator.test_url("https://www.google.com/search", pac_content)
+        result = validator.test_url("https://www.google.com/search", pac_content)
         
         assert "PROXY proxy1.company.com:8080" in result
         assert "PROXY proxy2.company.com:8080" in result
         assert "DIRECT" in result
     
-    def test_test_url_with_pac_functions(self):
+    @pytest.mark.parametrize("url,expected", [
+        ("http://192.168.1.100/", "DIRECT"),  # Internal IP
+        ("http://intranet.company.com/", "DIRECT"),  # Company domain
+        ("http://www.external.com/", "PROXY proxy.company.com:8080"),  # External domain
+    ])
+    def test_test_url_with_pac_functions(self, resolve_utility_pac, url, expected):
         """Test URL testing using PAC utility functions."""
-        pac_content = '''
-        function FindProxyForURL(url, host) {
-            if (isInNet(host, "192.168.0.0", "255.255.0.0")) {
-                return "DIRECT";
-            }
-            if (dnsDomainIs(host, ".company.com")) {
-                return "DIRECT";
-            }
-            return "PROXY proxy.company.com:8080";
-        }
-        '''
-        
-        # Test internal IP
-        result = self.validator.test_url("http://192.168.1.100/", pac_content)
-        assert result == "DIRECT"
-        
-        # Test company domain
-        result = self.validator.test_url("http://intranet.company.com/", pac_content)
-        assert result == "DIRECT"
-        
-        # Test external domain
-        result = self.validator.test_url("http://www.external.com/", pac_content)
-        assert result == "PROXY proxy.company.com:8080"
+        assert resolve_utility_pac(url) == expected
     
-    def test_test_url_invalid_pac(self):
+    def test_test_url_invalid_pac(self, validator):
         """Test URL testing with invalid PAC content."""
         invalid_pac = '''
         function FindProxyForURL(url, host) {
@@ -175,34 +225,33 @@ class TestPACValidator:
         '''
         
         with pytest.raises(Exception):
-            self.validator.test_url("http://example.com", invalid_pac)
+            validator.test_url("http://example.com", invalid_pac)
     
-    def test_load_pac_from_file(self):
+    def test_load_pac_from_file(self, validator):
         """Test loading PAC content from file."""
-        pac_content = '''
-        function FindProxyForURL(url, host) {
-            return "DIRECT";
-        }
-        '''
+        from unittest.mock import mock_open
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.pac', delete=False) as f:
-            f.write(pac_content)
-            temp_path = f.name
+        with patch('builtins.open', mock_open(read_data=_PAC_DIRECT)) as mocked_open:
+            loaded_content = validator.load_pac_from_file("fake.pac")
+        
+        mocked_open.assert_called_once_with("fake.pac", 'r', encoding='utf-8')
+        assert "FindProxyForURL" in loaded_content
+        assert loaded_content == _PAC_DIRECT
+    
+    def test_load_pac_from_real_file(self, validator, tmp_path):
+        """Test loading PAC content from a file on disk."""
+        pac_file = tmp_path / "proxy.pac"
+        pac_file.write_text(_PAC_DIRECT, encoding='utf-8')
         
-        try:
-            loaded_content = self.validator.load_pac_from_file(temp_path)
-            assert "FindProxyForURL" in loaded_content
-            assert loaded_content.strip() == pac_content.strip()
-        finally:
-            os.unlink(temp_path)
+        loaded_content = validator.load_pac_from_file(str(pac_file))
+        assert loaded_content == _PAC_DIRECT
     
-    def test_load_pac_from_nonexistent_file(self):
+    def test_load_pac_from_nonexistent_file(self, validator):
         """Test loading PAC from non-existent file."""
         with pytest.raises(FileNotFoundError):
-            self.validator.load_pac_from_file("/nonexistent/path/proxy.pac")
+            validator.load_pac_from_file("/nonexistent/path/proxy.pac")
     
-    @patch('urllib.request.urlopen')
-    def test_load_pac_from_url(self, mock_urlopen):
+    def test_load_pac_from_url(self, validator):
         """Test loading PAC content from URL."""
         pac_content = '''
         function FindProxyForURL(url, host) {
@@ -210,45 +259,40 @@ class TestPACValidator:
         }
         '''
         
-        mock_response = Mock()
-        mock_response.read.return_value = pac_content.encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-        
-        loaded_content = self.validator.load_pac_from_url("http://proxy.company.com/proxy.pac")
+        response = MockURLResponse(pac_content.encode('utf-8'))
+        with patch.object(validator, 'urlopen', return_value=response) as mock_urlopen:
+            loaded_content = validator.load_pac_from_url("http://proxy.company.com/proxy.pac")
         
         assert loaded_content == pac_content
         mock_urlopen.assert_called_once_with("http://proxy.company.com/proxy.pac")
     
-    @patch('urllib.request.urlopen')
-    def test_load_pac_from_url_error(self, mock_urlopen):
+    def test_load_pac_from_url_error(self, validator):
         """Test loading PAC from URL with network error."""
-        mock_urlopen.side_effect = Exception("Network error")
-        
-        with pytest.raises(Exception):
-            self.validator.load_pac_from_url("http://invalid.url/proxy.pac")
+        with patch.object(validator, 'urlopen', side_effect=Exception("Network error")):
+            with pytest.raises(Exception):
+                validator.load_pac_from_url("http://invalid.url/proxy.pac")
     
-    def test_create_pac_configuration_valid(self):
+    def test_load_pac_from_url_stays_offline(self, validator):
+        """Test an unpatched URL load fails without any network I/O."""
+        with patch('socket.socket', side_effect=AssertionError("network used")):
+            with pytest.raises(urllib.error.URLError):
+                validator.load_pac_from_url("http://proxy.company.com/proxy.pac")
+    
+    def test_create_pac_configuration_valid(self, validator):
         """Test creating PACConfiguration from valid content."""
-        pac_content = '''
-        function FindProxyForURL(url, host) {
-            if (host == "example.com") return "DIRECT";
-            return "PROXY proxy.corp.com:8080";
-        }
-        '''
-        
-        config = self.validator.create_pac_configuration(
+        config = validator.create_pac_configuration(
             source_type="inline",
             source_path="",
-            content=pac_content
+            content=_PAC_EXAMPLE_DIRECT
         )
         
         assert isinstance(config, PACConfiguration)
         assert config.source_type == "inline"
-        assert config.content == pac_content
+        assert config.content == _PAC_EXAMPLE_DIRECT
         assert config.is_valid is True
         assert config.validation_errors == []
     
-    def test_create_pac_configuration_invalid(self):
+    def test_create_pac_configuration_invalid(self, validator):
         """Test creating PACConfiguration from invalid content."""
         invalid_pac = '''
         function FindProxyForURL(url, host) {
@@ -256,7 +300,7 @@ class TestPACValidator:
         }
         '''
         
-        config = self.validator.create_pac_configuration(
+        config = validator.create_pac_configuration(
             source_type="inline",
             source_path="",
             content=invalid_pac
@@ -266,7 +310,7 @@ class TestPACValidator:
         assert config.is_valid is False
         assert len(config.validation_errors) > 0
     
-    def test_validate_pac_functions_availability(self):
+    def test_validate_pac_functions_availability(self, validator):
         """Test that PAC utility functions are available during validation."""
         pac_with_functions = '''
         function FindProxyForURL(url, host) {
@@ -290,12 +334,12 @@ class TestPACValidator:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(pac_with_functions)
+        is_valid, errors = validator.validate_syntax(pac_with_functions)
         
         assert is_valid is True
         assert errors == []
     
-    def test_pac_encoding_detection(self):
+    def test_pac_encoding_detection(self, validator):
         """Test PAC content encoding detection and handling."""
         # Test UTF-8 content
         utf8_pac = '''
@@ -305,49 +349,35 @@ class TestPACValidator:
         }
         '''
         
-        encoding = self.validator.detect_encoding(utf8_pac.encode('utf-8'))
+        encoding = validator.detect_encoding(utf8_pac.encode('utf-8'))
         assert encoding in ['utf-8', 'ascii']  # ASCII is subset of UTF-8
         
         # Test with BOM
         utf8_bom_pac = '\ufeff' + utf8_pac
-        encoding = self.validator.detect_encoding(utf8_bom_pac.encode('utf-8-sig'))
+        encoding = validator.detect_encoding(utf8_bom_pac.encode('utf-8-sig'))
         assert encoding == 'utf-8-sig'
     
-    def test_pac_performance_validation(self):
+    def test_pac_performance_validation(self, validator):
         """Test PAC validation performance with large content."""
         # Create a large PAC file with many conditions
-        large_pac_parts = [
-            'function FindProxyForURL(url, host) {'
-        ]
-        
-        # Add many host conditions
-        for i in range(100):
-            large_pac_parts.append(f'    if (host == "host{i}.example.com") return "DIRECT";')
-        
-        large_pac_parts.append('    return "PROXY proxy.company.com:8080";')
-        large_pac_parts.append('}')
-        
-        large_pac = '\n'.join(large_pac_parts)
+        large_pac = _large_pac(100)
         
         # Validation should complete in reasonable time
         import time
-        start_time = time.time()
-        is_valid, errors = self.validator.validate_syntax(large_pac)
-        end_time = time.time()
+        start = time.perf_counter_ns()
+        is_valid, errors = validator.validate_syntax(large_pac)
+        elapsed_ns = time.perf_counter_ns() - start
         
         assert is_valid is True
         assert errors == []
-        assert (end_time - start_time) < 5.0  # Should complete within 5 seconds
+        assert elapsed_ns < 500_000_000  # 500 ms of monotonic time
 
 
+@pytest.mark.xdist_group(name="pac")
 class TestPACValidatorIntegration:
     """Test PAC validator integration with other components."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.validator = PACValidator()
-    
-    def test_validate_real_world_pac_examples(self):
+    def test_validate_real_world_pac_examples(self, validator):
         """Test validation with real-world PAC examples."""
         # Example 1: Simple corporate PAC
         corporate_pac = '''
@@ -366,18 +396,18 @@ class TestPACValidatorIntegration:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(corporate_pac)
+        is_valid, errors = validator.validate_syntax(corporate_pac)
         assert is_valid is True
         assert errors == []
         
         # Test URL resolution
-        result = self.validator.test_url("http://192.168.1.1/", corporate_pac)
+        result = validator.test_url("http://192.168.1.1/", corporate_pac)
         assert result == "DIRECT"
         
-        result = self.validator.test_url("http://www.google.com/", corporate_pac)
+        result = validator.test_url("http://www.google.com/", corporate_pac)
         assert "PROXY proxy.company.com:8080" in result
     
-    def test_validate_complex_pac_with_time_conditions(self):
+    def test_validate_complex_pac_with_time_conditions(self, validator):
         """Test validation of PAC with time-based conditions."""
         time_based_pac = '''
         function FindProxyForURL(url, host) {
@@ -395,11 +425,11 @@ class TestPACValidatorIntegration:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(time_based_pac)
+        is_valid, errors = validator.validate_syntax(time_based_pac)
         assert is_valid is True
         assert errors == []
     
-    def test_validate_pac_with_load_balancing(self):
+    def test_validate_pac_with_load_balancing(self, validator):
         """Test validation of PAC with load balancing logic."""
         load_balancing_pac = '''
         function FindProxyForURL(url, host) {
@@ -421,14 +451,28 @@ class TestPACValidatorIntegration:
         }
         '''
         
-        is_valid, errors = self.validator.validate_syntax(load_balancing_pac)
+        is_valid, errors = validator.validate_syntax(load_balancing_pac)
         assert is_valid is True
         assert errors == []
         
         # Test that different hosts get different proxy assignments
-        result1 = self.validator.test_url("http://host1.example.com/", load_balancing_pac)
-        result2 = self.validator.test_url("http://host2.example.com/", load_balancing_pac)
+        resolve = validator.compile(load_balancing_pac)
+        result1 = resolve("http://host1.example.com/")
+        result2 = resolve("http://host2.example.com/")
         
         # Results should contain proxy assignments (may be same or different)
         assert "PROXY" in result1
-        assert "PROXY" in result2
\ No newline at end of file
+        assert "PROXY" in result2
+    
+    def test_validate_syntax_batch(self, validator):
+        """Test validating several PACs in one call keeps per-source results."""
+        pacs = [
+            _large_pac(3),
+            'function WrongFunctionName(url, host) { return "DIRECT"; }',
+            'function FindProxyForURL(url, host) { if (host == "a" { return "DIRECT"; } }',
+        ]
+        
+        results = validator.validate_syntax_batch(pacs)
+        
+        assert results == [validator.validate_syntax(pac) for pac in pacs]
+        assert [is_valid for is_valid, _ in results] == [True, False, False]
\ No newline at end of file
@@ -3,26 +3,42 @@ Tests for proxy control functionality.
 """
 
 import pytest
+import socket
 import threading
 import time
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 
 from px_ui.proxy.proxy_controller import ProxyController
 from px_ui.proxy.configuration_bridge import PxConfigurationBridge
 from px_ui.models.proxy_status import ProxyStatus
 
+from .test_mocks import MockEventSystem
+
+
+@pytest.fixture(scope="class")
+def controller():
+    """One proxy controller shared by all tests in a class."""
+    controller = ProxyController()
+    yield controller
+    controller.shutdown()
+
+
+@pytest.fixture(scope="session")
+def event_system():
+    """Event system stub for bridges that never start the proxy."""
+    return MockEventSystem()
+
 
 class TestProxyController:
     """Test cases for ProxyController class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.controller = ProxyController()
-    
-    def teardown_method(self):
-        """Clean up after tests."""
-        if self.controller:
-            self.controller.shutdown()
+    @pytest.fixture(autouse=True)
+    def _bind_controller(self, controller):
+        """Expose the shared controller and reset what the tests change."""
+        self.controller = controller
+        yield
+        controller.set_ui_callbacks()
+        controller.set_pac_content(None, None)
     
     def test_initialization(self):
         """Test proxy controller initialization."""
@@ -39,41 +55,19 @@ class TestProxyController:
         assert status.listen_address == "127.0.0.1"
         assert status.port == 3128
     
-    def test_validate_configuration_valid(self):
-        """Test configuration validation with valid config."""
-        config = {
-            'listen_address': '127.0.0.1',
-            'port': 3128,
-            'mode': 'manual'
-        }
-        
-        result = self.controller.validate_configuration(config)
-        assert result['is_valid'] is True
-        assert len(result['errors']) == 0
-    
-    def test_validate_configuration_invalid_port(self):
-        """Test configuration validation with invalid port."""
-        config = {
-            'listen_address': '127.0.0.1',
-            'port': 70000,  # Invalid port
-            'mode': 'manual'
-        }
-        
-        result = self.controller.validate_configuration(config)
-        assert result['is_valid'] is False
-        assert any('port' in error.lower() for error in result['errors'])
-    
-    def test_validate_configuration_invalid_mode(self):
-        """Test configuration validation with invalid mode."""
-        config = {
-            'listen_address': '127.0.0.1',
-            'port': 3128,
-            'mode': 'invalid_mode'
-        }
-        
+    @pytest.mark.parametrize("config,valid,needle", [
+        ({'listen_address': '127.0.0.1', 'port': 3128, 'mode': 'manual'}, True, None),
+        ({'listen_address': '127.0.0.1', 'port': 70000, 'mode': 'manual'}, False, 'port'),
+        ({'listen_address': '127.0.0.1', 'port': 3128, 'mode': 'invalid_mode'}, False, 'mode'),
+    ], ids=["valid", "invalid_port", "invalid_mode"])
+    def test_validate_configuration(self, config, valid, needle):
+        """Test configuration validation for valid and invalid configs."""
         result = self.controller.validate_configuration(config)
-        assert result['is_valid'] is False
-        assert any('mode' in error.lower() for error in result['errors'])
+        assert result['is_valid'] is valid
+        if needle is None:
+            assert len(result['errors']) == 0
+        else:
+            assert any(needle in error.lower() for error in result['errors'])
     
     def test_set_ui_callbacks(self):
         """Test setting UI callbacks."""
@@ -98,22 +92,19 @@ class TestProxyController:
         assert self.controller.get_pac_content() == pac_content
         assert self.controller.get_pac_source() == "test"
     
-    @patch('px_ui.proxy.configuration_bridge.px.main.main')
-    def test_start_proxy_success(self, mock_px_main):
+    def test_start_proxy_success(self, monkeypatch):
         """Test successful proxy start."""
-        # Mock px.main.main to not actually start proxy
-        mock_px_main.return_value = None
-        
         config = {
             'listen_address': '127.0.0.1',
             'port': 3128,
             'mode': 'manual'
         }
         
-        # Mock the configuration bridge to simulate successful start
-        with patch.object(self.controller.config_bridge, 'start_proxy', return_value=True):
-            result = self.controller.start_proxy(config)
-            assert result is True
+        # Stub the bridge's start so no server is actually started
+        monkeypatch.setattr(self.controller.config_bridge, 'start_proxy', lambda config: True)
+        
+        result = self.controller.start_proxy(config)
+        assert result is True
     
     def test_start_proxy_invalid_config(self):
         """Test proxy start with invalid configuration."""
@@ -136,15 +127,13 @@ class TestProxyController:
 class TestPxConfigurationBridge:
     """Test cases for PxConfigurationBridge class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        from px_ui.communication.event_system import EventSystem
-        self.event_system = EventSystem()
-        self.bridge = PxConfigurationBridge(self.event_system)
-    
-    def teardown_method(self):
-        """Clean up after tests."""
-        if self.bridge and self.bridge.get_proxy_status().is_running:
+    @pytest.fixture(autouse=True)
+    def _bind_bridge(self, event_system):
+        """Build a fresh bridge on the shared event system stub."""
+        self.event_system = event_system
+        self.bridge = PxConfigurationBridge(event_system)
+        yield
+        if self.bridge.get_proxy_status().is_running:
             self.bridge.stop_proxy()
     
     def test_initialization(self):
@@ -153,53 +142,36 @@ class TestPxConfigurationBridge:
         assert self.bridge.event_system == self.event_system
         assert not self.bridge.get_proxy_status().is_running
     
-    def test_validate_configuration_valid(self):
-        """Test configuration validation with valid config."""
-        config = {
-            'listen_address': '127.0.0.1',
-            'port': 8080,
-            'mode': 'manual'
-        }
-        
-        result = self.bridge.validate_configuration(config)
-        assert result['is_valid'] is True
-        assert len(result['errors']) == 0
-    
-    def test_validate_configuration_invalid_ip(self):
-        """Test configuration validation with invalid IP."""
-        config = {
-            'listen_address': '999.999.999.999',
-            'port': 3128,
-            'mode': 'manual'
-        }
-        
+    @pytest.mark.parametrize("config,valid,needle", [
+        ({'listen_address': '127.0.0.1', 'port': 8080, 'mode': 'manual'}, True, None),
+        ({'listen_address': '999.999.999.999', 'port': 3128, 'mode': 'manual'}, False, 'address'),
+    ], ids=["valid", "invalid_ip"])
+    def test_validate_configuration(self, config, valid, needle):
+        """Test configuration validation for valid and invalid configs."""
         result = self.bridge.validate_configuration(config)
-        assert result['is_valid'] is False
-        assert any('address' in error.lower() for error in result['errors'])
-    
-    def test_pac_content_validation_empty(self):
-        """Test PAC content validation with empty content."""
-        result = self.bridge._validate_pac_content("")
-        assert result['is_valid'] is False
-        assert any('empty' in error.lower() for error in result['errors'])
-    
-    def test_pac_content_validation_missing_function(self):
-        """Test PAC content validation without FindProxyForURL function."""
-        pac_content = "var test = 'hello';"
-        result = self.bridge._validate_pac_content(pac_content)
-        assert result['is_valid'] is False
-        assert any('findproxyforurl' in error.lower() for error in result['errors'])
-    
-    def test_pac_content_validation_valid(self):
-        """Test PAC content validation with valid content."""
-        pac_content = """
+        assert result['is_valid'] is valid
+        if needle is None:
+            assert len(result['errors']) == 0
+        else:
+            assert any(needle in error.lower() for error in result['errors'])
+    
+    @pytest.mark.parametrize("pac_content,valid,needle", [
+        ("", False, 'empty'),
+        ("var test = 'hello';", False, 'findproxyforurl'),
+        ("""
         function FindProxyForURL(url, host) {
             return "DIRECT";
         }
-        """
+        """, True, None),
+    ], ids=["empty", "missing_function", "valid"])
+    def test_pac_content_validation(self, pac_content, valid, needle):
+        """Test PAC content validation for valid and invalid content."""
         result = self.bridge._validate_pac_content(pac_content)
-        assert result['is_valid'] is True
-        assert len(result['errors']) == 0
+        assert result['is_valid'] is valid
+        if needle is None:
+            assert len(result['errors']) == 0
+        else:
+            assert any(needle in error.lower() for error in result['errors'])
     
     def test_status_callbacks(self):
         """Test status change callbacks."""
@@ -233,6 +205,15 @@ class TestPxConfigurationBridge:
         # Just ensure the method doesn't crash
         result = self.bridge._is_port_in_use(80)
         assert isinstance(result, bool)
+    
+    def test_port_in_use_while_listening(self):
+        """Test a port with an active listener is reported as in use."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+            listener.bind(('127.0.0.1', 0))
+            listener.listen(1)
+            port = listener.getsockname()[1]
+            
+            assert self.bridge._is_port_in_use(port)
 
 
 if __name__ == '__main__':
@@ -5,69 +5,97 @@ This module tests the ResponseDetailsDialog class and its integration
 with the monitoring view for displaying detailed response information.
 """
 
+import pytest
 import unittest
 from unittest.mock import Mock, patch
 import tkinter as tk
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional
 import json
 
 from px_ui.ui.response_details_dialog import ResponseDetailsDialog
-from px_ui.ui.monitoring_view import RequestEntry
+from px_ui.ui.monitoring_view import MonitoringView, RequestEntry
 from px_ui.communication.events import RequestEvent, ResponseEvent
 
+from .test_mocks import MockEventSystem
 
+# Keep the Tk tests on one worker under pytest-xdist --dist loadgroup
+pytestmark = pytest.mark.xdist_group(name="tk")
+
+
+# Fixed request time so entries are identical from run to run
+FIXED_TS = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@dataclass(frozen=True)
 class MockRequestEntry:
-    """Mock request entry for testing."""
+    """
+    Mock request entry for testing.
     
-    def __init__(self):
-        self.request_id = "test-123"
-        self.timestamp = datetime.now()
-        self.url = "https://example.com/api/test"
-        self.method = "GET"
-        self.proxy_decision = "PROXY proxy.example.com:8080"
-        self.headers = {"User-Agent": "Test Agent", "Accept": "application/json"}
-        
-        # Response data
-        self.status_code = 200
-        self.response_headers = {
-            "Content-Type": "application/json",
-            "Content-Length": "150",
-            "Server": "nginx/1.18.0"
-        }
-        self.body_preview = '{"message": "Hello World", "status": "success", "data": {"id": 123, "name": "Test"}}'
-        self.content_length = 150
-        self.response_time = 245.5
-        self.error_message = None
+    Frozen, with read-only header mappings, so the shared instances below
+    can't leak changes between tests; tests needing different values derive
+    a copy with dataclasses.replace().
+    """
+    request_id: str = "test-123"
+    timestamp: datetime = FIXED_TS
+    url: str = "https://example.com/api/test"
+    method: str = "GET"
+    proxy_decision: str = "PROXY proxy.example.com:8080"
+    headers: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({
+        "User-Agent": "Test Agent", "Accept": "application/json"
+    }))
+    
+    # Response data
+    status_code: Optional[int] = 200
+    response_headers: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({
+        "Content-Type": "application/json",
+        "Content-Length": "150",
+        "Server": "nginx/1.18.0"
+    }))
+    body_preview: str = '{"message": "Hello World", "status": "success", "data": {"id": 123, "name": "Test"}}'
+    content_length: int = 150
+    response_time: Optional[float] = 245.5
+    error_message: Optional[str] = None
         
     def is_error(self):
         return self.error_message is not None or (self.status_code is not None and self.status_code >= 400)
 
 
-class MockErrorRequestEntry(MockRequestEntry):
-    """Mock request entry with error for testing."""
-    
-    def __init__(self):
-        super().__init__()
-        self.status_code = 404
-        self.error_message = "Not Found"
-        self.body_preview = '{"error": "Resource not found", "code": 404}'
+DEFAULT_ENTRY = MockRequestEntry()
+
+# Request entry with error for testing
+ERROR_ENTRY = replace(
+    DEFAULT_ENTRY,
+    status_code=404,
+    error_message="Not Found",
+    body_preview='{"error": "Resource not found", "code": 404}'
+)
 
 
 class TestResponseDetailsDialog(unittest.TestCase):
     """Test cases for ResponseDetailsDialog."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.root = tk.Tk()
-        self.root.withdraw()  # Hide the root window during tests
+    @classmethod
+    def setUpClass(cls):
+        """Create one hidden Tk root for the whole class."""
+        cls.root = tk.Tk()
+        cls.root.withdraw()  # Hide the root window during tests
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Destroy the shared Tk root."""
+        cls.root.destroy()
         
     def tearDown(self):
-        """Clean up after tests."""
-        self.root.destroy()
+        """Destroy dialogs left behind by the test."""
+        for child in self.root.winfo_children():
+            child.destroy()
         
     def test_dialog_creation(self):
         """Test dialog creation with valid request entry."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
         
         # Test that dialog can be created without errors
@@ -77,7 +105,7 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_dialog_show(self):
         """Test showing the dialog."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
         
         # Show dialog
@@ -92,8 +120,10 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_url_truncation(self):
         """Test URL truncation for long URLs."""
-        entry = MockRequestEntry()
-        entry.url = "https://very-long-domain-name.example.com/api/v1/very/long/path/with/many/segments/test"
+        entry = replace(
+            DEFAULT_ENTRY,
+            url="https://very-long-domain-name.example.com/api/v1/very/long/path/with/many/segments/test"
+        )
         
         dialog = ResponseDetailsDialog(self.root, entry)
         
@@ -109,7 +139,7 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_byte_formatting(self):
         """Test byte count formatting."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
         
         # Test different byte sizes
@@ -119,7 +149,7 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_status_text_mapping(self):
         """Test HTTP status code to text mapping."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
         
         # Test common status codes
@@ -130,7 +160,7 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_error_entry_display(self):
         """Test dialog with error entry."""
-        entry = MockErrorRequestEntry()
+        entry = ERROR_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
         
         # Show dialog
@@ -144,48 +174,51 @@ class TestResponseDetailsDialog(unittest.TestCase):
         
     def test_json_formatting(self):
         """Test JSON content formatting."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
-        dialog.show()
-        
-        # Set format to JSON
-        dialog.format_var.set("JSON")
-        dialog._update_body_display()
         
         # Verify content is formatted
-        content = dialog.body_text.get("1.0", "end-1c")
+        content = dialog._format_body(entry.body_preview, "JSON")
         self.assertIn("{\n", content)  # Should be formatted with indentation
         
-        # Clean up
-        dialog._on_close()
+        # Invalid JSON falls back to the raw content
+        self.assertEqual(dialog._format_body("not json", "JSON"), "not json")
         
     @patch('tkinter.messagebox.showinfo')
     def test_copy_url(self, mock_showinfo):
         """Test URL copying functionality."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
-        dialog.show()
         
-        # Test copy URL
+        # Test copy URL; works without showing the dialog
         dialog._copy_url()
         
         # Verify clipboard content
-        clipboard_content = dialog.dialog.clipboard_get()
+        clipboard_content = self.root.clipboard_get()
         self.assertEqual(clipboard_content, entry.url)
         
         # Verify info message shown
         mock_showinfo.assert_called_once_with("Copied", "URL copied to clipboard")
         
-        # Clean up
-        dialog._on_close()
+    def test_export_payload(self):
+        """Test the data collected for export."""
+        entry = DEFAULT_ENTRY
+        dialog = ResponseDetailsDialog(self.root, entry)
         
+        payload = dialog._build_export_payload()
+        self.assertEqual(payload["url"], entry.url)
+        self.assertEqual(payload["timestamp"], FIXED_TS.isoformat())
+        self.assertEqual(payload["status_code"], 200)
+        self.assertEqual(payload["request_headers"], entry.headers)
+        self.assertIsNone(payload["error_message"])
+        
+    @patch('tkinter.messagebox.showinfo')
     @patch('tkinter.filedialog.asksaveasfilename')
     @patch('builtins.open', create=True)
-    def test_export_details_json(self, mock_open, mock_filedialog):
+    def test_export_details_json(self, mock_open, mock_filedialog, mock_showinfo):
         """Test exporting details to JSON file."""
-        entry = MockRequestEntry()
+        entry = DEFAULT_ENTRY
         dialog = ResponseDetailsDialog(self.root, entry)
-        dialog.show()
         
         # Mock file dialog
         mock_filedialog.return_value = "test_export.json"
@@ -203,13 +236,9 @@ class TestResponseDetailsDialog(unittest.TestCase):
         # Verify file was opened for writing
         mock_open.assert_called_once_with("test_export.json", 'w', encoding='utf-8')
         
-        # Clean up
-        dialog._on_close()
-        
     def test_full_content_dialog(self):
         """Test full content viewing dialog."""
-        entry = MockRequestEntry()
-        entry.content_length = 1000  # Simulate truncated content
+        entry = replace(DEFAULT_ENTRY, content_length=1000)  # Simulate truncated content
         
         dialog = ResponseDetailsDialog(self.root, entry)
         dialog.show()
@@ -227,56 +256,51 @@ class TestResponseDetailsDialog(unittest.TestCase):
 class TestMonitoringViewErrorHighlighting(unittest.TestCase):
     """Test cases for error highlighting in monitoring view."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.root = tk.Tk()
-        self.root.withdraw()
+    @classmethod
+    def setUpClass(cls):
+        """Create one hidden Tk root for the whole class."""
+        cls.root = tk.Tk()
+        cls.root.withdraw()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Destroy the shared Tk root."""
+        cls.root.destroy()
         
     def tearDown(self):
-        """Clean up after tests."""
-        self.root.destroy()
+        """Destroy views left behind by the test."""
+        for child in self.root.winfo_children():
+            child.destroy()
         
     def test_status_tag_assignment(self):
         """Test status tag assignment for different response types."""
-        from px_ui.ui.monitoring_view import MonitoringView
-        from px_ui.communication.event_system import EventSystem
-        
-        event_system = Mock(spec=EventSystem)
-        view = MonitoringView(self.root, event_system)
+        view = MonitoringView(self.root, MockEventSystem())
         
         # Test success response
-        entry = MockRequestEntry()
-        entry.status_code = 200
-        entry.error_message = None
-        self.assertEqual(view._get_status_tag(entry), "success")
+        self.assertEqual(view._get_status_tag(DEFAULT_ENTRY), "success")
         
         # Test client error
-        entry.status_code = 404
+        entry = replace(DEFAULT_ENTRY, status_code=404)
         self.assertEqual(view._get_status_tag(entry), "client_error")
         
         # Test server error
-        entry.status_code = 500
+        entry = replace(DEFAULT_ENTRY, status_code=500)
         self.assertEqual(view._get_status_tag(entry), "server_error")
         
         # Test general error
-        entry.status_code = None
-        entry.error_message = "Network error"
+        entry = replace(DEFAULT_ENTRY, status_code=None, error_message="Network error")
         self.assertEqual(view._get_status_tag(entry), "error")
         
         # Test pending request
-        entry.status_code = None
-        entry.error_message = None
+        entry = replace(DEFAULT_ENTRY, status_code=None)
         self.assertEqual(view._get_status_tag(entry), "normal")
         
     def test_request_entry_error_methods(self):
         """Test RequestEntry error detection methods."""
-        from px_ui.ui.monitoring_view import RequestEntry
-        from px_ui.communication.events import RequestEvent
-        
         # Create mock request event
         request_event = Mock(spec=RequestEvent)
         request_event.request_id = "test-123"
-        request_event.timestamp = datetime.now()
+        request_event.timestamp = FIXED_TS
         request_event.url = "https://example.com"
         request_event.method = "GET"
         request_event.proxy_decision = "DIRECT"
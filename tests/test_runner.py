@@ -3,9 +3,10 @@ Comprehensive test runner for the px-ui-client test suite.
 Provides test execution, reporting, and performance metrics.
 """
 
+import importlib.util
+import os
 import pytest
 import sys
-import os
 import time
 import json
 from datetime import datetime
@@ -13,123 +14,164 @@ from pathlib import Path
 import argparse
 
 
+# Test files making up each suite, in reporting order
+SUITES = {
+    'unit_tests': [
+        "tests/test_data_models.py",
+        "tests/test_pac_validation.py", 
+        "tests/test_event_processing.py"
+    ],
+    'integration_tests': [
+        "tests/test_integration_comprehensive.py"
+    ],
+    'automated_tests': [
+        "tests/test_automated_scenarios.py"
+    ],
+    'existing_tests': [
+        "tests/test_config.py",
+        "tests/test_enhanced_handler.py",
+        "tests/test_event_communication.py",
+        "tests/test_proxy_control.py",
+        "tests/test_response_details_dialog.py"
+    ],
+    'performance_tests': [
+        "tests/test_performance.py"
+    ]
+}
+
+# Spread suites over pytest-xdist workers when it is installed; timing
+# sensitive performance tests always run serially
+PARALLEL = importlib.util.find_spec("xdist") is not None
+
+# Test files present on disk, scanned once at import
+EXISTING = {p.name for p in Path("tests").glob("test_*.py")}
+
+
+class _SuiteResultsPlugin:
+    """Pytest plugin tallying passed and failed tests per suite."""
+    
+    def __init__(self, suites):
+        self._suite_of = {path: name for name, paths in suites.items() for path in paths}
+        self.counts = {name: {'passed': 0, 'failed': 0} for name in suites}
+    
+    def _suite(self, nodeid):
+        return self._suite_of.get(nodeid.split("::", 1)[0])
+    
+    def pytest_collectreport(self, report):
+        suite = self._suite(report.nodeid)
+        if suite and report.failed:
+            self.counts[suite]['failed'] += 1
+    
+    def pytest_runtest_logreport(self, report):
+        suite = self._suite(report.nodeid)
+        if suite is None:
+            return
+        if report.failed:
+            self.counts[suite]['failed'] += 1
+        elif report.passed and report.when == "call":
+            self.counts[suite]['passed'] += 1
+
+
 class TestRunner:
     """Main test runner for comprehensive test suite."""
     
-    def __init__(self):
+    REPORTS_DIR = Path("test_reports")
+    
+    def __init__(self, write_report=False):
         self.start_time = None
         self.end_time = None
         self.test_results = {}
         self.performance_metrics = {}
+        
+        # JSON reports are only written on request (or with PX_TEST_REPORT set)
+        self._write_report = write_report or bool(os.environ.get("PX_TEST_REPORT"))
+    
+    def _run(self, suites, verbose=False):
+        """
+        Run the given suites in a single pytest session.
+        
+        Args:
+            suites: Dict mapping suite names to their test files
+            verbose: Verbose output
+            
+        Returns:
+            Dict mapping each suite name to True if none of its tests failed
+        """
+        plugin = _SuiteResultsPlugin(suites)
+        
+        run_perf = 'performance_tests' in suites
+        args = ["-v"] if verbose or run_perf else []
+        # A module failing to import should only fail its own suite
+        args.append("--continue-on-collection-errors")
+        if run_perf:
+            args.extend(["-s", "--run-perf"])  # Always show output for performance tests
+            if verbose:
+                args.append("--tb=short")
+        elif PARALLEL:
+            # Tests in the same xdist_group (e.g. the Tk tests) share a worker
+            args.extend(["-n", "auto", "--dist", "loadgroup"])
+        for paths in suites.values():
+            args.extend(paths)
+        
+        exit_code = pytest.main(args, plugins=[plugin])
+        self.test_results.update(plugin.counts)
+        
+        # Usage or internal errors leave no per-test reports to go by
+        session_ok = exit_code in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED,
+                                   pytest.ExitCode.NO_TESTS_COLLECTED)
+        return {name: session_ok and counts['failed'] == 0
+                for name, counts in plugin.counts.items()}
     
     def run_unit_tests(self, verbose=False):
         """Run unit tests for data models, PAC validation, and event processing."""
         print("Running Unit Tests...")
-        
-        unit_test_files = [
-            "tests/test_data_models.py",
-            "tests/test_pac_validation.py", 
-            "tests/test_event_processing.py"
-        ]
-        
-        args = ["-v"] if verbose else []
-        args.extend(unit_test_files)
-        
-        result = pytest.main(args)
-        self.test_results['unit_tests'] = result
-        return result == 0
+        return self._run({'unit_tests': SUITES['unit_tests']}, verbose)['unit_tests']
     
     def run_integration_tests(self, verbose=False):
         """Run integration tests for proxy-UI communication."""
         print("Running Integration Tests...")
-        
-        integration_test_files = [
-            "tests/test_integration_comprehensive.py"
-        ]
-        
-        args = ["-v"] if verbose else []
-        args.extend(integration_test_files)
-        
-        result = pytest.main(args)
-        self.test_results['integration_tests'] = result
-        return result == 0
+        return self._run({'integration_tests': SUITES['integration_tests']}, verbose)['integration_tests']
     
     def run_performance_tests(self, verbose=False):
         """Run performance tests for high-volume scenarios."""
         print("Running Performance Tests...")
-        
-        performance_test_files = [
-            "tests/test_performance.py"
-        ]
-        
-        args = ["-v", "-s"]  # Always show output for performance tests
-        if verbose:
-            args.append("--tb=short")
-        args.extend(performance_test_files)
-        
-        result = pytest.main(args)
-        self.test_results['performance_tests'] = result
-        return result == 0
+        return self._run({'performance_tests': SUITES['performance_tests']}, verbose)['performance_tests']
     
     def run_automated_tests(self, verbose=False):
         """Run automated tests with test configurations."""
         print("Running Automated Scenario Tests...")
-        
-        automated_test_files = [
-            "tests/test_automated_scenarios.py"
-        ]
-        
-        args = ["-v"] if verbose else []
-        args.extend(automated_test_files)
-        
-        result = pytest.main(args)
-        self.test_results['automated_tests'] = result
-        return result == 0
+        return self._run({'automated_tests': SUITES['automated_tests']}, verbose)['automated_tests']
     
     def run_existing_tests(self, verbose=False):
         """Run existing test files to ensure compatibility."""
         print("Running Existing Tests...")
         
-        existing_test_files = [
-            "tests/test_config.py",
-            "tests/test_enhanced_handler.py",
-            "tests/test_event_communication.py",
-            "tests/test_proxy_control.py",
-            "tests/test_response_details_dialog.py"
-        ]
-        
-        # Filter to only existing files
-        existing_files = [f for f in existing_test_files if os.path.exists(f)]
+        existing_files = self._existing_test_files()
         
-        if existing_files:
-            args = ["-v"] if verbose else []
-            args.extend(existing_files)
-            
-            result = pytest.main(args)
-            self.test_results['existing_tests'] = result
-            return result == 0
-        else:
+        if not existing_files:
             print("No existing test files found")
-            self.test_results['existing_tests'] = 0
+            self.test_results['existing_tests'] = {'passed': 0, 'failed': 0}
             return True
+        
+        return self._run({'existing_tests': existing_files}, verbose)['existing_tests']
+    
+    def _existing_test_files(self):
+        """Get the files of the existing tests suite that are present."""
+        return [f for f in SUITES['existing_tests'] if Path(f).name in EXISTING]
     
     def run_all_tests(self, verbose=False, skip_performance=False):
-        """Run all test suites."""
+        """Run all test suites in one pytest session."""
         print("=" * 60)
         print("PX-UI-CLIENT COMPREHENSIVE TEST SUITE")
         print("=" * 60)
         
         self.start_time = time.time()
         
-        results = {
-            'unit_tests': self.run_unit_tests(verbose),
-            'integration_tests': self.run_integration_tests(verbose),
-            'automated_tests': self.run_automated_tests(verbose),
-            'existing_tests': self.run_existing_tests(verbose)
-        }
-        
-        if not skip_performance:
-            results['performance_tests'] = self.run_performance_tests(verbose)
+        suites = dict(SUITES)
+        suites['existing_tests'] = self._existing_test_files()
+        if skip_performance:
+            del suites['performance_tests']
+        results = self._run(suites, verbose)
         
         self.end_time = time.time()
         
@@ -172,29 +214,34 @@ class TestRunner:
         self.save_report_to_file(results, total_time)
     
     def save_report_to_file(self, results, total_time):
-        """Save test report to JSON file."""
+        """Save test report to JSON file, if report writing is enabled."""
+        if not self._write_report:
+            return
+        
+        now = datetime.now()
+        total_suites = len(results)
+        passed_suites = sum(1 for success in results.values() if success)
+        
         report_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'execution_time_seconds': total_time,
             'test_results': results,
             'summary': {
-                'total_suites': len(results),
-                'passed_suites': sum(1 for success in results.values() if success),
-                'failed_suites': sum(1 for success in results.values() if not success),
-                'success_rate': sum(1 for success in results.values() if success) / len(results)
+                'total_suites': total_suites,
+                'passed_suites': passed_suites,
+                'failed_suites': total_suites - passed_suites,
+                'success_rate': passed_suites / total_suites
             }
         }
         
         # Create reports directory if it doesn't exist
-        reports_dir = Path("test_reports")
-        reports_dir.mkdir(exist_ok=True)
+        self.REPORTS_DIR.mkdir(exist_ok=True)
         
         # Save report with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = reports_dir / f"test_report_{timestamp}.json"
+        report_file = self.REPORTS_DIR / f"test_report_{now:%Y%m%d_%H%M%S}.json"
         
-        with open(report_file, 'w') as f:
-            json.dump(report_data, f, indent=2)
+        # Serialize in one go and write once rather than in json.dump's chunks
+        report_file.write_text(json.dumps(report_data, indent=2), encoding='utf-8')
         
         print(f"\nDetailed report saved to: {report_file}")
 
@@ -216,10 +263,12 @@ def main():
                        help="Run only existing tests")
     parser.add_argument("--skip-performance", action="store_true", 
                        help="Skip performance tests (for faster execution)")
+    parser.add_argument("--write-report", action="store_true", 
+                       help="Save a JSON report under test_reports/ (also enabled by PX_TEST_REPORT=1)")
     
     args = parser.parse_args()
     
-    runner = TestRunner()
+    runner = TestRunner(write_report=args.write_report)
     
     # Run specific test suite if requested
     if args.unit:
@@ -2,13 +2,8 @@
 Integration tests for UI components.
 """
 
-import unittest
 import sys
-import os
-from pathlib import Path
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import unittest
 
 from px_ui.models.proxy_status import ProxyStatus
 
@@ -16,51 +11,53 @@ from px_ui.models.proxy_status import ProxyStatus
 class TestUIIntegration(unittest.TestCase):
     """Integration tests for UI components."""
     
-    def test_proxy_status_model(self):
-        """Test ProxyStatus model used by MainWindow."""
-        # Test creating a proxy status
-        status = ProxyStatus(
-            is_running=True,
-            listen_address="127.0.0.1",
-            port=3128,
-            mode="pac",
-            active_connections=5,
-            total_requests=100
-        )
-        
-        # Test status methods used by MainWindow
-        self.assertEqual(status.get_status_text(), "Running on 127.0.0.1:3128")
-        self.assertEqual(status.get_connection_info(), "5 active, 100 total")
-        self.assertEqual(status.get_listen_url(), "http://127.0.0.1:3128")
-        self.assertTrue(status.is_running)
-        self.assertTrue(status.is_localhost())
-        self.assertTrue(status.is_using_pac())
+    @classmethod
+    def setUpClass(cls):
+        """Import MainWindow once for the class, keeping any import error."""
+        cls.MainWindow = None
+        cls.import_error = None
+        try:
+            from px_ui.ui import MainWindow
+            cls.MainWindow = MainWindow
+        except ImportError as e:
+            cls.import_error = e
     
-    def test_proxy_status_stopped(self):
-        """Test ProxyStatus when stopped."""
-        status = ProxyStatus(
-            is_running=False,
-            listen_address="127.0.0.1",
-            port=3128,
-            mode="manual"
-        )
+    def test_proxy_status_states(self):
+        """Test ProxyStatus methods used by MainWindow, running and stopped."""
+        cases = [
+            # (kwargs, status text, connection info, is running, using PAC)
+            (dict(is_running=True, listen_address="127.0.0.1", port=3128, mode="pac",
+                  active_connections=5, total_requests=100),
+             "Running on 127.0.0.1:3128", "5 active, 100 total", True, True),
+            (dict(is_running=False, listen_address="127.0.0.1", port=3128, mode="manual"),
+             "Stopped", "0 active, 0 total", False, False),
+        ]
         
-        self.assertEqual(status.get_status_text(), "Stopped")
-        self.assertEqual(status.get_connection_info(), "0 active, 0 total")
-        self.assertFalse(status.is_running)
-        self.assertFalse(status.is_using_pac())
+        for kwargs, status_text, connection_info, is_running, is_pac in cases:
+            status = ProxyStatus(**kwargs)
+            with self.subTest(is_running=is_running, mode=kwargs['mode']):
+                self.assertEqual(status.get_status_text(), status_text)
+                self.assertEqual(status.get_connection_info(), connection_info)
+                self.assertEqual(status.get_listen_url(), "http://127.0.0.1:3128")
+                self.assertIs(status.is_running, is_running)
+                self.assertTrue(status.is_localhost())
+                self.assertIs(status.is_using_pac(), is_pac)
+    
+    @unittest.skipIf(sys.version_info < (3, 10), "ProxyStatus uses slots on Python 3.10+")
+    def test_proxy_status_has_slots(self):
+        """Test that ProxyStatus instances have no per-instance __dict__."""
+        status = ProxyStatus(is_running=False, listen_address="127.0.0.1", port=3128, mode="manual")
+        self.assertFalse(hasattr(status, "__dict__"))
     
     def test_main_window_import(self):
         """Test that MainWindow can be imported successfully."""
-        try:
-            from px_ui.ui import MainWindow
-            self.assertTrue(True, "MainWindow imported successfully")
-        except ImportError as e:
-            self.fail(f"Failed to import MainWindow: {e}")
+        if self.import_error is not None:
+            self.fail(f"Failed to import MainWindow: {self.import_error}")
+        self.assertIsNotNone(self.MainWindow)
     
     def test_main_window_class_exists(self):
         """Test that MainWindow class has required methods."""
-        from px_ui.ui import MainWindow
+        self.assertIsNotNone(self.MainWindow, f"Failed to import MainWindow: {self.import_error}")
         
         # Check that MainWindow has the required methods
         required_methods = [
@@ -71,11 +68,8 @@ class TestUIIntegration(unittest.TestCase):
             'show_info'
         ]
         
-        for method_name in required_methods:
-            self.assertTrue(
-                hasattr(MainWindow, method_name),
-                f"MainWindow missing required method: {method_name}"
-            )
+        missing = [name for name in required_methods if not hasattr(self.MainWindow, name)]
+        self.assertFalse(missing, f"MainWindow missing required methods: {missing}")
 
 
 if __name__ == '__main__':